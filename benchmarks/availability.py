@@ -0,0 +1,152 @@
+"""Time AvailabilityFacade operations against a throwaway Postgres and write the results to a JSON file.
+
+Run with `python -m benchmarks.availability --resources 100 --days 30 --output availability.json`.
+Without --url a Postgres container is started, as in the test suite.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session
+from testcontainers.postgres import PostgresContainer  # pyright: ignore[reportMissingTypeStubs]
+
+from schedule import container as container_module
+from schedule.availability import AvailabilityFacade, Owner, ResourceId
+from schedule.availability.repository.availability_sqla_repository import ResourceAvailabilityRepository
+from schedule.availability.repository.calendar_cache import CalendarCache
+from schedule.availability.repository.resource_availability_read_model import ResourceAvailabilityReadModel
+from schedule.shared.event import EventPublisher
+from schedule.shared.sqla_repository import mapper_registry
+from schedule.shared.timeslot import TimeSlot
+
+if TYPE_CHECKING:
+    from lagom import Container
+
+FIRST_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+SLOT_DURATION = timedelta(hours=1)
+CANDIDATES = 20
+
+
+@contextmanager
+def postgres(url: str | None) -> Iterator[Engine]:
+    if url is not None:
+        yield create_engine(url)
+        return
+    with PostgresContainer("postgres:15") as container:
+        yield create_engine(container.get_connection_url())
+
+
+class AvailabilityBenchmark:
+    def __init__(self, session: Session, resources: int, days: int, repeat: int, seed: int) -> None:
+        self._session: Session = session
+        self._container: Container = container_module.build()
+        self._container[Session] = session
+        self._resources: list[ResourceId] = [ResourceId.new_one() for _ in range(resources)]
+        self._days: int = days
+        self._repeat: int = repeat
+        self._random: random.Random = random.Random(seed)  # noqa: S311
+        self._samples: dict[str, list[float]] = {}
+
+    @property
+    def _period(self) -> TimeSlot:
+        return TimeSlot(FIRST_DAY.from_, FIRST_DAY.from_ + timedelta(days=self._days))
+
+    def run(self) -> dict[str, dict[str, float]]:
+        for resource_id in self._resources:
+            _ = self._time(
+                "create_resource_slots", partial(self._facade().create_resource_slots, resource_id, self._period)
+            )
+
+        for _ in range(self._repeat):
+            resource_id, time_slot, owner = self._random.choice(self._resources), self._random_slot(), Owner.new_one()
+            _ = self._time("block", partial(self._facade().block, resource_id, time_slot, owner))
+            _ = self._time("release", partial(self._facade().release, resource_id, time_slot, owner))
+
+            candidates = self._random.sample(self._resources, min(CANDIDATES, len(self._resources)))
+            time_slot, owner = self._random_slot(), Owner.new_one()
+            block_random_available = partial(self._facade().block_random_available, candidates, time_slot, owner)
+            if (chosen := self._time("block_random_available", block_random_available)) is not None:
+                _ = self._facade().release(chosen, time_slot, owner)
+
+            resource_id = self._random.choice(self._resources)
+            _ = self._time("load_calendar", partial(self._facade().load_calendar, resource_id, self._period))
+            _ = self._time("load_calendars", partial(self._facade().load_calendars, self._resources, self._period))
+
+        return {operation: self._summary(samples) for operation, samples in self._samples.items()}
+
+    def _facade(self) -> AvailabilityFacade:
+        """Build a facade with an empty calendar cache, so every load reaches the database."""
+        return AvailabilityFacade(
+            self._container.resolve(ResourceAvailabilityRepository),
+            ResourceAvailabilityReadModel(self._session, CalendarCache()),
+            self._container.resolve(EventPublisher),  # type: ignore[type-abstract]
+        )
+
+    def _random_slot(self) -> TimeSlot:
+        hours = self._days * 24 - int(SLOT_DURATION / timedelta(hours=1))
+        start = FIRST_DAY.from_ + timedelta(hours=self._random.randint(0, hours))
+        return TimeSlot(start, start + SLOT_DURATION)
+
+    def _time[T](self, operation: str, action: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        result = action()
+        self._session.flush()
+        self._samples.setdefault(operation, []).append(time.perf_counter() - start)
+        return result
+
+    @staticmethod
+    def _summary(samples: list[float]) -> dict[str, float]:
+        return {
+            "samples": len(samples),
+            "min": min(samples),
+            "median": statistics.median(samples),
+            "mean": statistics.fmean(samples),
+            "max": max(samples),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument("--resources", type=int, default=100)
+    _ = parser.add_argument("--days", type=int, default=30)
+    _ = parser.add_argument("--repeat", type=int, default=20)
+    _ = parser.add_argument("--seed", type=int, default=0)
+    _ = parser.add_argument("--url", help="database to run against instead of a Postgres container")
+    _ = parser.add_argument("--output", type=Path, default=Path("availability-benchmark.json"))
+    args = parser.parse_args()
+
+    with postgres(args.url) as engine:
+        mapper_registry.metadata.create_all(engine)
+        with Session(engine) as session:
+            benchmark = AvailabilityBenchmark(session, args.resources, args.days, args.repeat, args.seed)
+            results = benchmark.run()
+            session.rollback()
+
+    report: dict[str, Any] = {
+        "parameters": {
+            "resources": args.resources,
+            "days": args.days,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    _ = args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from collections.abc import Set as AbstractSet
+from datetime import datetime
+from typing import override
+from uuid import UUID
+
+from schedule.allocation.capability_scheduling import AllocatableCapabilityId
+from schedule.shared.persistent import PersistentSortedMap
+
+from .allocated_capability import AllocatedCapability
+
+type _BySlot = PersistentSortedMap[tuple[datetime, datetime], frozenset[AllocatedCapability]]
+type _ByCapability = PersistentSortedMap[UUID, _BySlot]
+
+
+class AllocatedCapabilities(AbstractSet[AllocatedCapability]):
+    """Immutable set of allocated capabilities, indexed by capability id and then by time slot.
+
+    Adding and removing take O(log n) and return a new set, sharing structure with the old one.
+    """
+
+    __slots__ = ("_by_capability", "_cached_hash", "_size")
+
+    def __init__(self, allocated_capabilities: Iterable[AllocatedCapability] = ()) -> None:
+        by_capability: _ByCapability = PersistentSortedMap()
+        size = 0
+        for allocated_capability in allocated_capabilities:
+            by_capability, added = self._with(by_capability, allocated_capability)
+            size += added
+        self._by_capability: _ByCapability = by_capability
+        self._size: int = size
+        self._cached_hash: int | None = None
+
+    @staticmethod
+    def of(allocated_capabilities: Iterable[AllocatedCapability]) -> AllocatedCapabilities:
+        if isinstance(allocated_capabilities, AllocatedCapabilities):
+            return allocated_capabilities
+        return AllocatedCapabilities(allocated_capabilities)
+
+    @override
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, AllocatedCapability):
+            return False
+        by_slot = self._by_capability.get(value.allocated_capability_id.id)
+        return by_slot is not None and value in by_slot.get(self._slot_key(value), frozenset())
+
+    @override
+    def __iter__(self) -> Iterator[AllocatedCapability]:
+        for by_slot in self._by_capability.values():
+            for allocated_capabilities in by_slot.values():
+                yield from allocated_capabilities
+
+    @override
+    def __len__(self) -> int:
+        return self._size
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, AllocatedCapabilities):
+            return self._size == other._size and self._by_capability == other._by_capability
+        return super().__eq__(other)
+
+    @override
+    def __hash__(self) -> int:
+        if self._cached_hash is None:
+            self._cached_hash = self._hash()
+        return self._cached_hash
+
+    @override
+    def __repr__(self) -> str:
+        return f"AllocatedCapabilities({list(self)!r})"
+
+    def of_capability(self, allocated_capability_id: AllocatableCapabilityId) -> Iterator[AllocatedCapability]:
+        """Yield allocations of the capability ordered by time."""
+        by_slot = self._by_capability.get(allocated_capability_id.id, PersistentSortedMap())
+        return (
+            allocated_capability
+            for allocated_capabilities in by_slot.values()
+            for allocated_capability in allocated_capabilities
+        )
+
+    def with_(self, allocated_capability: AllocatedCapability) -> AllocatedCapabilities:
+        by_capability, added = self._with(self._by_capability, allocated_capability)
+        if by_capability is self._by_capability:
+            return self
+        return self._of(by_capability, self._size + added)
+
+    def without(self, allocated_capability: AllocatedCapability) -> AllocatedCapabilities:
+        if allocated_capability not in self:
+            return self
+        capability_id = allocated_capability.allocated_capability_id.id
+        slot_key = self._slot_key(allocated_capability)
+        by_slot = self._by_capability.get(capability_id, PersistentSortedMap())
+        remaining = by_slot.get(slot_key, frozenset()) - {allocated_capability}
+        by_slot = by_slot.set(slot_key, remaining) if remaining else by_slot.remove(slot_key)
+        by_capability = (
+            self._by_capability.set(capability_id, by_slot) if by_slot else self._by_capability.remove(capability_id)
+        )
+        return self._of(by_capability, self._size - 1)
+
+    @classmethod
+    def _of(cls, by_capability: _ByCapability, size: int) -> AllocatedCapabilities:
+        allocated_capabilities = cls()
+        allocated_capabilities._by_capability = by_capability
+        allocated_capabilities._size = size
+        return allocated_capabilities
+
+    @classmethod
+    def _with(
+        cls, by_capability: _ByCapability, allocated_capability: AllocatedCapability
+    ) -> tuple[_ByCapability, int]:
+        capability_id = allocated_capability.allocated_capability_id.id
+        slot_key = cls._slot_key(allocated_capability)
+        by_slot = by_capability.get(capability_id, PersistentSortedMap())
+        in_slot = by_slot.get(slot_key, frozenset())
+        if allocated_capability in in_slot:
+            return by_capability, 0
+        return by_capability.set(capability_id, by_slot.set(slot_key, in_slot | {allocated_capability})), 1
+
+    @staticmethod
+    def _slot_key(allocated_capability: AllocatedCapability) -> tuple[datetime, datetime]:
+        return allocated_capability.time_slot.from_, allocated_capability.time_slot.to
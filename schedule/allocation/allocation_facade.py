@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 from uuid import UUID
 
 from schedule.allocation.events import CapabilitiesAllocatedEvent
-from schedule.availability import AvailabilityFacade, Owner, ResourceId
+from schedule.availability import AvailabilityFacade, AvailabilityRequest, Calendars, Owner, ResourceId
 from schedule.shared.capability.capability import Capability
 from schedule.shared.event import EventPublisher
 from schedule.shared.timeslot.time_slot import TimeSlot
@@ -15,7 +15,9 @@ from .capability_scheduling import (
     CapabilityFinder,
     CapabilitySelector,
 )
+from .demand import Demand
 from .demands import Demands
+from .demands_assignment import DemandsAssignment
 from .events import ProjectAllocationScheduledEvent
 from .project_allocations import ProjectAllocations
 from .project_allocations_id import ProjectAllocationsId
@@ -115,6 +117,61 @@ class AllocationFacade:
         )
         return allocated_event is not None
 
+    def allocate_demands(self, project_id: ProjectAllocationsId, demands: Demands) -> Demands:
+        """Allocate a capability to each of the demands, returning the demands that were satisfied.
+
+        Candidates for all demands are found with one query and blocked with one batched write,
+        then the project allocations are saved once.
+        """
+        allocations = self._project_allocations_repository.get(project_id)
+        wanted = [demand for demand in demands.all if allocations.within_project_time_slot(demand.time_slot)]
+        if not wanted:
+            return Demands.none()
+
+        proposed = self._capability_finder.find_capabilities_for_any(
+            (demand.capability, demand.time_slot) for demand in wanted
+        )
+        calendars = self._availability_facade.load_calendars(
+            {capability.id.to_availability_resource_id() for capability in proposed.all},
+            TimeSlot(min(demand.time_slot.from_ for demand in wanted), max(demand.time_slot.to for demand in wanted)),
+        )
+        candidates = [self._candidates_for(demand, proposed, calendars) for demand in wanted]
+        assigned = DemandsAssignment([demand.time_slot for demand in wanted], candidates).assign()
+
+        requester = Owner(project_id.id)
+        blocked = self._availability_facade.block_many(
+            [
+                AvailabilityRequest(capability.id.to_availability_resource_id(), wanted[position].time_slot, requester)
+                for position, capability in assigned.items()
+            ]
+        )
+
+        when = datetime.now(tz=UTC)
+        satisfied: list[Demand] = []
+        for (position, capability), is_blocked in zip(assigned.items(), blocked, strict=True):
+            demand = wanted[position]
+            if not is_blocked:
+                continue
+            if allocations.allocate(capability.id, capability.capabilities, demand.time_slot, when) is not None:
+                satisfied.append(demand)
+        self._project_allocations_repository.add(allocations)
+        return Demands(tuple(satisfied))
+
+    @staticmethod
+    def _candidates_for(
+        demand: Demand, proposed: AllocatableCapabilitiesSummary, calendars: Calendars
+    ) -> list[AllocatableCapabilitySummary]:
+        return [
+            capability
+            for capability in proposed.all
+            if capability.capabilities.can_perform(demand.capability)
+            and demand.time_slot.within(capability.time_slot)
+            and any(
+                demand.time_slot.within(available)
+                for available in calendars.get(capability.id.to_availability_resource_id()).available_slots()
+            )
+        ]
+
     def _allocate(
         self,
         project_id: ProjectAllocationsId,
@@ -1,41 +1,59 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from collections.abc import Set as AbstractSet
+from typing import cast
 
 import attrs as a
 
 from schedule.allocation.capability_scheduling import AllocatableCapabilityId
 from schedule.shared.timeslot import TimeSlot
 
+from .allocated_capabilities import AllocatedCapabilities
 from .allocated_capability import AllocatedCapability
 
 
 def freeze_allocated_capabilites(
     allocated_capabilities: Iterable[AllocatedCapability],
-) -> frozenset[AllocatedCapability]:
-    return frozenset(allocated_capabilities)
+) -> AllocatedCapabilities:
+    return AllocatedCapabilities.of(allocated_capabilities)
 
 
 @a.define(frozen=True)
 class Allocations:
-    all: frozenset[AllocatedCapability] = a.field(converter=freeze_allocated_capabilites)
+    all: AbstractSet[AllocatedCapability] = a.field(converter=freeze_allocated_capabilites)
+
+    @property
+    def _allocated_capabilities(self) -> AllocatedCapabilities:
+        return cast("AllocatedCapabilities", self.all)
 
     @staticmethod
     def none() -> Allocations:
-        return Allocations(frozenset())
+        return Allocations(AllocatedCapabilities())
 
     def add(self, *allocated_capability: AllocatedCapability) -> Allocations:
-        return Allocations(self.all.union(allocated_capability))
+        allocated_capabilities = self._allocated_capabilities
+        for to_add in allocated_capability:
+            allocated_capabilities = allocated_capabilities.with_(to_add)
+        return self._with(allocated_capabilities)
 
     def remove(self, to_remove: AllocatableCapabilityId, time_slot: TimeSlot) -> Allocations:
-        allocated_capability = self.find(to_remove)
-        if allocated_capability is None:
-            return self
-        return self._remove_from_slot(allocated_capability, time_slot)
+        """Cut the time slot out of every allocation of the capability overlapping it, leaving the rest allocated.
 
-    def _remove_from_slot(self, allocated_capability: AllocatedCapability, time_slot: TimeSlot) -> Allocations:
+        Allocations of the capability not overlapping the time slot are kept as they are.
+        """
+        allocated_capabilities = self._allocated_capabilities
+        for allocated_capability in self._allocated_capabilities.of_capability(to_remove):
+            if allocated_capability.time_slot.overlaps(time_slot):
+                allocated_capabilities = self._remove_from_slot(allocated_capabilities, allocated_capability, time_slot)
+        return self._with(allocated_capabilities)
+
+    @staticmethod
+    def _remove_from_slot(
+        allocated_capabilities: AllocatedCapabilities, allocated_capability: AllocatedCapability, time_slot: TimeSlot
+    ) -> AllocatedCapabilities:
         difference = allocated_capability.time_slot.leftover_after_removing_common_with(time_slot)
-        leftovers: set[AllocatedCapability] = {
+        leftovers = [
             AllocatedCapability(
                 allocated_capability.allocated_capability_id,
                 allocated_capability.capability,
@@ -43,12 +61,19 @@ class Allocations:
             )
             for leftover in difference
             if leftover.within(allocated_capability.time_slot)
-        }
-
-        return Allocations(all=self.all.difference({allocated_capability}).union(leftovers))
+        ]
+        allocated_capabilities = allocated_capabilities.without(allocated_capability)
+        for leftover in leftovers:
+            allocated_capabilities = allocated_capabilities.with_(leftover)
+        return allocated_capabilities
 
     def find(self, allocated_capability_id: AllocatableCapabilityId) -> AllocatedCapability | None:
-        return next(
-            (allocation for allocation in self.all if allocation.allocated_capability_id == allocated_capability_id),
-            None,
-        )
+        return next(self._allocated_capabilities.of_capability(allocated_capability_id), None)
+
+    def find_all(self, allocated_capability_id: AllocatableCapabilityId) -> frozenset[AllocatedCapability]:
+        return frozenset(self._allocated_capabilities.of_capability(allocated_capability_id))
+
+    def _with(self, allocated_capabilities: AllocatedCapabilities) -> Allocations:
+        if allocated_capabilities is self._allocated_capabilities:
+            return self
+        return Allocations(allocated_capabilities)
@@ -1,10 +1,12 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from datetime import datetime
 
-from sqlalchemy import ColumnElement, and_, cast, func, select
+from sqlalchemy import ColumnElement, and_, cast, false, func, or_, select
 from sqlalchemy.dialects.postgresql import JSONB
 
+from schedule.shared.capability import Capability
 from schedule.shared.sqla_repository import SQLAlchemyRepository
+from schedule.shared.timeslot import TimeSlot
 
 from .allocatable_capability import (
     AllocatableCapability,
@@ -25,6 +27,23 @@ class AllocatableCapabilityRepository(SQLAlchemyRepository[AllocatableCapability
         )
         return self._session.execute(stmt).scalars().all()
 
+    def find_by_any_capability_within(
+        self, capabilities_within: Iterable[tuple[Capability, TimeSlot]]
+    ) -> Sequence[AllocatableCapability]:
+        stmt = select(self._type).where(
+            or_(
+                false(),
+                *(
+                    and_(
+                        self._time_slot_within(time_slot.from_, time_slot.to),
+                        self._capability_matches(capability.name, capability.type),
+                    )
+                    for capability, time_slot in capabilities_within
+                ),
+            )
+        )
+        return self._session.execute(stmt).scalars().all()
+
     def find_by_resource_id_and_capability_and_time_slot(
         self,
         allocatable_resource_id: AllocatableResourceId,
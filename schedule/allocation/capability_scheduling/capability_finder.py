@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
 from schedule.availability import AvailabilityFacade
 from schedule.shared.capability import Capability
@@ -45,6 +45,13 @@ class CapabilityFinder:
         )
         return self._create_summary(*found)
 
+    def find_capabilities_for_any(
+        self, capabilities_within: Iterable[tuple[Capability, TimeSlot]]
+    ) -> AllocatableCapabilitiesSummary:
+        """Find, in one query, capabilities matching any of the capabilities within its time slot."""
+        found = self._repository.find_by_any_capability_within(capabilities_within)
+        return self._create_summary(*found)
+
     def find_by_id(self, *allocatable_capability_ids: AllocatableCapabilityId) -> AllocatableCapabilitiesSummary:
         found = self._repository.get_all(list(allocatable_capability_ids))
         return self._create_summary(*found)
@@ -6,12 +6,16 @@ import attrs as a
 
 from schedule.allocation.demand import Demand
 from schedule.shared.capability import Capability
-from schedule.shared.timeslot import TimeSlot
+from schedule.shared.timeslot import IntervalIndex, TimeSlot, default_time_slot_array
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
+    from schedule.allocation.allocated_capability import AllocatedCapability
     from schedule.allocation.allocations import Allocations
+    from schedule.shared.timeslot import TimeSlotArray
+
+INDEXED_ALLOCATIONS_THRESHOLD = 32
 
 
 def freeze_demands(demand: Iterable[Demand]) -> tuple[Demand, ...]:
@@ -38,10 +42,20 @@ class Demands:
         return Demands(all=self.all + new_demands.all)
 
     def missing_demands(self, allocations: Allocations) -> Demands:
-        return Demands(tuple(demand for demand in self.all if not self._satisfied_by(demand, allocations)))
+        if len(allocations.all) < INDEXED_ALLOCATIONS_THRESHOLD:
+            allocated = tuple(allocations.all)
+            slots = default_time_slot_array(allocation.time_slot for allocation in allocated)
+            return Demands(tuple(demand for demand in self.all if not self._satisfied_by(demand, allocated, slots)))
+        index = IntervalIndex((allocation.time_slot, allocation) for allocation in allocations.all)
+        return Demands(tuple(demand for demand in self.all if not self._satisfied_by_indexed(demand, index)))
+
+    def _satisfied_by(self, demand: Demand, allocated: tuple[AllocatedCapability, ...], slots: TimeSlotArray) -> bool:
+        return any(
+            allocated[position].capability.can_perform(demand.capability)
+            for position in slots.positions(slots.containing(demand.time_slot))
+        )
 
-    def _satisfied_by(self, demand: Demand, allocations: Allocations) -> bool:
+    def _satisfied_by_indexed(self, demand: Demand, index: IntervalIndex[AllocatedCapability]) -> bool:
         return any(
-            allocation.capability.can_perform(demand.capability) and demand.time_slot.within(allocation.time_slot)
-            for allocation in allocations.all
+            allocation.capability.can_perform(demand.capability) for allocation in index.containing(demand.time_slot)
         )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Hashable, Sequence
+
+from schedule.shared.timeslot import TimeSlot
+
+
+class DemandsAssignment[C: Hashable]:
+    """Assign time slots to candidates able to cover them, never giving one candidate two overlapping slots.
+
+    Slots with the fewest candidates go first. A slot whose candidates are all busy takes one over
+    when the single overlapping slot assigned to it can move to another candidate, as in augmenting path matching.
+    """
+
+    def __init__(self, slots: Sequence[TimeSlot], candidates: Sequence[Sequence[C]]) -> None:
+        self._slots: Sequence[TimeSlot] = slots
+        self._candidates: Sequence[Sequence[C]] = candidates
+        self._assigned: dict[int, C] = {}
+        self._assigned_to: defaultdict[C, set[int]] = defaultdict(set)
+
+    def assign(self) -> dict[int, C]:
+        for position in sorted(range(len(self._slots)), key=lambda position: len(self._candidates[position])):
+            _ = self._try_assign(position, set())
+        return dict(sorted(self._assigned.items()))
+
+    def _try_assign(self, position: int, visited: set[C]) -> bool:
+        for candidate in self._candidates[position]:
+            if candidate in visited:
+                continue
+            visited.add(candidate)
+            conflicts = [
+                other
+                for other in self._assigned_to[candidate]
+                if self._overlap(self._slots[position], self._slots[other])
+            ]
+            if not conflicts:
+                self._assign(position, candidate)
+                return True
+            if len(conflicts) > 1:
+                continue
+            (conflicting,) = conflicts
+            self._unassign(conflicting)
+            self._assign(position, candidate)
+            if self._try_assign(conflicting, visited):
+                return True
+            self._unassign(position)
+            self._assign(conflicting, candidate)
+        return False
+
+    def _assign(self, position: int, candidate: C) -> None:
+        self._assigned[position] = candidate
+        self._assigned_to[candidate].add(position)
+
+    def _unassign(self, position: int) -> None:
+        self._assigned_to[self._assigned.pop(position)].discard(position)
+
+    @staticmethod
+    def _overlap(slot: TimeSlot, other: TimeSlot) -> bool:
+        return slot.from_ < other.to and other.from_ < slot.to
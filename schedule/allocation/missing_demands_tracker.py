@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from schedule.shared.timeslot import IntervalIndex
+
+from .demands import Demands
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .allocated_capability import AllocatedCapability
+    from .allocations import Allocations
+    from .demand import Demand
+
+
+class MissingDemandsTracker:
+    """Count allocations satisfying each demand, updating the counts as allocations change."""
+
+    def __init__(self, demands: Demands, allocations: Allocations) -> None:
+        self._demands: Demands = demands
+        self._allocations: Allocations = allocations
+        self._index: IntervalIndex[int] = self._index_of(demands)
+        self._satisfying: list[int] = [0] * len(demands.all)
+        for allocation in allocations.all:
+            self._count(allocation, 1)
+
+    def tracks(self, demands: Demands, allocations: Allocations) -> bool:
+        return demands is self._demands and allocations is self._allocations
+
+    def allocations_changed(
+        self,
+        allocations: Allocations,
+        added: Iterable[AllocatedCapability] = (),
+        removed: Iterable[AllocatedCapability] = (),
+    ) -> None:
+        for allocation in removed:
+            self._count(allocation, -1)
+        for allocation in added:
+            self._count(allocation, 1)
+        self._allocations = allocations
+
+    def demands_added(self, demands: Demands) -> None:
+        new_demands = demands.all[len(self._demands.all) :]
+        self._satisfying.extend(
+            sum(1 for allocation in self._allocations.all if self._satisfies(allocation, demand))
+            for demand in new_demands
+        )
+        self._demands = demands
+        self._index = self._index_of(demands)
+
+    def missing_demands(self) -> Demands:
+        return Demands(
+            tuple(
+                demand
+                for demand, satisfying in zip(self._demands.all, self._satisfying, strict=True)
+                if satisfying == 0
+            )
+        )
+
+    def _count(self, allocation: AllocatedCapability, change: int) -> None:
+        for position in self._index.overlapping(allocation.time_slot):
+            if self._satisfies(allocation, self._demands.all[position]):
+                self._satisfying[position] += change
+
+    @staticmethod
+    def _satisfies(allocation: AllocatedCapability, demand: Demand) -> bool:
+        return allocation.capability.can_perform(demand.capability) and demand.time_slot.within(allocation.time_slot)
+
+    @staticmethod
+    def _index_of(demands: Demands) -> IntervalIndex[int]:
+        return IntervalIndex((demand.time_slot, position) for position, demand in enumerate(demands.all))
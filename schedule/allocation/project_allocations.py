@@ -16,6 +16,7 @@ from .events import (
     ProjectAllocationScheduledEvent,
     ProjectAllocationsDemandsScheduledEvent,
 )
+from .missing_demands_tracker import MissingDemandsTracker
 from .project_allocations_id import ProjectAllocationsId
 
 
@@ -26,6 +27,7 @@ class ProjectAllocations:
     _allocations: Allocations
     _demands: Demands
     _time_slot: TimeSlot
+    _missing_demands_tracker: MissingDemandsTracker | None = a.field(init=False, default=None, eq=False, repr=False)
 
     @property
     def allocations(self) -> Allocations:
@@ -58,7 +60,7 @@ class ProjectAllocations:
         requested_slot: TimeSlot,
         when: datetime,
     ) -> CapabilitiesAllocatedEvent | None:
-        if not self._within_project_time_slot(requested_slot):
+        if not self.within_project_time_slot(requested_slot):
             return None
 
         allocated_capability = AllocatedCapability(
@@ -67,19 +69,20 @@ class ProjectAllocations:
         new_allocations = self._allocations.add(allocated_capability)
         if self._nothing_allocated(new_allocations):
             return None
+        self._tracker().allocations_changed(new_allocations, added=[allocated_capability])
         self._allocations = new_allocations
 
         return CapabilitiesAllocatedEvent(
             allocated_capability_id=allocated_capability.allocated_capability_id.id,
             project_id=self._project_id,
-            missing_demands=self._demands.missing_demands(self._allocations),
+            missing_demands=self.missing_demands(),
             occurred_at=when,
         )
 
     def _nothing_allocated(self, new_allocations: Allocations) -> bool:
         return self._allocations == new_allocations
 
-    def _within_project_time_slot(self, requested_slot: TimeSlot) -> bool:
+    def within_project_time_slot(self, requested_slot: TimeSlot) -> bool:
         if self._time_slot.is_empty():
             return True
         return requested_slot.within(self._time_slot)
@@ -90,6 +93,9 @@ class ProjectAllocations:
         new_allocations = self._allocations.remove(to_remove=allocated_capability_id, time_slot=time_slot)
         if self._nothing_released(new_allocations):
             return None
+        before = self._allocations.find_all(allocated_capability_id)
+        after = new_allocations.find_all(allocated_capability_id)
+        self._tracker().allocations_changed(new_allocations, added=after - before, removed=before - after)
         self._allocations = new_allocations
         return CapabilityReleasedEvent(
             project_id=self._project_id, missing_demands=self.missing_demands(), occurred_at=when
@@ -99,13 +105,22 @@ class ProjectAllocations:
         return new_allocations == self._allocations
 
     def missing_demands(self) -> Demands:
-        return self._demands.missing_demands(self._allocations)
+        return self._tracker().missing_demands()
+
+    def _tracker(self) -> MissingDemandsTracker:
+        # instances loaded from the database skip __init__, so the tracker is built on first use
+        tracker = getattr(self, "_missing_demands_tracker", None)
+        if tracker is None or not tracker.tracks(self._demands, self._allocations):
+            tracker = self._missing_demands_tracker = MissingDemandsTracker(self._demands, self._allocations)
+        return tracker
 
     def has_time_slot(self) -> bool:
         return not self._time_slot.is_empty()
 
     def add_demands(self, demands: Demands, when: datetime) -> ProjectAllocationsDemandsScheduledEvent:
-        self._demands = self._demands.with_new(demands)
+        new_demands = self._demands.with_new(demands)
+        self._tracker().demands_added(new_demands)
+        self._demands = new_demands
         return ProjectAllocationsDemandsScheduledEvent(
             project_id=self._project_id, missing_demands=self.missing_demands(), occurred_at=when
         )
@@ -0,0 +1,90 @@
+from typing import Final
+
+import pytest
+
+from schedule.allocation.capability_scheduling.allocatable_capability_id import AllocatableCapabilityId
+from schedule.shared.capability.capability import Capability
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ...availability import AvailabilityFacade
+from ...availability.owner import Owner
+from ..allocation_facade import AllocationFacade
+from ..capability_scheduling.allocatable_resource_id import AllocatableResourceId
+from ..capability_scheduling.capability_scheduler import CapabilityScheduler
+from ..capability_scheduling.capability_selector import CapabilitySelector
+from ..demand import Demand
+from ..demands import Demands
+from ..project_allocations_id import ProjectAllocationsId
+
+
+class TestAllocatingDemands:
+    ONE_DAY: Final = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    JAVA: Final = Demand(Capability.skill("JAVA"), ONE_DAY)
+    PYTHON: Final = Demand(Capability.skill("PYTHON"), ONE_DAY)
+
+    @pytest.fixture(autouse=True)
+    def setup(
+        self,
+        capability_scheduler: CapabilityScheduler,
+        allocation_facade: AllocationFacade,
+        availability_facade: AvailabilityFacade,
+    ) -> None:
+        self._capability_scheduler = capability_scheduler
+        self._allocation_facade = allocation_facade
+        self._availability_facade = availability_facade
+
+    def test_allocates_all_demands_when_capabilities_can_be_assigned_to_each(self) -> None:
+        java_or_python = self._schedule_capabilities(
+            CapabilitySelector.can_perform_one_of(Capability.skills("JAVA", "PYTHON"))
+        )
+        only_java = self._schedule_capabilities(CapabilitySelector.can_just_perform(Capability.skill("JAVA")))
+        project_id = ProjectAllocationsId.new_one()
+        self._allocation_facade.schedule_project_allocations_demands(project_id, Demands.of(self.PYTHON, self.JAVA))
+
+        satisfied = self._allocation_facade.allocate_demands(project_id, Demands.of(self.PYTHON, self.JAVA))
+
+        assert satisfied == Demands.of(self.PYTHON, self.JAVA)
+        summary = self._allocation_facade.find_projects_allocations_by_ids(project_id)
+        allocated = {ac.allocated_capability_id for ac in summary.project_allocations[project_id].all}
+        assert allocated == {java_or_python, only_java}
+        assert summary.demands[project_id] == Demands.of(self.PYTHON, self.JAVA)
+        assert self._availability_was_blocked(allocated, project_id)
+
+    def test_returns_only_demands_that_were_satisfied(self) -> None:
+        only_java = self._schedule_capabilities(CapabilitySelector.can_just_perform(Capability.skill("JAVA")))
+        project_id = ProjectAllocationsId.new_one()
+        self._allocation_facade.schedule_project_allocations_demands(project_id, Demands.none())
+
+        satisfied = self._allocation_facade.allocate_demands(project_id, Demands.of(self.JAVA, self.PYTHON, self.JAVA))
+
+        assert satisfied == Demands.of(self.JAVA)
+        assert self._availability_was_blocked({only_java}, project_id)
+
+    def test_skips_capabilities_taken_by_other_projects(self) -> None:
+        only_java = self._schedule_capabilities(CapabilitySelector.can_just_perform(Capability.skill("JAVA")))
+        _ = self._availability_facade.block(only_java.to_availability_resource_id(), self.ONE_DAY, Owner.new_one())
+        project_id = ProjectAllocationsId.new_one()
+        self._allocation_facade.schedule_project_allocations_demands(project_id, Demands.none())
+
+        satisfied = self._allocation_facade.allocate_demands(project_id, Demands.of(self.JAVA))
+
+        assert satisfied == Demands.none()
+        summary = self._allocation_facade.find_projects_allocations_by_ids(project_id)
+        assert len(summary.project_allocations[project_id].all) == 0
+
+    def _schedule_capabilities(self, capabilities: CapabilitySelector) -> AllocatableCapabilityId:
+        allocatable_capability_ids = self._capability_scheduler.schedule_resource_capabilities_for_period(
+            AllocatableResourceId.new_one(), [capabilities], self.ONE_DAY
+        )
+        assert len(allocatable_capability_ids) == 1
+        return allocatable_capability_ids[0]
+
+    def _availability_was_blocked(
+        self, capabilities: set[AllocatableCapabilityId], project_id: ProjectAllocationsId
+    ) -> bool:
+        resource_ids = {ac.to_availability_resource_id() for ac in capabilities}
+        calendars = self._availability_facade.load_calendars(resource_ids, self.ONE_DAY)
+        owner = Owner(project_id.id)
+        return len(calendars.calendars) == len(capabilities) and all(
+            calendar.taken_by(owner) == (self.ONE_DAY,) for calendar in calendars.calendars.values()
+        )
@@ -0,0 +1,78 @@
+from typing import Final
+
+from schedule.allocation.capability_scheduling.allocatable_capability_id import AllocatableCapabilityId
+from schedule.allocation.capability_scheduling.capability_selector import CapabilitySelector
+from schedule.shared.capability.capability import Capability
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..allocated_capability import AllocatedCapability
+from ..allocations import Allocations
+
+
+class TestAllocations:
+    ADMIN_ID: Final = AllocatableCapabilityId.new_one()
+    JAVA_ID: Final = AllocatableCapabilityId.new_one()
+    ADMIN: Final = CapabilitySelector.can_just_perform(Capability.permission("admin"))
+    JAVA: Final = CapabilitySelector.can_just_perform(Capability.skill("java"))
+    FEB_1: Final = TimeSlot.create_daily_time_slot_at_utc(2020, 2, 1)
+    FEB_2: Final = TimeSlot.create_daily_time_slot_at_utc(2020, 2, 2)
+    FEB_1_MORNING: Final = TimeSlot(FEB_1.from_, FEB_1.from_.replace(hour=12))
+    FEB_1_AFTERNOON: Final = TimeSlot(FEB_1_MORNING.to, FEB_1.to)
+
+    def test_equal_regardless_of_order_of_changes(self) -> None:
+        admin = AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1)
+        java = AllocatedCapability(self.JAVA_ID, self.JAVA, self.FEB_2)
+        admin_as_java = AllocatedCapability(self.ADMIN_ID, self.JAVA, self.FEB_1)
+
+        built_step_by_step = Allocations.none().add(java).add(admin_as_java).add(admin)
+
+        assert built_step_by_step == Allocations(frozenset({admin, java, admin_as_java}))
+        assert built_step_by_step.all == {admin, java, admin_as_java}
+        assert built_step_by_step.remove(self.JAVA_ID, self.FEB_2) == Allocations.none().add(admin, admin_as_java)
+
+    def test_adding_allocated_capability_again_changes_nothing(self) -> None:
+        allocations = Allocations.none().add(AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1))
+
+        assert allocations.add(AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1)) is allocations
+
+    def test_finds_earliest_allocation_of_capability(self) -> None:
+        allocations = Allocations.none().add(
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_2),
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1),
+            AllocatedCapability(self.JAVA_ID, self.JAVA, self.FEB_1),
+        )
+
+        assert allocations.find(self.ADMIN_ID) == AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1)
+        assert allocations.find(AllocatableCapabilityId.new_one()) is None
+
+    def test_removing_part_of_slot_leaves_the_rest_allocated(self) -> None:
+        allocations = Allocations.none().add(AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1))
+
+        result = allocations.remove(self.ADMIN_ID, self.FEB_1_MORNING)
+
+        assert result.all == {AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1_AFTERNOON)}
+        assert allocations.all == {AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1)}
+
+    def test_removing_slot_cuts_it_out_of_every_overlapping_allocation(self) -> None:
+        feb_5 = TimeSlot.create_daily_time_slot_at_utc(2020, 2, 5)
+        allocations = Allocations.none().add(
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1),
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_2),
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, feb_5),
+        )
+
+        result = allocations.remove(
+            self.ADMIN_ID, TimeSlot(self.FEB_1_AFTERNOON.from_, self.FEB_2.from_.replace(hour=12))
+        )
+
+        assert result.all == {
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1_MORNING),
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, TimeSlot(self.FEB_2.from_.replace(hour=12), self.FEB_2.to)),
+            AllocatedCapability(self.ADMIN_ID, self.ADMIN, feb_5),
+        }
+
+    def test_removing_not_allocated_slot_changes_nothing(self) -> None:
+        allocations = Allocations.none().add(AllocatedCapability(self.ADMIN_ID, self.ADMIN, self.FEB_1))
+
+        assert allocations.remove(self.ADMIN_ID, self.FEB_2) == allocations
+        assert allocations.remove(self.JAVA_ID, self.FEB_1) is allocations
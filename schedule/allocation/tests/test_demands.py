@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from schedule.shared.capability import Capability
+from schedule.shared.timeslot import TimeSlot
+
+from ..allocated_capability import AllocatedCapability
+from ..allocations import Allocations
+from ..capability_scheduling.allocatable_capability_id import AllocatableCapabilityId
+from ..capability_scheduling.capability_selector import CapabilitySelector
+from ..demand import Demand
+from ..demands import INDEXED_ALLOCATIONS_THRESHOLD, Demands
+
+
+class TestDemands:
+    JAN_1 = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+
+    def test_demand_is_missing_when_no_allocation_covers_its_slot(self) -> None:
+        demands = Demands.of(Demand(Capability.skill("JAVA"), self.JAN_1))
+        allocations = Allocations.none().add(
+            AllocatedCapability(
+                AllocatableCapabilityId.new_one(),
+                CapabilitySelector.can_just_perform(Capability.skill("JAVA")),
+                TimeSlot(self.JAN_1.from_, self.JAN_1.to - timedelta(hours=1)),
+            )
+        )
+
+        assert demands.missing_demands(allocations) == demands
+
+    def test_many_allocations_are_matched_same_as_few(self) -> None:
+        days = [self.JAN_1.stretch(timedelta(days=day)) for day in range(INDEXED_ALLOCATIONS_THRESHOLD * 2)]
+        skills = [Capability.skill("JAVA"), Capability.skill("PYTHON"), Capability.permission("ADMIN")]
+        demands = Demands.of(
+            *[
+                Demand(skill, TimeSlot(self.JAN_1.from_ + timedelta(days=day), self.JAN_1.to + timedelta(days=day)))
+                for day in range(-5, INDEXED_ALLOCATIONS_THRESHOLD * 3)
+                for skill in skills
+            ]
+        )
+        allocations = Allocations(
+            AllocatedCapability(
+                AllocatableCapabilityId.new_one(),
+                CapabilitySelector.can_just_perform(skills[number % len(skills)]),
+                TimeSlot(day.from_ + timedelta(days=number), day.to),
+            )
+            for number, day in enumerate(days)
+        )
+
+        missing = demands.missing_demands(allocations)
+
+        assert len(allocations.all) >= INDEXED_ALLOCATIONS_THRESHOLD
+        assert missing == Demands(
+            tuple(
+                demand
+                for demand in demands.all
+                if not any(
+                    allocation.capability.can_perform(demand.capability)
+                    and demand.time_slot.within(allocation.time_slot)
+                    for allocation in allocations.all
+                )
+            )
+        )
+        assert 0 < len(missing.all) < len(demands.all)
@@ -0,0 +1,33 @@
+from typing import Final
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..demands_assignment import DemandsAssignment
+
+
+class TestDemandsAssignment:
+    JAN_1: Final = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    JAN_2: Final = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 2)
+
+    def test_assigns_one_candidate_to_slots_not_overlapping(self) -> None:
+        assignment = DemandsAssignment([self.JAN_1, self.JAN_2], [["a"], ["a"]])
+
+        assert assignment.assign() == {0: "a", 1: "a"}
+
+    def test_does_not_assign_one_candidate_to_overlapping_slots(self) -> None:
+        assignment = DemandsAssignment([self.JAN_1, self.JAN_1], [["a"], ["a"]])
+
+        assert assignment.assign() == {0: "a"}
+
+    def test_moves_assigned_slots_to_other_candidates_to_make_room(self) -> None:
+        assignment = DemandsAssignment([self.JAN_1, self.JAN_1, self.JAN_1], [["a", "b"], ["a", "c"], ["b", "c"]])
+
+        assigned = assignment.assign()
+
+        assert assigned.keys() == {0, 1, 2}
+        assert len(set(assigned.values())) == 3
+
+    def test_leaves_slots_without_candidates_unassigned(self) -> None:
+        assignment = DemandsAssignment([self.JAN_1, self.JAN_2], [[], ["a"]])
+
+        assert assignment.assign() == {1: "a"}
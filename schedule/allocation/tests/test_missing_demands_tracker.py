@@ -0,0 +1,64 @@
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Final
+
+from schedule.allocation.capability_scheduling.allocatable_capability_id import AllocatableCapabilityId
+from schedule.allocation.capability_scheduling.capability_selector import CapabilitySelector
+from schedule.shared.capability.capability import Capability
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..allocations import Allocations
+from ..demand import Demand
+from ..demands import Demands
+from ..project_allocations import ProjectAllocations
+from ..project_allocations_id import ProjectAllocationsId
+
+
+class TestMissingDemandsTracker:
+    WHEN: Final = datetime.min.replace(tzinfo=UTC)
+    FEB_1: Final = TimeSlot.create_daily_time_slot_at_utc(2020, 2, 1)
+    CAPABILITIES: Final = (Capability.skill("java"), Capability.skill("python"), Capability.permission("admin"))
+
+    def test_tracks_missing_demands_through_allocating_and_releasing(self) -> None:
+        randomizer = random.Random(7)
+        resources = [AllocatableCapabilityId.new_one() for _ in range(5)]
+        allocations = ProjectAllocations.with_demands(ProjectAllocationsId.new_one(), self._demands(randomizer, 20))
+
+        for step in range(200):
+            resource_id, slot = randomizer.choice(resources), self._slot(randomizer)
+            if step % 50 == 0:
+                event = allocations.add_demands(self._demands(randomizer, 5), self.WHEN)
+            elif randomizer.random() < 0.6:
+                selector = CapabilitySelector.can_perform_one_of(set(randomizer.sample(self.CAPABILITIES, 2)))
+                event = allocations.allocate(resource_id, selector, slot, self.WHEN)
+            else:
+                event = allocations.release(resource_id, slot, self.WHEN)
+
+            expected = allocations.demands.missing_demands(allocations.allocations)
+            assert allocations.missing_demands() == expected
+            if event is not None:
+                assert event.missing_demands == expected
+
+    def test_keeps_duplicated_demands_missing_until_allocated(self) -> None:
+        java = Demand(Capability.skill("java"), self.FEB_1)
+        allocations = ProjectAllocations(
+            ProjectAllocationsId.new_one(), Allocations.none(), Demands.of(java, java), TimeSlot.empty()
+        )
+        resource_id = AllocatableCapabilityId.new_one()
+
+        assert allocations.missing_demands() == Demands.of(java, java)
+        _ = allocations.allocate(
+            resource_id, CapabilitySelector.can_just_perform(Capability.skill("java")), self.FEB_1, self.WHEN
+        )
+        assert allocations.missing_demands() == Demands.none()
+        _ = allocations.release(resource_id, self.FEB_1, self.WHEN)
+        assert allocations.missing_demands() == Demands.of(java, java)
+
+    def _demands(self, randomizer: random.Random, count: int) -> Demands:
+        return Demands(
+            tuple(Demand(randomizer.choice(self.CAPABILITIES), self._slot(randomizer)) for _ in range(count))
+        )
+
+    def _slot(self, randomizer: random.Random) -> TimeSlot:
+        start = self.FEB_1.from_ + timedelta(hours=randomizer.randint(0, 20))
+        return TimeSlot(start, start + timedelta(hours=randomizer.randint(1, 4)))
@@ -1,8 +1,19 @@
 from .availability_facade import AvailabilityFacade
+from .availability_request import AvailabilityRequest
 from .calendar import Calendar
 from .calendars import Calendars
 from .owner import Owner
 from .resource_id import ResourceId
+from .resource_selection_policy import ResourceSelectionPolicy
 from .resource_taken_over_event import ResourceTakenOverEvent
 
-__all__ = ["AvailabilityFacade", "Calendar", "Calendars", "Owner", "ResourceId", "ResourceTakenOverEvent"]
+__all__ = [
+    "AvailabilityFacade",
+    "AvailabilityRequest",
+    "Calendar",
+    "Calendars",
+    "Owner",
+    "ResourceId",
+    "ResourceSelectionPolicy",
+    "ResourceTakenOverEvent",
+]
@@ -1,9 +1,11 @@
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import ClassVar
 
 from schedule.availability.resource_taken_over_event import ResourceTakenOverEvent
 from schedule.shared.event.event_publisher import EventPublisher
 from schedule.shared.timeslot.time_slot import TimeSlot
 
+from .availability_request import AvailabilityRequest
 from .calendar import Calendar
 from .calendars import Calendars
 from .grouped_resource_availability import GroupedResourceAvailability
@@ -11,11 +13,15 @@ from .owner import Owner
 from .repository.availability_sqla_repository import ResourceAvailabilityRepository
 from .repository.resource_availability_read_model import ResourceAvailabilityReadModel
 from .resource_id import ResourceId
+from .resource_selection_policy import ResourceSelectionPolicy
+from .time_blocks.atomic_time_block import AtomicTimeBlock
 from .time_blocks.duration_unit import DurationUnit
 from .time_blocks.normalized_slot import NormalizedSlot
 
 
 class AvailabilityFacade:
+    CANDIDATES_BATCH_SIZE: ClassVar[int] = 3
+
     def __init__(
         self,
         repository: ResourceAvailabilityRepository,
@@ -34,52 +40,113 @@ class AvailabilityFacade:
         self, resource_id: ResourceId, time_slot: TimeSlot
     ) -> None:  # TODO: check usages and add parent  # noqa: FIX002, TD002
         """Create and persist availability slots for given resource over provided time_slot."""
-        grouped_availability = GroupedResourceAvailability.of(
+        self._repository.add_time_blocks(
             resource_id=resource_id,
-            time_slot=time_slot,
-            duration_unit=self._duration_unit,
+            time_blocks=AtomicTimeBlock.iter_split(time_slot=time_slot, duration_unit=self._duration_unit),
         )
-        self._repository.add(grouped_availability)
+        self._read_model.invalidate(resource_id, NormalizedSlot.from_time_slot(time_slot, self._duration_unit))
 
     def block(self, resource_id: ResourceId, time_slot: TimeSlot, requester: Owner) -> bool:
         """Reserve the resource for given time_slot and set the owner of this reservation to the requester."""
-        grouped = self.find(resource_id=resource_id, time_slot=time_slot)
-        return self._block(grouped, requester)
+        normalized = NormalizedSlot.from_time_slot(time_slot=time_slot, duration_unit=self._duration_unit)
+        if result := self._repository.block_within_slot(
+            resource_id=resource_id, time_slot=normalized, requester=requester
+        ):
+            self._read_model.invalidate(resource_id, normalized)
+        return result
 
     def block_random_available(
         self, resource_ids: Iterable[ResourceId], within: TimeSlot, requester: Owner
     ) -> ResourceId | None:
-        time_slot = NormalizedSlot.from_time_slot(time_slot=within, duration_unit=self._duration_unit)
-        grouped_availability = GroupedResourceAvailability(
-            self._repository.load_availabilities_of_random_resources_within(time_slot, *resource_ids)
-        )
-        result = self._block(grouped_availability, requester)
-        return grouped_availability.resource_id if result is True else None
+        return self.block_any_available(resource_ids, within, requester, ResourceSelectionPolicy.RANDOM)
 
-    def _block(self, to_block: GroupedResourceAvailability, requester: Owner) -> bool:
-        result = to_block.block(requester=requester)
-        if result is True:
-            self._repository.add(to_block)
-        return result
+    def block_any_available(
+        self,
+        resource_ids: Iterable[ResourceId],
+        within: TimeSlot,
+        requester: Owner,
+        policy: ResourceSelectionPolicy,
+    ) -> ResourceId | None:
+        """Block one of the resources free for the entire slot, chosen by the policy.
+
+        When a chosen resource is taken concurrently, the guarded block fails and the next one preferred
+        by the policy is tried, fetching further candidates in batches until none are left.
+        """
+        time_slot = NormalizedSlot.from_time_slot(time_slot=within, duration_unit=self._duration_unit)
+        remaining = list(dict.fromkeys(resource_ids))
+        while candidates := self._repository.find_available_resources_within(
+            time_slot, remaining, policy, limit=self.CANDIDATES_BATCH_SIZE
+        ):
+            for candidate in candidates:
+                if self._repository.block_within_slot(resource_id=candidate, time_slot=time_slot, requester=requester):
+                    self._read_model.invalidate(candidate, time_slot)
+                    return candidate
+            tried = set(candidates)
+            remaining = [resource_id for resource_id in remaining if resource_id not in tried]
+        return None
 
     def release(self, resource_id: ResourceId, time_slot: TimeSlot, requester: Owner) -> bool:
         """Delete existing reservation for the given resource and for the given time_slot if requester matches."""
-        grouped = self.find(resource_id=resource_id, time_slot=time_slot)
-        result = grouped.release(requester=requester)
-        if result is True:
-            self._repository.add(grouped)
-        else:
-            self._repository.expire(
-                grouped
-            )  # TODO: probably not needed once transactions with proper rollbacks are added  # noqa: FIX002, TD002
+        normalized = NormalizedSlot.from_time_slot(time_slot=time_slot, duration_unit=self._duration_unit)
+        if result := self._repository.release_within_slot(
+            resource_id=resource_id, time_slot=normalized, requester=requester
+        ):
+            self._read_model.invalidate(resource_id, normalized)
         return result
 
+    def block_many(self, requests: Sequence[AvailabilityRequest], *, all_or_nothing: bool = False) -> list[bool]:
+        """Block several resource slots with one query and one update, reporting success per request.
+
+        With all_or_nothing, nothing is blocked unless every request can be.
+        """
+        return self._change_many(requests, GroupedResourceAvailability.block, all_or_nothing=all_or_nothing)
+
+    def release_many(self, requests: Sequence[AvailabilityRequest], *, all_or_nothing: bool = False) -> list[bool]:
+        """Release several resource slots with one query and one update, reporting success per request.
+
+        With all_or_nothing, nothing is released unless every request can be.
+        """
+        return self._change_many(requests, GroupedResourceAvailability.release, all_or_nothing=all_or_nothing)
+
+    def _change_many(
+        self,
+        requests: Sequence[AvailabilityRequest],
+        change: Callable[[GroupedResourceAvailability, Owner], bool],
+        *,
+        all_or_nothing: bool,
+    ) -> list[bool]:
+        slots = [
+            (request.resource_id, NormalizedSlot.from_time_slot(request.time_slot, self._duration_unit))
+            for request in requests
+        ]
+        by_resource = self._repository.load_grouped_within_slots(slots)
+
+        results: list[bool] = []
+        for request, (resource_id, time_slot) in zip(requests, slots, strict=True):
+            # requests for overlapping slots of a resource see the changes of the ones before them
+            grouped = by_resource[resource_id].within(time_slot)
+            # checked up front, so a failed request leaves no partially changed blocks behind
+            result = grouped.is_available_for(request.requester) and change(grouped, request.requester)
+            if result:
+                by_resource[resource_id].merge(grouped)
+            results.append(result)
+
+        if all_or_nothing and not all(results):
+            return [False] * len(requests)
+        self._repository.add_all_grouped(list(by_resource.values()))
+        for (resource_id, time_slot), result in zip(slots, results, strict=True):
+            if result:
+                self._read_model.invalidate(resource_id, time_slot)
+        return results
+
     def disable(self, resource_id: ResourceId, time_slot: TimeSlot, requester: Owner) -> bool:
         """Turn off the possibility of reserving the resource, used by superusers or admins."""
-        to_disable = self.find(resource_id=resource_id, time_slot=time_slot)
-        previous_owners = to_disable.owners
-        if result := to_disable.disable(requester=requester):
-            self._repository.add(to_disable)
+        normalized = NormalizedSlot.from_time_slot(time_slot=time_slot, duration_unit=self._duration_unit)
+        previous_owners = self._repository.owners_within_slot(resource_id=resource_id, time_slot=normalized)
+        if result := self._repository.disable_within_slot(
+            resource_id=resource_id, time_slot=normalized, requester=requester
+        ):
+            self._read_model.invalidate(resource_id, normalized)
             self._event_publisher.publish(
                 ResourceTakenOverEvent(resource_id=resource_id, slot=time_slot, previous_owners=previous_owners)
             )
@@ -87,8 +154,7 @@ class AvailabilityFacade:
 
     def find(self, resource_id: ResourceId, time_slot: TimeSlot) -> GroupedResourceAvailability:
         time_slot = NormalizedSlot.from_time_slot(time_slot=time_slot, duration_unit=self._duration_unit)
-        availabilities = self._repository.load_all_within_slot(resource_id=resource_id, time_slot=time_slot)
-        return GroupedResourceAvailability(availabilities)
+        return self._repository.load_grouped_within_slot(resource_id=resource_id, time_slot=time_slot)
 
     def load_calendar(self, resource_id: ResourceId, within: TimeSlot) -> Calendar:
         normalized = NormalizedSlot.from_time_slot(within, self._duration_unit)
@@ -97,3 +163,8 @@ class AvailabilityFacade:
     def load_calendars(self, resource_ids: Iterable[ResourceId], within: TimeSlot) -> Calendars:
         normalized = NormalizedSlot.from_time_slot(within, self._duration_unit)
         return self._read_model.load_all(resource_ids, normalized)
+
+    def stream_calendars(self, resource_ids: Iterable[ResourceId], within: TimeSlot) -> Iterator[Calendar]:
+        """Yield calendars one resource at a time, keeping memory bounded for large sets of resources."""
+        normalized = NormalizedSlot.from_time_slot(within, self._duration_unit)
+        return self._read_model.stream_all(resource_ids, normalized)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import attrs as a
+
+from schedule.shared.timeslot import TimeSlot
+
+from .owner import Owner
+from .resource_id import ResourceId
+
+
+@a.frozen
+class AvailabilityRequest:
+    resource_id: ResourceId
+    time_slot: TimeSlot
+    requester: Owner
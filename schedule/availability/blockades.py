@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+
+from .blockade import Blockade
+from .owner import Owner
+
+
+class Blockades:
+    """Blockades of contiguous time blocks, stored as indices into a table of owners and a bitmap of disabled blocks.
+
+    Changes apply to every block or to none of them.
+    """
+
+    __slots__ = ("_disabled", "_owner_indices", "_owners", "_taken_by")
+
+    _NONE_INDEX = 0
+
+    def __init__(self, blockades: Iterable[Blockade] = ()) -> None:
+        self._owners: list[Owner] = [Owner.none()]
+        self._owner_indices: dict[Owner, int] = {Owner.none(): self._NONE_INDEX}
+        self._taken_by: array[int] = array("I")
+        self._disabled: int = 0
+        for blockade in blockades:
+            self.append(blockade.taken_by, disabled=blockade.disabled)
+
+    def append(self, taken_by: Owner, *, disabled: bool) -> None:
+        self._disabled |= disabled << len(self)
+        self._taken_by.append(self._index_of(taken_by))
+
+    def slice(self, start: int, stop: int) -> Blockades:
+        """Copy the blockades of positions from start up to stop."""
+        blockades = Blockades()
+        for position in range(start, stop):
+            blockades.append(self._owners[self._taken_by[position]], disabled=bool(self._disabled >> position & 1))
+        return blockades
+
+    def copy(self) -> Blockades:
+        return self.slice(0, len(self))
+
+    def assign(self, start: int, blockades: Blockades) -> None:
+        """Overwrite the positions from start on with the given blockades."""
+        for offset, blockade in enumerate(blockades):
+            position = start + offset
+            self._taken_by[position] = self._index_of(blockade.taken_by)
+            self._disabled = self._disabled & ~(1 << position) | blockade.disabled << position
+
+    def positions_differing_from(self, other: Blockades) -> list[int]:
+        return [position for position in range(len(self)) if self[position] != other[position]]
+
+    def __len__(self) -> int:
+        return len(self._taken_by)
+
+    def __getitem__(self, position: int) -> Blockade:
+        return Blockade(self._owners[self._taken_by[position]], bool(self._disabled >> position & 1))
+
+    def __iter__(self) -> Iterator[Blockade]:
+        return (self[position] for position in range(len(self)))
+
+    @property
+    def owners(self) -> frozenset[Owner]:
+        return frozenset(self._owners[index] for index in set(self._taken_by))
+
+    def is_available_for(self, requester: Owner) -> bool:
+        if self._disabled:
+            return False
+        requester_index = self._owner_indices.get(requester, self._NONE_INDEX)
+        return set(self._taken_by) <= {self._NONE_INDEX, requester_index}
+
+    def blocked_entirely_by(self, owner: Owner) -> bool:
+        index = self._owner_indices.get(owner)
+        if index is None:
+            return not self._taken_by
+        return self._taken_by.count(index) == len(self)
+
+    def is_disabled_entirely_by(self, owner: Owner) -> bool:
+        return self._disabled == self._all_blocks and self.blocked_entirely_by(owner)
+
+    def positions_blocked_by(self, owner: Owner) -> list[int]:
+        index = self._owner_indices.get(owner)
+        return [position for position, taken_by in enumerate(self._taken_by) if taken_by == index]
+
+    def block(self, requester: Owner) -> bool:
+        if not self.is_available_for(requester):
+            return False
+        self._fill(requester, disabled=False)
+        return True
+
+    def release(self, requester: Owner) -> bool:
+        if not self.is_available_for(requester):
+            return False
+        self._fill(Owner.none(), disabled=False)
+        return True
+
+    def disable(self, requester: Owner) -> bool:
+        self._fill(requester, disabled=True)
+        return True
+
+    def _fill(self, owner: Owner, *, disabled: bool) -> None:
+        self._taken_by = array("I", [self._index_of(owner)]) * len(self)
+        self._disabled = self._all_blocks if disabled else 0
+
+    def _index_of(self, owner: Owner) -> int:
+        index = self._owner_indices.get(owner)
+        if index is None:
+            index = self._owner_indices[owner] = len(self._owners)
+            self._owners.append(owner)
+        return index
+
+    @property
+    def _all_blocks(self) -> int:
+        return (1 << len(self)) - 1
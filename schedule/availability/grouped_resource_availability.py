@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from typing import TYPE_CHECKING
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
 
 import attrs as a
 
 from schedule.shared.timeslot import TimeSlot
 
+from .blockade import Blockade
+from .blockades import Blockades
 from .owner import Owner
 from .resource_availability import ResourceAvailability
 from .resource_availability_id import ResourceAvailabilityId
@@ -14,43 +19,64 @@ from .resource_id import ResourceId
 from .time_blocks.atomic_time_block import AtomicTimeBlock
 from .time_blocks.duration_unit import DurationUnit
 
-if TYPE_CHECKING:
-    from attr import Attribute
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
 
 
-def _convert_sequence_to_list(resource_availabilities: Sequence[ResourceAvailability]) -> list[ResourceAvailability]:
-    return list(resource_availabilities)
+def _to_microseconds(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
 
 
-def _validate_all_resource_availabilities_have_the_same_resource_id(
-    instance: GroupedResourceAvailability,  # pyright: ignore [reportUnusedParameter]  # noqa: ARG001
-    attribute: Attribute[list[ResourceAvailability]],  # pyright: ignore [reportUnusedParameter]  # noqa: ARG001
-    value: list[ResourceAvailability],
-) -> None:
-    if not all(resource_availability.resource_id == value[0].resource_id for resource_availability in value):
-        msg = "Resource ids do not match"
-        raise ValueError(msg)
+def _to_datetime(microseconds: int) -> datetime:
+    return _EPOCH + microseconds * _MICROSECOND
+
+
+class TimeBlockState(NamedTuple):
+    id: ResourceAvailabilityId
+    time_block: AtomicTimeBlock
+    blockade: Blockade
+    version: int
 
 
 @a.define
 class GroupedResourceAvailability:
-    _resource_availabilities: list[ResourceAvailability] = a.field(
-        converter=_convert_sequence_to_list, validator=_validate_all_resource_availabilities_have_the_same_resource_id
-    )
+    """Time blocks of a resource changed together.
+
+    Their ids, periods, versions and blockades are kept in compact columns, in the order of the blocks, rather than
+    as ResourceAvailability objects. Blocks of version 0 are new, the others were loaded with that version.
+    """
+
+    _resource_id: ResourceId
+    _ids: list[ResourceAvailabilityId] = a.field(init=False, factory=list, repr=False)
+    _starts: array[int] = a.field(init=False, factory=lambda: array("q"), eq=False, repr=False)
+    _ends: array[int] = a.field(init=False, factory=lambda: array("q"), eq=False, repr=False)
+    _versions: array[int] = a.field(init=False, factory=lambda: array("q"), eq=False, repr=False)
+    _blockades: Blockades = a.field(init=False, factory=Blockades, eq=False, repr=False)
+    _loaded_blockades: Blockades = a.field(init=False, factory=Blockades, eq=False, repr=False)
+
+    def append(
+        self, id_: ResourceAvailabilityId, from_: datetime, to: datetime, blockade: Blockade, version: int
+    ) -> None:
+        """Add a time block following the ones already in the group."""
+        self._ids.append(id_)
+        self._starts.append(_to_microseconds(from_))
+        self._ends.append(_to_microseconds(to))
+        self._versions.append(version)
+        self._blockades.append(blockade.taken_by, disabled=blockade.disabled)
+        self._loaded_blockades.append(blockade.taken_by, disabled=blockade.disabled)
 
     @property
     def owners(self) -> frozenset[Owner]:
-        return frozenset(ra.blocked_by for ra in self._resource_availabilities)
+        return self._blockades.owners
 
     @property
     def resource_availabilities(self) -> list[ResourceAvailability]:
-        return self._resource_availabilities
+        """Build detached copies of the time blocks, changes to which do not affect the group."""
+        return [self._to_availability(state) for state in self.time_blocks()]
 
     @property
     def resource_id(self) -> ResourceId | None:
-        if self.resource_availabilities:
-            return self.resource_availabilities[0].resource_id
-        return None
+        return self._resource_id if self._is_not_empty else None
 
     @staticmethod
     def of(
@@ -58,55 +84,98 @@ class GroupedResourceAvailability:
         time_slot: TimeSlot,
         duration_unit: DurationUnit,
     ) -> GroupedResourceAvailability:
-        resource_availabilities = [
-            ResourceAvailability(
-                ResourceAvailabilityId.new_one(),
-                resource_id,
-                quantized_time_slot,
+        grouped = GroupedResourceAvailability(resource_id)
+        for quantized_time_slot in AtomicTimeBlock.split(time_slot=time_slot, duration_unit=duration_unit):
+            grouped.append(
+                ResourceAvailabilityId.new_one(), quantized_time_slot.from_, quantized_time_slot.to, Blockade.none(), 0
             )
-            for quantized_time_slot in AtomicTimeBlock.split(time_slot=time_slot, duration_unit=duration_unit)
-        ]
-        return GroupedResourceAvailability(resource_availabilities)
+        return grouped
+
+    def within(self, time_slot: TimeSlot) -> GroupedResourceAvailability:
+        """Copy the time blocks within the slot into a group of their own, to be merged back once changed."""
+        start, stop = self._positions_within(time_slot)
+        grouped = GroupedResourceAvailability(self._resource_id)
+        grouped._ids = self._ids[start:stop]
+        grouped._starts = self._starts[start:stop]
+        grouped._ends = self._ends[start:stop]
+        grouped._versions = self._versions[start:stop]
+        grouped._blockades = self._blockades.slice(start, stop)
+        grouped._loaded_blockades = self._loaded_blockades.slice(start, stop)
+        return grouped
+
+    def merge(self, within: GroupedResourceAvailability) -> None:
+        """Take the blockades of a group built by within."""
+        if within._is_not_empty:
+            self._blockades.assign(bisect_left(self._starts, within._starts[0]), within._blockades)
+
+    def time_blocks(self) -> Iterator[TimeBlockState]:
+        return (self._state_at(position) for position in range(len(self)))
+
+    def changed_time_blocks(self) -> list[TimeBlockState]:
+        """Return the new time blocks and the ones whose blockade changed since they were loaded."""
+        return [self._state_at(position) for position in self._positions_changed()]
+
+    def saved(self) -> None:
+        """Take the changed time blocks as loaded again, with the versions they were saved with."""
+        for position in self._positions_changed():
+            self._versions[position] += 1
+        self._loaded_blockades = self._blockades.copy()
 
     def block(self, requester: Owner) -> bool:
-        return self._is_not_empty and all(
-            resource_availability.block(requester) for resource_availability in self.resource_availabilities
-        )
+        return self._change(Blockades.block, requester)
+
+    def is_available_for(self, requester: Owner) -> bool:
+        """Tell whether block and release would succeed for the requester."""
+        return self._is_not_empty and self._blockades.is_available_for(requester)
 
     def blocked_entirely_by(self, owner: Owner) -> bool:
-        return all(resource_availability.blocked_by == owner for resource_availability in self._resource_availabilities)
+        return self._blockades.blocked_entirely_by(owner)
 
     def __len__(self) -> int:
-        return len(self._resource_availabilities)
+        return len(self._ids)
 
     def is_disabled_entirely_by(self, owner: Owner) -> bool:
-        return all(
-            resource_availability.is_disabled_by(requester=owner)
-            for resource_availability in self._resource_availabilities
-        )
+        return self._blockades.is_disabled_entirely_by(owner)
 
     def disable(self, requester: Owner) -> bool:
-        return self._is_not_empty and all(
-            resource_availability.disable(requester) for resource_availability in self._resource_availabilities
-        )
+        return self._change(Blockades.disable, requester)
 
     def is_entirely_available(self) -> bool:
-        return all(resource_availability.blocked_by for resource_availability in self._resource_availabilities)
+        return all(self.owners)
 
     def release(self, requester: Owner) -> bool:
-        return self._is_not_empty and all(
-            resource_availability.release(requester) for resource_availability in self._resource_availabilities
-        )
+        return self._change(Blockades.release, requester)
 
     def find_blocked_by(self, owner: Owner) -> list[ResourceAvailability]:
         return [
-            resource_availability
-            for resource_availability in self.resource_availabilities
-            if resource_availability.blocked_by == owner
+            self._to_availability(self._state_at(position)) for position in self._blockades.positions_blocked_by(owner)
         ]
 
+    def _change(self, change: Callable[[Blockades, Owner], bool], requester: Owner) -> bool:
+        return self._is_not_empty and change(self._blockades, requester)
+
+    def _positions_within(self, time_slot: TimeSlot) -> tuple[int, int]:
+        start = bisect_left(self._starts, _to_microseconds(time_slot.from_))
+        stop = bisect_right(self._ends, _to_microseconds(time_slot.to))
+        return start, max(start, stop)
+
+    def _positions_changed(self) -> list[int]:
+        changed = set(self._blockades.positions_differing_from(self._loaded_blockades))
+        return [position for position in range(len(self)) if position in changed or self._versions[position] == 0]
+
+    def _state_at(self, position: int) -> TimeBlockState:
+        return TimeBlockState(
+            self._ids[position],
+            AtomicTimeBlock(_to_datetime(self._starts[position]), _to_datetime(self._ends[position])),
+            self._blockades[position],
+            self._versions[position],
+        )
+
+    def _to_availability(self, state: TimeBlockState) -> ResourceAvailability:
+        return ResourceAvailability(state.id, self._resource_id, state.time_block, state.blockade, state.version)
+
     @property
     def _is_not_empty(self) -> bool:
         # TODO: consider raising exception in case of empty list   # noqa: FIX002, TD002
         #  - what's the point of changing empty availabilities?
-        return len(self._resource_availabilities) > 0
+        return len(self) > 0
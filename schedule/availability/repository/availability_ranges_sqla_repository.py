@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from datetime import UTC, datetime
+from itertools import batched
+from operator import attrgetter
+from typing import Any, ClassVar, NamedTuple, cast, override
+
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    ColumnElement,
+    Row,
+    Select,
+    Table,
+    and_,
+    delete,
+    event,
+    func,
+    insert,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import TSTZRANGE, UUID, ExcludeConstraint, Range
+from sqlalchemy.orm import Session  # noqa: TC002 # needed for dependency injection
+from sqlalchemy.orm.exc import StaleDataError
+
+from schedule.availability.blockade import Blockade
+from schedule.availability.grouped_resource_availability import GroupedResourceAvailability
+from schedule.availability.owner import Owner
+from schedule.availability.resource_availability import ResourceAvailability
+from schedule.availability.resource_availability_id import ResourceAvailabilityId
+from schedule.availability.resource_id import ResourceId
+from schedule.availability.resource_selection_policy import ResourceSelectionPolicy
+from schedule.availability.time_blocks.atomic_time_block import AtomicTimeBlock
+from schedule.availability.time_blocks.duration_unit import DurationUnit
+from schedule.availability.time_blocks.normalized_slot import NormalizedSlot
+from schedule.shared.sqla_repository import EmbeddedUUID
+from schedule.shared.sqla_repository.mappers import mapper_registry
+
+from .availability_sqla_repository import BULK_INSERT_BATCH_SIZE, ResourceAvailabilityRepository
+from .resource_selection import LOAD_HORIZON, selection_order
+
+availability_ranges = Table(
+    "availability_ranges",
+    mapper_registry.metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("resource_id", EmbeddedUUID[ResourceId], nullable=False),
+    Column("period", TSTZRANGE, nullable=False),
+    Column("taken_by", UUID(as_uuid=True), nullable=False),
+    Column("disabled", Boolean, nullable=False),
+    ExcludeConstraint(("resource_id", "="), ("period", "&&"), name="availability_ranges_no_overlap", using="gist"),
+)
+
+# gist indexes on uuid equality, needed by the exclusion constraint, come from btree_gist
+event.listen(availability_ranges, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"))  # type: ignore[no-untyped-call]
+
+
+class AvailabilityRange(NamedTuple):
+    from_: datetime
+    to: datetime
+    taken_by: Owner
+    disabled: bool
+
+    def continues_with(self, other: AvailabilityRange) -> bool:
+        return self.to == other.from_ and (self.taken_by, self.disabled) == (other.taken_by, other.disabled)
+
+    def overlaps_any(self, others: Iterable[AvailabilityRange]) -> bool:
+        return any(self.from_ < other.to and other.from_ < self.to for other in others)
+
+
+def coalesce(ranges: Iterable[AvailabilityRange]) -> list[AvailabilityRange]:
+    result: list[AvailabilityRange] = []
+    for current in sorted(ranges, key=attrgetter("from_")):
+        if result and result[-1].continues_with(current):
+            result[-1] = result[-1]._replace(to=current.to)
+        else:
+            result.append(current)
+    return result
+
+
+def overlay(existing: Iterable[AvailabilityRange], updates: list[AvailabilityRange]) -> list[AvailabilityRange]:
+    """Replace the parts of existing ranges covered by sorted, disjoint updates and coalesce the outcome."""
+    pieces: list[AvailabilityRange] = []
+    for range_ in existing:
+        start = range_.from_
+        for update in updates:
+            if update.to <= start or update.from_ >= range_.to:
+                continue
+            if update.from_ > start:
+                pieces.append(range_._replace(from_=start, to=update.from_))
+            start = update.to
+        if start < range_.to:
+            pieces.append(range_._replace(from_=start))
+    return coalesce([*pieces, *updates])
+
+
+class LoadedRanges:
+    """Ranges a session read or wrote and time blocks it handed out within its current transaction.
+
+    Both are forgotten once the transaction commits or rolls back.
+    """
+
+    _INFO_KEY: ClassVar[str] = "loaded_availability_ranges"
+
+    def __init__(self) -> None:
+        self.ranges: defaultdict[ResourceId, dict[uuid.UUID, AvailabilityRange]] = defaultdict(dict)
+        self.time_blocks: dict[ResourceAvailabilityId, tuple[ResourceId, datetime]] = {}
+
+    @classmethod
+    def of(cls, session: Session) -> LoadedRanges:
+        loaded = session.info.get(cls._INFO_KEY)
+        if loaded is None:
+            loaded = session.info[cls._INFO_KEY] = cls()
+            event.listen(session, "after_commit", loaded._forget)
+            event.listen(session, "after_rollback", loaded._forget)
+        return cast("LoadedRanges", loaded)
+
+    def _forget(self, _session: Session) -> None:
+        self.ranges.clear()
+        self.time_blocks.clear()
+
+
+class ResourceAvailabilityRangesRepository(ResourceAvailabilityRepository):
+    """Stores each run of contiguous time blocks sharing a blockade as a single range row.
+
+    Time blocks are still handed out as separate ResourceAvailability objects, so the domain model is unchanged.
+    Writes split and coalesce the ranges they touch. Block, release and disable lock the ranges before deciding.
+    Other writes check that the ranges they replace are still the ones loaded, raising StaleDataError otherwise,
+    as the version column does for time blocks stored one per row. Loaded ranges are remembered per session until its
+    transaction ends, so time blocks have to be written in the transaction that loaded them.
+    """
+
+    MAX_LOCK_ATTEMPTS: ClassVar[int] = 3
+
+    def __init__(self, session: Session, duration_unit: DurationUnit | None = None) -> None:
+        super().__init__(session)
+        if duration_unit is None:
+            duration_unit = DurationUnit.default()
+        self._duration_unit: DurationUnit = duration_unit
+        loaded = LoadedRanges.of(session)
+        self._loaded: defaultdict[ResourceId, dict[uuid.UUID, AvailabilityRange]] = loaded.ranges
+        self._time_blocks: dict[ResourceAvailabilityId, tuple[ResourceId, datetime]] = loaded.time_blocks
+
+    @override
+    def add(self, model: ResourceAvailability | GroupedResourceAvailability) -> None:
+        match model:
+            case ResourceAvailability():
+                self.add_all([model])
+            case GroupedResourceAvailability():
+                self.add_all_grouped([model])
+
+    @override
+    def add_all(self, models: Sequence[ResourceAvailability]) -> None:
+        updates: defaultdict[ResourceId, list[AvailabilityRange]] = defaultdict(list)
+        for model in models:
+            updates[model.resource_id].append(
+                AvailabilityRange(model.time_block.from_, model.time_block.to, model.blocked_by, model.is_disabled())
+            )
+        for resource_id, ranges in updates.items():
+            self._write(resource_id, coalesce(ranges))
+
+    @override
+    def add_all_grouped(self, models: Sequence[GroupedResourceAvailability]) -> None:
+        for model in models:
+            if (resource_id := model.resource_id) is None:
+                continue
+            self._write(
+                resource_id,
+                coalesce(
+                    AvailabilityRange(
+                        state.time_block.from_, state.time_block.to, state.blockade.taken_by, state.blockade.disabled
+                    )
+                    for state in model.changed_time_blocks()
+                ),
+            )
+            model.saved()
+
+    @override
+    def add_time_blocks(self, resource_id: ResourceId, time_blocks: Iterable[AtomicTimeBlock]) -> None:
+        self._insert(
+            resource_id,
+            coalesce(
+                AvailabilityRange(time_block.from_, time_block.to, Owner.none(), disabled=False)
+                for time_block in time_blocks
+            ),
+        )
+
+    @override
+    def load_all_within_slot(
+        self, resource_id: ResourceId, time_slot: NormalizedSlot
+    ) -> Sequence[ResourceAvailability]:
+        rows = self._session.execute(self._ranges_within_slot(resource_id, time_slot)).all()
+        return self._to_availabilities(resource_id, rows, time_slot)
+
+    @override
+    def load_all_within_slots(
+        self, slots: Iterable[tuple[ResourceId, NormalizedSlot]]
+    ) -> Sequence[ResourceAvailability]:
+        slots = list(slots)
+        if not slots:
+            return []
+        stmt = select(availability_ranges).where(
+            or_(
+                *(
+                    and_(
+                        availability_ranges.c.resource_id == resource_id,
+                        availability_ranges.c.period.overlaps(Range(time_slot.from_, time_slot.to)),
+                    )
+                    for resource_id, time_slot in slots
+                )
+            )
+        )
+        rows = self._session.execute(stmt).all()
+        # time blocks shared by overlapping slots are handed out once, so changes to them are not lost
+        availabilities: dict[ResourceAvailabilityId, ResourceAvailability] = {}
+        for resource_id, time_slot in slots:
+            overlapping = [
+                row
+                for row in rows
+                if row.resource_id == resource_id
+                and row.period.lower < time_slot.to
+                and row.period.upper > time_slot.from_
+            ]
+            for availability in self._to_availabilities(resource_id, overlapping, time_slot):
+                _ = availabilities.setdefault(availability.id, availability)
+        return list(availabilities.values())
+
+    @override
+    def load_grouped_within_slots(
+        self, slots: Sequence[tuple[ResourceId, NormalizedSlot]]
+    ) -> dict[ResourceId, GroupedResourceAvailability]:
+        slots_by_resource: defaultdict[ResourceId, list[NormalizedSlot]] = defaultdict(list)
+        for resource_id, time_slot in slots:
+            slots_by_resource[resource_id].append(time_slot)
+        if not slots_by_resource:
+            return {}
+        stmt = select(availability_ranges).where(
+            or_(
+                *(
+                    and_(
+                        availability_ranges.c.resource_id == resource_id,
+                        availability_ranges.c.period.overlaps(Range(time_slot.from_, time_slot.to)),
+                    )
+                    for resource_id, time_slot in slots
+                )
+            )
+        )
+        rows_by_resource: defaultdict[ResourceId, list[Row[Any]]] = defaultdict(list)
+        for row in self._session.execute(stmt):
+            rows_by_resource[row.resource_id].append(row)
+        return {
+            resource_id: self._to_grouped(resource_id, rows_by_resource[resource_id], resource_slots)
+            for resource_id, resource_slots in slots_by_resource.items()
+        }
+
+    @override
+    def owners_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot) -> frozenset[Owner]:
+        return self.load_grouped_within_slot(resource_id, time_slot).owners
+
+    @override
+    def block_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        return self._change_within_slot(resource_id, time_slot, lambda grouped: grouped.block(requester))
+
+    @override
+    def release_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        return self._change_within_slot(resource_id, time_slot, lambda grouped: grouped.release(requester))
+
+    @override
+    def disable_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        return self._change_within_slot(resource_id, time_slot, lambda grouped: grouped.disable(requester))
+
+    @override
+    def load_by_id(self, resource_availability_id: ResourceAvailabilityId) -> ResourceAvailability:
+        """Load a time block handed out within the current transaction, the only ones whose resource is known."""
+        try:
+            resource_id, from_ = self._time_blocks[resource_availability_id]
+        except KeyError as e:
+            msg = f"Time block {resource_availability_id} was not loaded within this transaction"
+            raise self.NotFoundError(msg) from e
+        stmt = select(availability_ranges).where(
+            availability_ranges.c.resource_id == resource_id, availability_ranges.c.period.contains(from_)
+        )
+        row = self._session.execute(stmt).one_or_none()
+        if row is None:
+            msg = f"Time block {resource_availability_id} of {resource_id} no longer exists"
+            raise self.NotFoundError(msg)
+        time_slot = NormalizedSlot(from_, min(from_ + self._duration_unit.value, row.period.upper))
+        return self._to_availabilities(resource_id, [row], time_slot)[0]
+
+    @override
+    def find_available_resources_within(
+        self,
+        time_slot: NormalizedSlot,
+        resource_ids: Sequence[ResourceId],
+        policy: ResourceSelectionPolicy,
+        limit: int,
+    ) -> list[ResourceId]:
+        if not resource_ids:
+            return []
+        within_slot = availability_ranges.c.period.intersection(Range(time_slot.from_, time_slot.to))
+        free_time = func.sum(func.upper(within_slot) - func.lower(within_slot))
+        stmt = (
+            select(availability_ranges.c.resource_id)
+            .where(
+                availability_ranges.c.resource_id.in_(resource_ids),
+                availability_ranges.c.taken_by == Owner.none().id,
+                availability_ranges.c.period.overlaps(Range(time_slot.from_, time_slot.to)),
+            )
+            .group_by(availability_ranges.c.resource_id)
+            .having(free_time == time_slot.duration)
+            .order_by(
+                selection_order(
+                    policy,
+                    availability_ranges.c.resource_id,
+                    resource_ids,
+                    lambda: self._taken_time_around(time_slot),
+                )
+            )
+            .limit(limit)
+        )
+        return list(self._session.execute(stmt).scalars())
+
+    @override
+    def expire(self, model: ResourceAvailability | GroupedResourceAvailability) -> None:
+        """Nothing to expire, time blocks are rebuilt from ranges on every load."""
+
+    @staticmethod
+    def _taken_time_around(time_slot: NormalizedSlot) -> ColumnElement[Any]:
+        taken = availability_ranges.alias("taken")
+        around = taken.c.period.intersection(Range(time_slot.from_ - LOAD_HORIZON, time_slot.to + LOAD_HORIZON))
+        return (
+            select(func.sum(func.upper(around) - func.lower(around)))
+            .where(
+                taken.c.resource_id == availability_ranges.c.resource_id,
+                taken.c.taken_by != Owner.none().id,
+                taken.c.period.overlaps(Range(time_slot.from_ - LOAD_HORIZON, time_slot.to + LOAD_HORIZON)),
+            )
+            .scalar_subquery()
+        )
+
+    def _change_within_slot(
+        self,
+        resource_id: ResourceId,
+        time_slot: NormalizedSlot,
+        change: Callable[[GroupedResourceAvailability], bool],
+    ) -> bool:
+        grouped = self._to_grouped(resource_id, self._lock_within_slot(resource_id, time_slot), [time_slot])
+        if result := change(grouped):
+            self.add(grouped)
+        return result
+
+    @staticmethod
+    def _ranges_within_slot(resource_id: ResourceId, time_slot: NormalizedSlot) -> Select[tuple[Any, ...]]:
+        return select(availability_ranges).where(
+            availability_ranges.c.resource_id == resource_id,
+            availability_ranges.c.period.overlaps(Range(time_slot.from_, time_slot.to)),
+        )
+
+    def _lock_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot) -> Sequence[Row[Any]]:
+        """Lock the ranges within the slot, raising StaleDataError when they keep being replaced meanwhile."""
+        stmt = self._ranges_within_slot(resource_id, time_slot).with_for_update()
+        rows = self._session.execute(stmt).all()
+        for _ in range(self.MAX_LOCK_ATTEMPTS):
+            # ranges replaced by a transaction the lock waited for are skipped, so lock again until nothing changes
+            locked = self._session.execute(stmt).all()
+            if {row.id for row in locked} == {row.id for row in rows}:
+                return locked
+            rows = locked
+        msg = f"Availability of {resource_id} kept changing while being locked"
+        raise StaleDataError(msg)
+
+    def _write(self, resource_id: ResourceId, updates: list[AvailabilityRange]) -> None:
+        if not updates:
+            return
+        # adjacent ranges are pulled in too, so they can be coalesced with the updates
+        window = Range(updates[0].from_, updates[-1].to)
+        stmt = (
+            select(availability_ranges)
+            .where(
+                availability_ranges.c.resource_id == resource_id,
+                or_(availability_ranges.c.period.overlaps(window), availability_ranges.c.period.adjacent_to(window)),
+            )
+            .with_for_update()
+        )
+        rows = self._session.execute(stmt).all()
+        self._check_not_changed_since_loaded(resource_id, rows, updates)
+        _ = self._session.execute(
+            delete(availability_ranges).where(availability_ranges.c.id.in_([row.id for row in rows]))
+        )
+        for row in rows:
+            _ = self._loaded[resource_id].pop(row.id, None)
+        self._insert(resource_id, overlay(map(self._to_range, rows), updates))
+
+    def _check_not_changed_since_loaded(
+        self, resource_id: ResourceId, rows: Sequence[Row[Any]], updates: list[AvailabilityRange]
+    ) -> None:
+        replaced = {row.id for row in rows if self._to_range(row).overlaps_any(updates)}
+        loaded = {id_ for id_, range_ in self._loaded[resource_id].items() if range_.overlaps_any(updates)}
+        if replaced != loaded:
+            msg = f"Availability of {resource_id} changed since it was loaded"
+            raise StaleDataError(msg)
+
+    def _insert(self, resource_id: ResourceId, ranges: Iterable[AvailabilityRange]) -> None:
+        rows = (self._to_row(resource_id, range_) for range_ in ranges)
+        for batch in batched(rows, BULK_INSERT_BATCH_SIZE, strict=False):
+            _ = self._session.execute(insert(availability_ranges), list(batch))
+
+    def _to_row(self, resource_id: ResourceId, range_: AvailabilityRange) -> dict[str, Any]:
+        id_ = uuid.uuid4()
+        self._loaded[resource_id][id_] = range_
+        return {
+            "id": id_,
+            "resource_id": resource_id,
+            "period": Range(range_.from_, range_.to),
+            "taken_by": range_.taken_by.id,
+            "disabled": range_.disabled,
+        }
+
+    def _to_availabilities(
+        self, resource_id: ResourceId, rows: Sequence[Row[Any]], time_slot: NormalizedSlot
+    ) -> list[ResourceAvailability]:
+        return self._to_grouped(resource_id, rows, [time_slot]).resource_availabilities
+
+    def _to_grouped(
+        self, resource_id: ResourceId, rows: Sequence[Row[Any]], time_slots: Sequence[NormalizedSlot]
+    ) -> GroupedResourceAvailability:
+        """Split the ranges into the time blocks within any of the slots, which are all loaded with version 1."""
+        self._loaded[resource_id].update((row.id, self._to_range(row)) for row in rows)
+        grouped = GroupedResourceAvailability(resource_id)
+        for range_ in sorted(map(self._to_range, rows), key=attrgetter("from_")):
+            blockade = Blockade(taken_by=range_.taken_by, disabled=range_.disabled)
+            for time_slot in self._union(time_slots):
+                from_, to = max(range_.from_, time_slot.from_), min(range_.to, time_slot.to)
+                if from_ >= to:
+                    continue
+                within_slot = NormalizedSlot(from_, to)
+                for time_block in AtomicTimeBlock.from_normalized_time_slot(within_slot, self._duration_unit):
+                    id_ = self._time_block_id(resource_id, time_block)
+                    self._time_blocks[id_] = (resource_id, time_block.from_)
+                    grouped.append(id_, time_block.from_, time_block.to, blockade, 1)
+        return grouped
+
+    @staticmethod
+    def _union(time_slots: Sequence[NormalizedSlot]) -> list[NormalizedSlot]:
+        union: list[NormalizedSlot] = []
+        for time_slot in sorted(time_slots, key=attrgetter("from_")):
+            if union and time_slot.from_ <= union[-1].to:
+                union[-1] = NormalizedSlot(union[-1].from_, max(union[-1].to, time_slot.to))
+            else:
+                union.append(time_slot)
+        return union
+
+    @staticmethod
+    def _to_range(row: Row[Any]) -> AvailabilityRange:
+        period: Range[datetime] = row.period
+        return AvailabilityRange(period.lower, period.upper, Owner(row.taken_by), row.disabled)  # type: ignore[arg-type]
+
+    @staticmethod
+    def _time_block_id(resource_id: ResourceId, time_block: AtomicTimeBlock) -> ResourceAvailabilityId:
+        """Derive the same id for a time block every time its ranges are split."""
+        return ResourceAvailabilityId(uuid.uuid5(resource_id.id, time_block.from_.astimezone(UTC).isoformat()))
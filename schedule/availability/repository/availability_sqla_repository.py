@@ -1,25 +1,46 @@
 import uuid
-from collections.abc import Sequence
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
 from functools import singledispatchmethod
-from typing import cast, overload, override
+from itertools import batched
+from typing import Any, cast, overload, override
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, Table, UniqueConstraint, select
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ColumnElement,
+    DateTime,
+    Index,
+    Integer,
+    Table,
+    and_,
+    insert,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import composite
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.sql.functions import func
 
 from schedule.availability.blockade import Blockade
-from schedule.availability.grouped_resource_availability import GroupedResourceAvailability
+from schedule.availability.grouped_resource_availability import GroupedResourceAvailability, TimeBlockState
 from schedule.availability.owner import Owner
 from schedule.availability.resource_availability import ResourceAvailability
 from schedule.availability.resource_availability_id import ResourceAvailabilityId
 from schedule.availability.resource_id import ResourceId
+from schedule.availability.resource_selection_policy import ResourceSelectionPolicy
 from schedule.availability.time_blocks.atomic_time_block import AtomicTimeBlock
 from schedule.availability.time_blocks.normalized_slot import NormalizedSlot
 from schedule.shared.sqla_repository import EmbeddedUUID
 from schedule.shared.sqla_repository.mappers import mapper_registry
 from schedule.shared.sqla_repository.sqla_repository import SQLAlchemyRepository
 
+from .resource_selection import LOAD_HORIZON, selection_order
+
 availabilities = Table(
     "availabilities",
     mapper_registry.metadata,
@@ -30,9 +51,29 @@ availabilities = Table(
     Column("taken_by", UUID(as_uuid=True), nullable=False),
     Column("disabled", Boolean, nullable=False),
     Column("version", Integer, nullable=False),
-    UniqueConstraint("resource_id", "from_date", "to_date"),
+    # unique time blocks per resource, covering calendar and owner queries so they are answered from the index alone
+    Index(
+        "ix_availabilities_calendar",
+        "resource_id",
+        "from_date",
+        "to_date",
+        unique=True,
+        postgresql_include=["taken_by"],
+    ),
 )
 
+# free blocks, the only ones searched when looking for available resources
+free_availabilities_index = Index(
+    "ix_availabilities_free",
+    availabilities.c.resource_id,
+    availabilities.c.from_date,
+    availabilities.c.to_date,
+    postgresql_where=availabilities.c.taken_by == Owner.none().id,
+)
+
+
+BULK_INSERT_BATCH_SIZE = 5_000
+
 
 def create_blockade(taken_by: uuid.UUID, disabled: bool) -> Blockade:  # noqa: FBT001
     return Blockade(taken_by=Owner(taken_by), disabled=disabled)
@@ -74,27 +115,234 @@ class ResourceAvailabilityRepository(SQLAlchemyRepository[ResourceAvailability,
 
     @_add.register
     def _add_grouped(self, model: GroupedResourceAvailability) -> None:
-        self.add_all(model.resource_availabilities)
+        self.add_all_grouped([model])
 
-    def load_all_within_slot(
-        self, resource_id: ResourceId, time_slot: NormalizedSlot
-    ) -> Sequence[ResourceAvailability]:
-        stmt = select(ResourceAvailability).where(
+    def add_all_grouped(self, models: Sequence[GroupedResourceAvailability]) -> None:
+        """Insert new time blocks of the groups and update the changed ones with a statement per blockade taken.
+
+        Updates are guarded by the versions the time blocks were loaded with, raising StaleDataError
+        when any of them changed since.
+        """
+        new: list[tuple[ResourceId, TimeBlockState]] = []
+        changed: defaultdict[Blockade, list[TimeBlockState]] = defaultdict(list)
+        for model in models:
+            if (resource_id := model.resource_id) is None:
+                continue
+            for state in model.changed_time_blocks():
+                if state.version == 0:
+                    new.append((resource_id, state))
+                else:
+                    changed[state.blockade].append(state)
+        self._insert_time_blocks(new)
+        for blockade, states in changed.items():
+            self._update_time_blocks(blockade, states)
+        self._expire_by_ids({state.id for states in changed.values() for state in states})
+        for model in models:
+            model.saved()
+
+    def _insert_time_blocks(self, states: Iterable[tuple[ResourceId, TimeBlockState]]) -> None:
+        rows = (
+            {
+                "id": state.id,
+                "resource_id": resource_id,
+                "from_date": state.time_block.from_,
+                "to_date": state.time_block.to,
+                "taken_by": state.blockade.taken_by.id,
+                "disabled": state.blockade.disabled,
+                "version": 1,
+            }
+            for resource_id, state in states
+        )
+        for batch in batched(rows, BULK_INSERT_BATCH_SIZE, strict=False):
+            _ = self._session.execute(insert(availabilities), list(batch))
+
+    def _update_time_blocks(self, blockade: Blockade, states: Sequence[TimeBlockState]) -> None:
+        for batch in batched(states, BULK_INSERT_BATCH_SIZE, strict=False):
+            stmt = (
+                update(availabilities)
+                .where(
+                    tuple_(availabilities.c.id, availabilities.c.version).in_(
+                        [(state.id, state.version) for state in batch]
+                    )
+                )
+                .values(taken_by=blockade.taken_by.id, disabled=blockade.disabled, version=availabilities.c.version + 1)
+            )
+            if self._session.execute(stmt).rowcount != len(batch):  # type: ignore[attr-defined]
+                msg = "Time blocks changed since they were loaded"
+                raise StaleDataError(msg)
+
+    def add_time_blocks(self, resource_id: ResourceId, time_blocks: Iterable[AtomicTimeBlock]) -> None:
+        """Insert new, available time blocks in batches, bypassing the unit of work."""
+        rows = (
+            {
+                "id": ResourceAvailabilityId.new_one(),
+                "resource_id": resource_id,
+                "from_date": time_block.from_,
+                "to_date": time_block.to,
+                "taken_by": Owner.none().id,
+                "disabled": False,
+                "version": 1,
+            }
+            for time_block in time_blocks
+        )
+        for batch in batched(rows, BULK_INSERT_BATCH_SIZE, strict=False):
+            _ = self._session.execute(insert(availabilities), list(batch))
+
+    def owners_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot) -> frozenset[Owner]:
+        stmt = select(availabilities.c.taken_by).where(*self._within_slot(resource_id, time_slot)).with_for_update()
+        return frozenset(Owner(taken_by) for taken_by in self._session.execute(stmt).scalars())
+
+    def block_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        """Take every time block within the slot for the requester, or none of them."""
+        return self._update_all_within_slot(
+            resource_id, time_slot, self._available_for(requester), taken_by=requester.id, disabled=False
+        )
+
+    def release_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        """Free every time block within the slot on behalf of the requester, or none of them."""
+        return self._update_all_within_slot(
+            resource_id, time_slot, self._available_for(requester), taken_by=Owner.none().id, disabled=False
+        )
+
+    def disable_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        return self._update_all_within_slot(resource_id, time_slot, true(), taken_by=requester.id, disabled=True)
+
+    def _update_all_within_slot(
+        self,
+        resource_id: ResourceId,
+        time_slot: NormalizedSlot,
+        condition: ColumnElement[bool],
+        **values: object,
+    ) -> bool:
+        """Update time blocks within the slot with a single statement, provided all of them meet the condition.
+
+        The statement returns the number of time blocks within the slot for every updated row, so the update
+        is rolled back if a concurrent change made some of the blocks stop meeting the condition.
+        """
+        within_slot = self._within_slot(resource_id, time_slot)
+        counts = (
+            select(
+                func.count().label("total"),
+                func.count().filter(condition).label("matching"),
+            )
+            .where(*within_slot)
+            .cte("counts")
+        )
+        stmt = (
+            update(availabilities)
+            .where(
+                *within_slot,
+                condition,
+                select(and_(counts.c.total > 0, counts.c.total == counts.c.matching)).scalar_subquery(),
+            )
+            .values(version=availabilities.c.version + 1, **values)
+            .returning(select(counts.c.total).scalar_subquery())
+        )
+        savepoint = self._session.begin_nested()
+        totals = self._session.execute(stmt).scalars().all()
+        if not totals or len(totals) != totals[0]:
+            savepoint.rollback()
+            return False
+        savepoint.commit()
+        self._expire_within_slot(resource_id, time_slot)
+        return True
+
+    def _expire_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot) -> None:
+        for model in list(self._session.identity_map.values()):
+            if (
+                isinstance(model, ResourceAvailability)
+                and model.resource_id == resource_id
+                and model.time_block.within(time_slot)
+            ):
+                self._session.expire(model)
+
+    def _expire_by_ids(self, ids: set[ResourceAvailabilityId]) -> None:
+        """Expire time blocks loaded as objects into the session, which statements bypassing it changed."""
+        if not ids:
+            return
+        for model in list(self._session.identity_map.values()):
+            if isinstance(model, ResourceAvailability) and model.id in ids:
+                self._session.expire(model)
+
+    @staticmethod
+    def _within_slot(resource_id: ResourceId, time_slot: NormalizedSlot) -> tuple[ColumnElement[bool], ...]:
+        return (
             availabilities.c.resource_id == resource_id,
             availabilities.c.from_date >= time_slot.from_,
             availabilities.c.to_date <= time_slot.to,
         )
+
+    @staticmethod
+    def _available_for(requester: Owner) -> ColumnElement[bool]:
+        return and_(
+            availabilities.c.taken_by.in_([requester.id, Owner.none().id]),
+            availabilities.c.disabled.is_(False),
+        )
+
+    def load_all_within_slot(
+        self, resource_id: ResourceId, time_slot: NormalizedSlot
+    ) -> Sequence[ResourceAvailability]:
+        stmt = select(ResourceAvailability).where(*self._within_slot(resource_id, time_slot))
         return self._session.execute(stmt).scalars().all()
 
+    def load_all_within_slots(
+        self, slots: Iterable[tuple[ResourceId, NormalizedSlot]]
+    ) -> Sequence[ResourceAvailability]:
+        """Load time blocks within any of the resource slots with a single query."""
+        conditions = [and_(*self._within_slot(resource_id, time_slot)) for resource_id, time_slot in slots]
+        if not conditions:
+            return []
+        stmt = select(ResourceAvailability).where(or_(*conditions))
+        return self._session.execute(stmt).scalars().all()
+
+    def load_grouped_within_slot(
+        self, resource_id: ResourceId, time_slot: NormalizedSlot
+    ) -> GroupedResourceAvailability:
+        """Load time blocks within the slot as a group, without building objects for them."""
+        return self.load_grouped_within_slots([(resource_id, time_slot)])[resource_id]
+
+    def load_grouped_within_slots(
+        self, slots: Sequence[tuple[ResourceId, NormalizedSlot]]
+    ) -> dict[ResourceId, GroupedResourceAvailability]:
+        """Load time blocks within any of the resource slots with a single query, grouped by resource."""
+        grouped = {resource_id: GroupedResourceAvailability(resource_id) for resource_id, _ in slots}
+        if not slots:
+            return grouped
+        stmt = (
+            select(
+                availabilities.c.resource_id,
+                availabilities.c.id,
+                availabilities.c.from_date,
+                availabilities.c.to_date,
+                availabilities.c.taken_by,
+                availabilities.c.disabled,
+                availabilities.c.version,
+            )
+            .where(or_(*(and_(*self._within_slot(resource_id, time_slot)) for resource_id, time_slot in slots)))
+            .order_by(availabilities.c.resource_id, availabilities.c.from_date)
+        )
+        for row in self._session.execute(stmt):
+            grouped[row.resource_id].append(
+                row.id, row.from_date, row.to_date, create_blockade(row.taken_by, row.disabled), row.version
+            )
+        return grouped
+
     def load_by_id(self, resource_availability_id: ResourceAvailabilityId) -> ResourceAvailability:
         stmt = select(ResourceAvailability).where(availabilities.c.id == resource_availability_id)
         return cast("ResourceAvailability", self._session.execute(stmt).one()[0])
 
-    def load_availabilities_of_random_resources_within(
-        self, time_slot: NormalizedSlot, *resource_ids: ResourceId
-    ) -> Sequence[ResourceAvailability]:
-        # CTE to find resource_ids that have matching availabilities
-        available_resources = (
+    def find_available_resources_within(
+        self,
+        time_slot: NormalizedSlot,
+        resource_ids: Sequence[ResourceId],
+        policy: ResourceSelectionPolicy,
+        limit: int,
+    ) -> list[ResourceId]:
+        """Return up to limit resources free for the entire slot, in the order the policy prefers them."""
+        if not resource_ids:
+            return []
+        free_time = func.sum(availabilities.c.to_date - availabilities.c.from_date)
+        stmt = (
             select(availabilities.c.resource_id)
             .where(
                 availabilities.c.resource_id.in_(resource_ids),
@@ -103,33 +351,44 @@ class ResourceAvailabilityRepository(SQLAlchemyRepository[ResourceAvailability,
                 availabilities.c.to_date <= time_slot.to,
             )
             .group_by(availabilities.c.resource_id)
-            .cte()
+            .having(free_time == time_slot.duration)
+            .order_by(
+                selection_order(
+                    policy,
+                    availabilities.c.resource_id,
+                    resource_ids,
+                    lambda: self._taken_time_around(time_slot),
+                )
+            )
+            .limit(limit)
         )
+        return list(self._session.execute(stmt).scalars())
 
-        # CTE to select one random resource from those available
-        random_resource = (
-            select(available_resources.c.resource_id).order_by(func.random()).limit(1).cte("random_resource")
-        )
+    def load_availabilities_of_random_resources_within(
+        self, time_slot: NormalizedSlot, *resource_ids: ResourceId
+    ) -> Sequence[ResourceAvailability]:
+        chosen = self.find_available_resources_within(time_slot, resource_ids, ResourceSelectionPolicy.RANDOM, limit=1)
+        if not chosen:
+            return []
+        return self.load_all_within_slot(chosen[0], time_slot)
 
-        # Main query joining with the random resource
-        stmt = (
-            select(ResourceAvailability)
-            .select_from(
-                availabilities.join(random_resource, availabilities.c.resource_id == random_resource.c.resource_id)
-            )
+    @staticmethod
+    def _taken_time_around(time_slot: NormalizedSlot) -> ColumnElement[Any]:
+        taken = availabilities.alias("taken")
+        return (
+            select(func.sum(taken.c.to_date - taken.c.from_date))
             .where(
-                availabilities.c.taken_by == Owner.none().id,
-                availabilities.c.from_date >= time_slot.from_,
-                availabilities.c.to_date <= time_slot.to,
+                taken.c.resource_id == availabilities.c.resource_id,
+                taken.c.taken_by != Owner.none().id,
+                taken.c.from_date >= time_slot.from_ - LOAD_HORIZON,
+                taken.c.to_date <= time_slot.to + LOAD_HORIZON,
             )
+            .scalar_subquery()
         )
 
-        return self._session.execute(stmt).scalars().all()
-
     def expire(self, model: ResourceAvailability | GroupedResourceAvailability) -> None:
         match model:
             case ResourceAvailability():
                 self._session.expire(model)
             case GroupedResourceAvailability():
-                for obj in model.resource_availabilities:
-                    self._session.expire(obj)
+                self._expire_by_ids({state.id for state in model.time_blocks()})
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import TYPE_CHECKING, ClassVar
+
+from sqlalchemy import event
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..calendar import Calendar
+from ..resource_id import ResourceId
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session, SessionTransaction
+
+
+class CalendarCache:
+    """Keeps the most recently used calendars, each loaded for a resource within a normalized window.
+
+    A calendar within a window is also served from any cached calendar loaded within a larger window.
+    The generation changes on every invalidation, so a calendar loaded before it can be told apart.
+    It is safe to share between threads, each call holding a lock.
+    """
+
+    DEFAULT_MAX_SIZE: ClassVar[int] = 1024
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self._max_size: int = max_size
+        self._calendars: OrderedDict[tuple[ResourceId, TimeSlot], Calendar] = OrderedDict()
+        self._windows: defaultdict[ResourceId, set[TimeSlot]] = defaultdict(set)
+        self._generation: int = 0
+        self._token: uuid.UUID = uuid.uuid4()
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def token(self) -> uuid.UUID:
+        """Tell this cache apart from any other, unlike id() which may be reused once it is garbage collected."""
+        return self._token
+
+    def get(self, resource_id: ResourceId, within: TimeSlot) -> Calendar | None:
+        with self._lock:
+            for window in self._windows.get(resource_id, ()):
+                if within.within(window):
+                    self._calendars.move_to_end((resource_id, window))
+                    calendar = self._calendars[resource_id, window]
+                    return calendar if window == within else self._slice(calendar, within)
+            return None
+
+    def put(self, resource_id: ResourceId, within: TimeSlot, calendar: Calendar) -> None:
+        with self._lock:
+            self._put(resource_id, within, calendar)
+
+    def put_unless_invalidated_since(
+        self, resource_id: ResourceId, within: TimeSlot, calendar: Calendar, generation: int
+    ) -> None:
+        """Cache the calendar loaded at the given generation, unless anything was invalidated since."""
+        with self._lock:
+            if generation == self._generation:
+                self._put(resource_id, within, calendar)
+
+    def invalidate(self, resource_id: ResourceId, time_slot: TimeSlot) -> None:
+        """Forget calendars of the resource loaded within windows overlapping the changed time slot."""
+        with self._lock:
+            self._generation += 1
+            for window in [window for window in self._windows.get(resource_id, ()) if _share_time(window, time_slot)]:
+                del self._calendars[resource_id, window]
+                self._discard_window(resource_id, window)
+
+    def _put(self, resource_id: ResourceId, within: TimeSlot, calendar: Calendar) -> None:
+        self._calendars[resource_id, within] = calendar
+        self._calendars.move_to_end((resource_id, within))
+        self._windows[resource_id].add(within)
+        while len(self._calendars) > self._max_size:
+            (evicted_resource_id, evicted_window), _ = self._calendars.popitem(last=False)
+            self._discard_window(evicted_resource_id, evicted_window)
+
+    def _discard_window(self, resource_id: ResourceId, window: TimeSlot) -> None:
+        self._windows[resource_id].discard(window)
+        if not self._windows[resource_id]:
+            del self._windows[resource_id]
+
+    @staticmethod
+    def _slice(calendar: Calendar, within: TimeSlot) -> Calendar:
+        sliced = {
+            owner: [
+                slot.common_part_with(within) for slot in slots if slot.from_ < within.to and slot.to > within.from_
+            ]
+            for owner, slots in calendar.calendar.items()
+        }
+        return Calendar(calendar.resource_id, {owner: slots for owner, slots in sliced.items() if slots})
+
+
+class SessionCalendarCache:
+    """Calendars as seen by one Session, on top of a CalendarCache shared by all of them.
+
+    Calendars of resources changed in the session are cached for the session only, as they are not committed yet.
+    Once the session commits, the changes are invalidated in the shared cache again, dropping calendars other
+    sessions loaded meanwhile; once its transaction ends in any other way, they are forgotten. Calendars loaded
+    before an invalidation are not put into the shared cache, as they may miss changes committed since.
+
+    A session keeps one such cache per shared one for the current transaction only, so it is to be looked up with
+    of whenever used rather than kept. The session listeners doing so are registered once per session.
+    """
+
+    _INFO_KEY: ClassVar[str] = "session_calendar_caches"
+
+    def __init__(self, shared: CalendarCache) -> None:
+        self._shared: CalendarCache = shared
+        self._own: CalendarCache = CalendarCache()
+        self._changed: defaultdict[ResourceId, list[TimeSlot]] = defaultdict(list)
+
+    @classmethod
+    def of(cls, session: Session, shared: CalendarCache) -> SessionCalendarCache:
+        caches: dict[uuid.UUID, SessionCalendarCache] | None = session.info.get(cls._INFO_KEY)
+        if caches is None:
+            caches = session.info[cls._INFO_KEY] = {}
+            event.listen(session, "after_commit", cls._after_commit)
+            event.listen(session, "after_transaction_end", cls._after_transaction_end)
+        cache = caches.get(shared.token)
+        if cache is None:
+            cache = caches[shared.token] = cls(shared)
+        return cache
+
+    @property
+    def generation(self) -> int:
+        return self._shared.generation
+
+    def get(self, resource_id: ResourceId, within: TimeSlot) -> Calendar | None:
+        return self._cache_of(resource_id).get(resource_id, within)
+
+    def put(self, resource_id: ResourceId, within: TimeSlot, calendar: Calendar, generation: int) -> None:
+        """Cache the calendar loaded when the shared cache was at the given generation."""
+        if resource_id in self._changed:
+            self._own.put(resource_id, within, calendar)
+        else:
+            self._shared.put_unless_invalidated_since(resource_id, within, calendar, generation)
+
+    def invalidate(self, resource_id: ResourceId, time_slot: TimeSlot) -> None:
+        self._changed[resource_id].append(time_slot)
+        self._own.invalidate(resource_id, time_slot)
+        self._shared.invalidate(resource_id, time_slot)
+
+    def _cache_of(self, resource_id: ResourceId) -> CalendarCache:
+        return self._own if resource_id in self._changed else self._shared
+
+    def _invalidate_changes_in_shared(self) -> None:
+        for resource_id, time_slots in self._changed.items():
+            for time_slot in time_slots:
+                self._shared.invalidate(resource_id, time_slot)
+
+    @staticmethod
+    def _after_commit(session: Session) -> None:
+        caches: dict[uuid.UUID, SessionCalendarCache] = session.info[SessionCalendarCache._INFO_KEY]
+        for cache in caches.values():
+            cache._invalidate_changes_in_shared()  # noqa: SLF001
+
+    @staticmethod
+    def _after_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+        # the outermost transaction ends on commit, rollback and close alike
+        if transaction.parent is None:
+            session.info[SessionCalendarCache._INFO_KEY].clear()
+
+
+def _share_time(time_slot: TimeSlot, other: TimeSlot) -> bool:
+    # unlike TimeSlot.overlaps, slots merely touching each other share no time
+    return time_slot.from_ < other.to and time_slot.to > other.from_
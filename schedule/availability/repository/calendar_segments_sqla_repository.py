@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from itertools import batched
+from typing import override
+
+from sqlalchemy import DDL, Column, Table, delete, event, insert, or_, select
+from sqlalchemy.dialects.postgresql import TSTZRANGE, UUID, ExcludeConstraint, Range
+
+from schedule.availability.grouped_resource_availability import GroupedResourceAvailability
+from schedule.availability.owner import Owner
+from schedule.availability.resource_availability import ResourceAvailability
+from schedule.availability.resource_id import ResourceId
+from schedule.availability.time_blocks.atomic_time_block import AtomicTimeBlock
+from schedule.availability.time_blocks.normalized_slot import NormalizedSlot
+from schedule.shared.sqla_repository import EmbeddedUUID
+from schedule.shared.sqla_repository.mappers import mapper_registry
+from schedule.shared.timeslot import TimeSlot
+
+from .availability_sqla_repository import BULK_INSERT_BATCH_SIZE, ResourceAvailabilityRepository, availabilities
+
+calendar_segments = Table(
+    "calendar_segments",
+    mapper_registry.metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("resource_id", EmbeddedUUID[ResourceId], nullable=False),
+    Column("taken_by", UUID(as_uuid=True), nullable=False),
+    Column("period", TSTZRANGE, nullable=False),
+    ExcludeConstraint(("resource_id", "="), ("period", "&&"), name="calendar_segments_no_overlap", using="gist"),
+)
+
+event.listen(calendar_segments, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"))  # type: ignore[no-untyped-call]
+
+
+class SegmentedResourceAvailabilityRepository(ResourceAvailabilityRepository):
+    """Keeps calendar_segments, runs of contiguous time blocks taken by the same owner, in sync with every write.
+
+    The segments let ResourceAvailabilitySegmentsReadModel load calendars without merging time blocks.
+    """
+
+    @override
+    def add(self, model: ResourceAvailability | GroupedResourceAvailability) -> None:
+        match model:
+            case ResourceAvailability():
+                super().add(model)
+                self.refresh_segments(model.resource_id, model.time_block)
+            case GroupedResourceAvailability():
+                self.add_all_grouped([model])
+
+    @override
+    def add_all(self, models: Sequence[ResourceAvailability]) -> None:
+        super().add_all(models)
+        changed: defaultdict[ResourceId, list[AtomicTimeBlock]] = defaultdict(list)
+        for model in models:
+            changed[model.resource_id].append(model.time_block)
+        for resource_id, time_blocks in changed.items():
+            self.refresh_segments(resource_id, self._spanning(time_blocks))
+
+    @override
+    def add_all_grouped(self, models: Sequence[GroupedResourceAvailability]) -> None:
+        changed: defaultdict[ResourceId, list[AtomicTimeBlock]] = defaultdict(list)
+        for model in models:
+            if (resource_id := model.resource_id) is not None:
+                changed[resource_id].extend(state.time_block for state in model.changed_time_blocks())
+        super().add_all_grouped(models)
+        for resource_id, time_blocks in changed.items():
+            if time_blocks:
+                self.refresh_segments(resource_id, self._spanning(time_blocks))
+
+    @override
+    def add_time_blocks(self, resource_id: ResourceId, time_blocks: Iterable[AtomicTimeBlock]) -> None:
+        added: list[AtomicTimeBlock] = []
+
+        def tracked() -> Iterator[AtomicTimeBlock]:
+            for time_block in time_blocks:
+                if not added:
+                    added.append(time_block)
+                yield time_block
+            if added:
+                added.append(time_block)
+
+        super().add_time_blocks(resource_id, tracked())
+        if added:
+            self.refresh_segments(resource_id, self._spanning(added))
+
+    @override
+    def block_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        if result := super().block_within_slot(resource_id, time_slot, requester):
+            self.refresh_segments(resource_id, time_slot)
+        return result
+
+    @override
+    def release_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        if result := super().release_within_slot(resource_id, time_slot, requester):
+            self.refresh_segments(resource_id, time_slot)
+        return result
+
+    @override
+    def disable_within_slot(self, resource_id: ResourceId, time_slot: NormalizedSlot, requester: Owner) -> bool:
+        if result := super().disable_within_slot(resource_id, time_slot, requester):
+            self.refresh_segments(resource_id, time_slot)
+        return result
+
+    def refresh_segments(self, resource_id: ResourceId, time_slot: TimeSlot) -> None:
+        """Rebuild the segments of the resource overlapping or adjacent to the time slot from its time blocks."""
+        self._session.flush()
+        window = Range(time_slot.from_, time_slot.to)
+        stmt = (
+            select(calendar_segments.c.id, calendar_segments.c.period)
+            .where(
+                calendar_segments.c.resource_id == resource_id,
+                or_(calendar_segments.c.period.overlaps(window), calendar_segments.c.period.adjacent_to(window)),
+            )
+            .with_for_update()
+        )
+        stale = self._session.execute(stmt).all()
+        from_ = min([time_slot.from_, *(segment.period.lower for segment in stale)])
+        to = max([time_slot.to, *(segment.period.upper for segment in stale)])
+        _ = self._session.execute(
+            delete(calendar_segments).where(calendar_segments.c.id.in_([row.id for row in stale]))
+        )
+
+        time_blocks = self._session.execute(
+            select(availabilities.c.taken_by, availabilities.c.from_date, availabilities.c.to_date)
+            .where(
+                availabilities.c.resource_id == resource_id,
+                availabilities.c.from_date >= from_,
+                availabilities.c.to_date <= to,
+            )
+            .order_by(availabilities.c.from_date)
+        ).all()
+        rows = (
+            {"id": uuid.uuid4(), "resource_id": resource_id, "taken_by": taken_by, "period": Range(start, end)}
+            for taken_by, start, end in self._merge(time_blocks)
+        )
+        for batch in batched(rows, BULK_INSERT_BATCH_SIZE, strict=False):
+            _ = self._session.execute(insert(calendar_segments), list(batch))
+
+    @staticmethod
+    def _merge(
+        time_blocks: Iterable[tuple[uuid.UUID, datetime, datetime]],
+    ) -> list[tuple[uuid.UUID, datetime, datetime]]:
+        segments: list[tuple[uuid.UUID, datetime, datetime]] = []
+        last_of_owner: dict[uuid.UUID, int] = {}
+        for taken_by, start, end in time_blocks:
+            last = last_of_owner.get(taken_by)
+            if last is not None and segments[last][2] == start:
+                segments[last] = (taken_by, segments[last][1], end)
+            else:
+                last_of_owner[taken_by] = len(segments)
+                segments.append((taken_by, start, end))
+        return segments
+
+    @staticmethod
+    def _spanning(time_slots: Sequence[TimeSlot]) -> TimeSlot:
+        return TimeSlot(min(slot.from_ for slot in time_slots), max(slot.to for slot in time_slots))
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import cast, override
+
+from sqlalchemy import UUID, Boolean, Column, Select, Table, func, select
+from sqlalchemy.dialects.postgresql import TSTZRANGE, Range
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ...shared.sqla_repository.mappers import read_registry
+from ..resource_id import ResourceId
+from .resource_availability_read_model import ReadModelRow, ResourceAvailabilityReadModel
+
+availability_ranges = Table(
+    "availability_ranges",
+    read_registry.metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("resource_id", UUID(as_uuid=True), nullable=False),
+    Column("period", TSTZRANGE, nullable=False),
+    Column("taken_by", UUID(as_uuid=True), nullable=False),
+    Column("disabled", Boolean, nullable=False),
+)
+
+
+class ResourceAvailabilityRangesReadModel(ResourceAvailabilityReadModel):
+    """Reads calendars from ranges kept by ResourceAvailabilityRangesRepository."""
+
+    @override
+    def _stmt(self, resource_ids: Iterable[ResourceId], within: TimeSlot) -> Select[ReadModelRow]:
+        within_range = Range(within.from_, within.to)
+        merged = (
+            select(
+                availability_ranges.c.resource_id,
+                availability_ranges.c.taken_by,
+                func.unnest(func.range_agg(availability_ranges.c.period.intersection(within_range))).label("period"),
+            )
+            .where(
+                availability_ranges.c.resource_id.in_([resource_id.id for resource_id in resource_ids]),
+                availability_ranges.c.period.overlaps(within_range),
+            )
+            .group_by(availability_ranges.c.resource_id, availability_ranges.c.taken_by)
+            .subquery("merged")
+        )
+
+        stmt = select(
+            merged.c.resource_id,
+            merged.c.taken_by,
+            func.lower(merged.c.period).label("start_date"),
+            func.upper(merged.c.period).label("end_date"),
+        ).order_by("start_date")
+
+        return cast("Select[ReadModelRow]", stmt)
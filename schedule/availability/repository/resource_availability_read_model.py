@@ -2,19 +2,21 @@ from __future__ import annotations
 
 import uuid
 from collections import defaultdict
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime
-from typing import NamedTuple, cast
+from itertools import groupby
+from operator import attrgetter
+from typing import ClassVar, NamedTuple, cast
 
 from sqlalchemy import (
     UUID,
     Boolean,
     Column,
     DateTime,
+    Index,
     Integer,
     Select,
     Table,
-    UniqueConstraint,
     case,
     func,
     select,
@@ -28,6 +30,7 @@ from ..calendar import Calendar
 from ..calendars import Calendars
 from ..owner import Owner
 from ..resource_id import ResourceId
+from .calendar_cache import CalendarCache, SessionCalendarCache
 
 availabilities = Table(
     "availabilities",
@@ -40,19 +43,69 @@ availabilities = Table(
     Column("to_date", DateTime(timezone=True), nullable=False),
     Column("taken_by", UUID(as_uuid=True), nullable=False),
     Column("disabled", Boolean, nullable=False),
-    UniqueConstraint("resource_id", "from_date", "to_date"),
+    Index(
+        "ix_availabilities_calendar",
+        "resource_id",
+        "from_date",
+        "to_date",
+        unique=True,
+        postgresql_include=["taken_by"],
+    ),
 )
 
 
 class ResourceAvailabilityReadModel:
-    def __init__(self, session: Session) -> None:
+    STREAM_BATCH_SIZE: ClassVar[int] = 1_000
+
+    def __init__(self, session: Session, calendar_cache: CalendarCache) -> None:
         self._session: Session = session
+        self._shared_calendar_cache: CalendarCache = calendar_cache
 
     def load(self, resource_id: ResourceId, within: TimeSlot) -> Calendar:
         calendars = self.load_all({resource_id}, within)
         return calendars.get(resource_id)
 
     def load_all(self, resource_ids: Iterable[ResourceId], within: TimeSlot) -> Calendars:
+        calendar_cache = self._calendar_cache
+        cached: dict[ResourceId, Calendar] = {}
+        missing: list[ResourceId] = []
+        for resource_id in resource_ids:
+            calendar = calendar_cache.get(resource_id, within)
+            if calendar is None:
+                missing.append(resource_id)
+            else:
+                cached[resource_id] = calendar
+
+        generation = calendar_cache.generation
+        loaded = self._load_all(missing, within) if missing else Calendars({})
+        for resource_id in missing:
+            calendar_cache.put(resource_id, within, loaded.get(resource_id), generation)
+
+        found = {resource_id: calendar for resource_id, calendar in cached.items() if calendar.calendar}
+        return Calendars(found | loaded.calendars)
+
+    def stream_all(self, resource_ids: Iterable[ResourceId], within: TimeSlot) -> Iterator[Calendar]:
+        """Yield the calendar of each resource with any slots, ordered by resource id, as soon as its rows are read.
+
+        Rows are fetched in batches through a server-side cursor, bypassing the calendar cache.
+        """
+        stmt = self._stmt(resource_ids, within).order_by(None).order_by("resource_id", "start_date")
+        result = self._session.execute(stmt, execution_options={"yield_per": self.STREAM_BATCH_SIZE})
+        rows = cast("Iterator[ReadModelRow]", iter(result))
+        for resource_id, resource_rows in groupby(rows, key=attrgetter("resource_id")):
+            calendar: defaultdict[Owner, list[TimeSlot]] = defaultdict(list)
+            for row in resource_rows:
+                calendar[Owner(row.taken_by)].append(TimeSlot(row.start_date, row.end_date))
+            yield Calendar(ResourceId(resource_id), calendar)
+
+    def invalidate(self, resource_id: ResourceId, time_slot: TimeSlot) -> None:
+        self._calendar_cache.invalidate(resource_id, time_slot)
+
+    @property
+    def _calendar_cache(self) -> SessionCalendarCache:
+        return SessionCalendarCache.of(self._session, self._shared_calendar_cache)
+
+    def _load_all(self, resource_ids: Iterable[ResourceId], within: TimeSlot) -> Calendars:
         calendars: dict[ResourceId, dict[Owner, list[TimeSlot]]] = defaultdict(lambda: defaultdict(list))
 
         stmt = self._stmt(resource_ids, within)
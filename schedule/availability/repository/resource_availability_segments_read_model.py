@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import cast, override
+
+from sqlalchemy import UUID, Column, Select, Table, func, select
+from sqlalchemy.dialects.postgresql import TSTZRANGE, Range
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ...shared.sqla_repository.mappers import read_registry
+from ..resource_id import ResourceId
+from .resource_availability_read_model import ReadModelRow, ResourceAvailabilityReadModel
+
+calendar_segments = Table(
+    "calendar_segments",
+    read_registry.metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("resource_id", UUID(as_uuid=True), nullable=False),
+    Column("taken_by", UUID(as_uuid=True), nullable=False),
+    Column("period", TSTZRANGE, nullable=False),
+)
+
+
+class ResourceAvailabilitySegmentsReadModel(ResourceAvailabilityReadModel):
+    """Reads calendars from segments kept by SegmentedResourceAvailabilityRepository."""
+
+    @override
+    def _stmt(self, resource_ids: Iterable[ResourceId], within: TimeSlot) -> Select[ReadModelRow]:
+        within_range = Range(within.from_, within.to)
+        clipped = calendar_segments.c.period.intersection(within_range)
+        stmt = (
+            select(
+                calendar_segments.c.resource_id,
+                calendar_segments.c.taken_by,
+                func.lower(clipped).label("start_date"),
+                func.upper(clipped).label("end_date"),
+            )
+            .where(
+                calendar_segments.c.resource_id.in_([resource_id.id for resource_id in resource_ids]),
+                calendar_segments.c.period.overlaps(within_range),
+            )
+            .order_by("start_date")
+        )
+
+        return cast("Select[ReadModelRow]", stmt)
@@ -0,0 +1,30 @@
+from collections.abc import Callable, Sequence
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import ColumnElement, case, func
+
+from ..resource_id import ResourceId
+from ..resource_selection_policy import ResourceSelectionPolicy
+
+LOAD_HORIZON = timedelta(days=7)
+
+
+def selection_order(
+    policy: ResourceSelectionPolicy,
+    resource_id: ColumnElement[Any],
+    resource_ids: Sequence[ResourceId],
+    taken_time: Callable[[], ColumnElement[Any]],
+) -> ColumnElement[Any]:
+    """Order candidate resources the way the policy prefers them.
+
+    taken_time builds the time a candidate is taken for within LOAD_HORIZON around the requested slot,
+    it is only needed to find the least loaded resources.
+    """
+    match policy:
+        case ResourceSelectionPolicy.RANDOM:
+            return func.random()
+        case ResourceSelectionPolicy.LEAST_LOADED:
+            return func.coalesce(taken_time(), timedelta(0))
+        case ResourceSelectionPolicy.FIRST_FIT:
+            return case(*((resource_id == candidate, position) for position, candidate in enumerate(resource_ids)))
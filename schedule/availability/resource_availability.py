@@ -25,6 +25,10 @@ class ResourceAvailability:
     def resource_id(self) -> ResourceId:
         return self._resource_id
 
+    @property
+    def time_block(self) -> AtomicTimeBlock:
+        return self._time_block
+
     @property
     def blocked_by(self) -> Owner:
         return self._blockade.taken_by
@@ -51,6 +55,9 @@ class ResourceAvailability:
             return True
         return False
 
+    def is_available_for(self, requester: Owner) -> bool:
+        return self._blockade.is_available_for(requester)
+
     def is_disabled_by(self, requester: Owner) -> bool:
         return self._blockade.is_disabled_by(requester)
 
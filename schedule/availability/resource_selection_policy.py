@@ -0,0 +1,7 @@
+from enum import StrEnum, auto
+
+
+class ResourceSelectionPolicy(StrEnum):
+    RANDOM = auto()
+    LEAST_LOADED = auto()
+    FIRST_FIT = auto()
@@ -40,3 +40,20 @@ class TestAvailabilityCalendar:
         calendar_2 = calendars.get(resource_id2)
         assert calendar_2.taken_by(owner) == (fifteen_minutes,)
         assert calendar_2.available_slots() == one_day.leftover_after_removing_common_with(fifteen_minutes)
+
+    def test_streams_calendars_one_resource_at_a_time(self, availability_facade: AvailabilityFacade) -> None:
+        resource_ids = sorted((ResourceId.new_one() for _ in range(3)), key=lambda resource_id: resource_id.id)
+        without_slots = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        fifteen_minutes = TimeSlot(one_day.from_ + timedelta(minutes=15), one_day.from_ + timedelta(minutes=30))
+        owner = Owner.new_one()
+        for resource_id in resource_ids:
+            availability_facade.create_resource_slots(resource_id, one_day)
+        availability_facade.block(resource_ids[1], fifteen_minutes, owner)
+
+        calendars = list(availability_facade.stream_calendars([*resource_ids, without_slots], one_day))
+
+        assert [calendar.resource_id for calendar in calendars] == resource_ids
+        loaded = availability_facade.load_calendars(resource_ids, one_day)
+        assert calendars == [loaded.get(resource_id) for resource_id in resource_ids]
+        assert calendars[1].taken_by(owner) == (fifteen_minutes,)
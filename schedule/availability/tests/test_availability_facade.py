@@ -1,17 +1,25 @@
+from collections.abc import Callable
 from datetime import timedelta
 from typing import Any
 
 import pytest
+from lagom import Container
 from mockito import verify  # pyright: ignore [reportUnknownVariableType, reportMissingTypeStubs]
 from mockito.matchers import arg_that  # pyright: ignore [reportUnknownVariableType, reportMissingTypeStubs]
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from schedule.availability.resource_taken_over_event import ResourceTakenOverEvent
 from schedule.shared.timeslot.time_slot import TimeSlot
 
-from ...shared.event import EventBus
+from ...shared.event import EventBus, EventPublisher
 from ..availability_facade import AvailabilityFacade
+from ..availability_request import AvailabilityRequest
 from ..calendar import Calendar
 from ..owner import Owner
+from ..repository.availability_sqla_repository import ResourceAvailabilityRepository
+from ..repository.calendar_cache import CalendarCache
+from ..repository.resource_availability_read_model import ResourceAvailabilityReadModel
 from ..resource_id import ResourceId
 
 
@@ -176,3 +184,183 @@ class TestAvailabilityFacade:
             and event.slot == time_slot
             and event.previous_owners == frozenset({initial_owner})
         )
+
+
+class TestAvailabilityFacadeBatchedChanges:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    MORNING = TimeSlot(ONE_DAY.from_, ONE_DAY.from_ + timedelta(hours=12))
+    AFTERNOON = TimeSlot(MORNING.to, ONE_DAY.to)
+
+    def _create_resources(self, availability_facade: AvailabilityFacade, count: int) -> list[ResourceId]:
+        resource_ids = [ResourceId.new_one() for _ in range(count)]
+        for resource_id in resource_ids:
+            availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        return resource_ids
+
+    def test_blocks_many_resources(self, availability_facade: AvailabilityFacade) -> None:
+        first, second = self._create_resources(availability_facade, 2)
+        owner = Owner.new_one()
+
+        results = availability_facade.block_many(
+            [
+                AvailabilityRequest(first, self.MORNING, owner),
+                AvailabilityRequest(second, self.ONE_DAY, owner),
+                AvailabilityRequest(first, self.AFTERNOON, owner),
+            ]
+        )
+
+        assert results == [True, True, True]
+        assert availability_facade.find(first, self.ONE_DAY).blocked_entirely_by(owner)
+        assert availability_facade.find(second, self.ONE_DAY).blocked_entirely_by(owner)
+
+    def test_reports_which_requests_failed(self, availability_facade: AvailabilityFacade) -> None:
+        first, second = self._create_resources(availability_facade, 2)
+        owner, another_owner = Owner.new_one(), Owner.new_one()
+        _ = availability_facade.block(first, self.MORNING, another_owner)
+
+        results = availability_facade.block_many(
+            [
+                AvailabilityRequest(first, self.ONE_DAY, owner),
+                AvailabilityRequest(second, self.ONE_DAY, owner),
+            ]
+        )
+
+        assert results == [False, True]
+        assert availability_facade.find(first, self.MORNING).blocked_entirely_by(another_owner)
+        assert availability_facade.find(first, self.AFTERNOON).blocked_entirely_by(Owner.none())
+        assert availability_facade.find(second, self.ONE_DAY).blocked_entirely_by(owner)
+
+    def test_applies_overlapping_requests_in_order(self, availability_facade: AvailabilityFacade) -> None:
+        (resource_id,) = self._create_resources(availability_facade, 1)
+        owner, another_owner = Owner.new_one(), Owner.new_one()
+
+        results = availability_facade.block_many(
+            [
+                AvailabilityRequest(resource_id, self.ONE_DAY, owner),
+                AvailabilityRequest(resource_id, self.MORNING, another_owner),
+            ]
+        )
+
+        assert results == [True, False]
+        assert availability_facade.find(resource_id, self.ONE_DAY).blocked_entirely_by(owner)
+
+    def test_blocks_nothing_when_any_request_fails_in_all_or_nothing_mode(
+        self, availability_facade: AvailabilityFacade
+    ) -> None:
+        first, second = self._create_resources(availability_facade, 2)
+        owner, another_owner = Owner.new_one(), Owner.new_one()
+        _ = availability_facade.block(second, self.MORNING, another_owner)
+
+        results = availability_facade.block_many(
+            [AvailabilityRequest(first, self.ONE_DAY, owner), AvailabilityRequest(second, self.ONE_DAY, owner)],
+            all_or_nothing=True,
+        )
+
+        assert results == [False, False]
+        assert availability_facade.find(first, self.ONE_DAY).blocked_entirely_by(Owner.none())
+        assert availability_facade.find(second, self.AFTERNOON).blocked_entirely_by(Owner.none())
+
+    def test_releases_many_resources(self, availability_facade: AvailabilityFacade) -> None:
+        first, second = self._create_resources(availability_facade, 2)
+        owner, another_owner = Owner.new_one(), Owner.new_one()
+        _ = availability_facade.block(first, self.ONE_DAY, owner)
+        _ = availability_facade.block(second, self.ONE_DAY, another_owner)
+
+        results = availability_facade.release_many(
+            [
+                AvailabilityRequest(first, self.ONE_DAY, owner),
+                AvailabilityRequest(second, self.ONE_DAY, owner),
+            ]
+        )
+
+        assert results == [True, False]
+        assert availability_facade.find(first, self.ONE_DAY).blocked_entirely_by(Owner.none())
+        assert availability_facade.find(second, self.ONE_DAY).blocked_entirely_by(another_owner)
+
+
+class TestAvailabilityFacadeCalendarCache:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    ENTIRE_MONTH = TimeSlot.create_monthly_time_slot_at_utc(2021, 1)
+
+    def test_serves_calendar_within_already_loaded_window_without_querying(
+        self, availability_facade: AvailabilityFacade, session: Session
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        _ = availability_facade.load_calendar(resource_id, self.ENTIRE_MONTH)
+        statements: list[str] = []
+
+        def record(*args: Any) -> None:
+            statements.append(args[2])
+
+        event.listen(session.get_bind(), "before_cursor_execute", record)
+        try:
+            daily_calendar = availability_facade.load_calendar(resource_id, self.ONE_DAY)
+        finally:
+            event.remove(session.get_bind(), "before_cursor_execute", record)
+
+        assert daily_calendar == Calendar.with_available_slots(resource_id, self.ONE_DAY)
+        assert statements == []
+
+    def test_calendar_reflects_changes_made_after_loading_it(self, availability_facade: AvailabilityFacade) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        _ = availability_facade.load_calendar(resource_id, self.ENTIRE_MONTH)
+
+        _ = availability_facade.block(resource_id, self.ONE_DAY, owner)
+
+        assert availability_facade.load_calendar(resource_id, self.ONE_DAY).taken_by(owner) == (self.ONE_DAY,)
+        _ = availability_facade.release(resource_id, self.ONE_DAY, owner)
+        assert availability_facade.load_calendar(resource_id, self.ENTIRE_MONTH) == Calendar.with_available_slots(
+            resource_id, self.ONE_DAY
+        )
+
+    def test_forgets_calendars_changed_in_rolled_back_transaction(
+        self, availability_facade: AvailabilityFacade, session: Session
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        session.commit()
+        _ = availability_facade.load_calendar(resource_id, self.ONE_DAY)
+        _ = availability_facade.block(resource_id, self.ONE_DAY, owner)
+        assert availability_facade.load_calendar(resource_id, self.ONE_DAY).taken_by(owner) == (self.ONE_DAY,)
+
+        session.rollback()
+
+        assert availability_facade.load_calendar(resource_id, self.ONE_DAY) == Calendar.with_available_slots(
+            resource_id, self.ONE_DAY
+        )
+
+    def test_sessions_sharing_cache_see_only_committed_changes(
+        self, session_factory: Callable[[], Session], container: Container
+    ) -> None:
+        event_publisher = container.resolve(EventPublisher)  # type: ignore[type-abstract]
+        calendar_cache = CalendarCache()
+        writing_session, reading_session = session_factory(), session_factory()
+        writer = self._facade(writing_session, calendar_cache, event_publisher)
+        reader = self._facade(reading_session, calendar_cache, event_publisher)
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        writer.create_resource_slots(resource_id, self.ONE_DAY)
+        writing_session.commit()
+
+        _ = writer.block(resource_id, self.ONE_DAY, owner)
+        assert reader.load_calendar(resource_id, self.ONE_DAY) == Calendar.with_available_slots(
+            resource_id, self.ONE_DAY
+        )
+        reading_session.commit()
+        writing_session.commit()
+
+        assert reader.load_calendar(resource_id, self.ONE_DAY).taken_by(owner) == (self.ONE_DAY,)
+        writing_session.close()
+        reading_session.close()
+
+    @staticmethod
+    def _facade(session: Session, calendar_cache: CalendarCache, event_publisher: EventPublisher) -> AvailabilityFacade:
+        return AvailabilityFacade(
+            ResourceAvailabilityRepository(session),
+            ResourceAvailabilityReadModel(session, calendar_cache),
+            event_publisher,
+        )
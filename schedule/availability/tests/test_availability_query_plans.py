@@ -0,0 +1,96 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from schedule.shared.timeslot import TimeSlot
+
+from ..owner import Owner
+from ..repository.availability_sqla_repository import ResourceAvailabilityRepository
+from ..repository.calendar_cache import CalendarCache
+from ..repository.resource_availability_read_model import ResourceAvailabilityReadModel
+from ..resource_id import ResourceId
+from ..time_blocks.atomic_time_block import AtomicTimeBlock
+from ..time_blocks.duration_unit import DurationUnit
+from ..time_blocks.normalized_slot import NormalizedSlot
+
+
+class TestAvailabilityQueryPlans:
+    """Fail when a hot query on availabilities stops using the indexes built for it.
+
+    Sequential and bitmap scans are disabled, as on tables this small the planner would rightly prefer them.
+    """
+
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    NORMALIZED_DAY = NormalizedSlot.from_time_slot(ONE_DAY, DurationUnit.default())
+
+    @pytest.fixture(autouse=True)
+    def _no_sequential_scans(self, session: Session) -> None:
+        _ = session.execute(text("SET LOCAL enable_seqscan = off"))
+        _ = session.execute(text("SET LOCAL enable_bitmapscan = off"))
+
+    @staticmethod
+    def _plans_of(session: Session, query: Callable[[], object]) -> list[str]:
+        executed: list[tuple[str, Any]] = []
+
+        def record(*args: Any) -> None:
+            executed.append((args[2], args[3]))
+
+        event.listen(session.get_bind(), "before_cursor_execute", record)
+        try:
+            _ = query()
+        finally:
+            event.remove(session.get_bind(), "before_cursor_execute", record)
+
+        connection = session.connection()
+        return [
+            "\n".join(row[0] for row in connection.exec_driver_sql(f"EXPLAIN {statement}", parameters))
+            for statement, parameters in executed
+            if statement.lstrip().startswith(("SELECT", "WITH"))
+        ]
+
+    def _create_day(self, repository: ResourceAvailabilityRepository) -> ResourceId:
+        resource_id = ResourceId.new_one()
+        repository.add_time_blocks(resource_id, AtomicTimeBlock.split(self.ONE_DAY, DurationUnit.default()))
+        return resource_id
+
+    def test_loads_time_blocks_within_slot_by_index(
+        self, repository: ResourceAvailabilityRepository, session: Session
+    ) -> None:
+        resource_id = self._create_day(repository)
+
+        plans = self._plans_of(session, lambda: repository.load_all_within_slot(resource_id, self.NORMALIZED_DAY))
+
+        assert len(plans) == 1
+        assert "Index Scan using ix_availabilities_calendar" in plans[0]
+        assert "Seq Scan" not in plans[0]
+
+    def test_finds_available_resources_by_partial_index_on_free_blocks(
+        self, repository: ResourceAvailabilityRepository, session: Session
+    ) -> None:
+        free, taken = self._create_day(repository), self._create_day(repository)
+        _ = repository.block_within_slot(taken, self.NORMALIZED_DAY, Owner.new_one())
+
+        plans = self._plans_of(
+            session,
+            lambda: repository.load_availabilities_of_random_resources_within(self.NORMALIZED_DAY, free, taken),
+        )
+
+        assert len(plans) == 2
+        finding, loading = plans
+        assert "Index Only Scan using ix_availabilities_free" in finding
+        assert "Index Scan using ix_availabilities_calendar" in loading
+        assert "Seq Scan" not in loading
+
+    def test_loads_calendars_by_covering_index(
+        self, repository: ResourceAvailabilityRepository, session: Session
+    ) -> None:
+        resource_id = self._create_day(repository)
+        read_model = ResourceAvailabilityReadModel(session, CalendarCache())
+
+        plans = self._plans_of(session, lambda: read_model.load_all([resource_id], self.ONE_DAY))
+
+        assert len(plans) == 1
+        assert "Index Only Scan using ix_availabilities_calendar" in plans[0]
@@ -0,0 +1,304 @@
+import threading
+from collections.abc import Callable
+from uuid import UUID, uuid4
+
+import pytest
+from lagom import Container
+from mockito import mock, when  # pyright: ignore [reportUnknownVariableType, reportMissingTypeStubs]
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..availability_facade import AvailabilityFacade
+from ..availability_request import AvailabilityRequest
+from ..calendar import Calendar
+from ..owner import Owner
+from ..repository.availability_ranges_sqla_repository import (
+    LoadedRanges,
+    ResourceAvailabilityRangesRepository,
+    availability_ranges,
+)
+from ..repository.availability_sqla_repository import ResourceAvailabilityRepository
+from ..repository.resource_availability_ranges_read_model import ResourceAvailabilityRangesReadModel
+from ..repository.resource_availability_read_model import ResourceAvailabilityReadModel
+from ..resource_availability_id import ResourceAvailabilityId
+from ..resource_id import ResourceId
+from ..resource_selection_policy import ResourceSelectionPolicy
+from ..time_blocks.atomic_time_block import AtomicTimeBlock
+from ..time_blocks.duration_unit import DurationUnit
+from ..time_blocks.normalized_slot import NormalizedSlot
+
+
+@pytest.fixture
+def ranges_facade(container: Container) -> AvailabilityFacade:
+    container[ResourceAvailabilityRepository] = ResourceAvailabilityRangesRepository
+    container[ResourceAvailabilityReadModel] = ResourceAvailabilityRangesReadModel
+    return container.resolve(AvailabilityFacade)
+
+
+class TestAvailabilityRangesStorage:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    ENTIRE_MONTH = TimeSlot.create_monthly_time_slot_at_utc(2021, 1)
+    MORNING = TimeSlot(ONE_DAY.from_, ONE_DAY.from_.replace(hour=12))
+    AFTERNOON = TimeSlot(MORNING.to, ONE_DAY.to)
+    LUNCH = TimeSlot(MORNING.to.replace(hour=11), MORNING.to.replace(hour=13))
+
+    @staticmethod
+    def _stored_ranges(session: Session, resource_id: ResourceId) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(availability_ranges)
+            .where(availability_ranges.c.resource_id == resource_id)
+        )
+        return session.execute(stmt).scalar_one()
+
+    def test_stores_created_slots_as_one_range(self, ranges_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+
+        ranges_facade.create_resource_slots(resource_id, self.ONE_DAY)
+
+        assert self._stored_ranges(session, resource_id) == 1
+        assert len(ranges_facade.find(resource_id, self.ONE_DAY)) == 96
+        monthly_calendar = ranges_facade.load_calendar(resource_id, self.ENTIRE_MONTH)
+        assert monthly_calendar == Calendar.with_available_slots(resource_id, self.ONE_DAY)
+
+    def test_blocking_splits_range(self, ranges_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        ranges_facade.create_resource_slots(resource_id, self.ONE_DAY)
+
+        result = ranges_facade.block(resource_id, self.LUNCH, owner)
+
+        assert result is True
+        assert self._stored_ranges(session, resource_id) == 3
+        daily_calendar = ranges_facade.load_calendar(resource_id, self.ONE_DAY)
+        assert daily_calendar.taken_by(owner) == (self.LUNCH,)
+        assert daily_calendar.available_slots() == (
+            TimeSlot(self.ONE_DAY.from_, self.LUNCH.from_),
+            TimeSlot(self.LUNCH.to, self.ONE_DAY.to),
+        )
+
+    def test_releasing_coalesces_ranges(self, ranges_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        ranges_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        ranges_facade.block(resource_id, self.LUNCH, owner)
+
+        result = ranges_facade.release(resource_id, self.LUNCH, owner)
+
+        assert result is True
+        assert self._stored_ranges(session, resource_id) == 1
+        assert ranges_facade.find(resource_id, self.ONE_DAY).blocked_entirely_by(Owner.none())
+
+    def test_cannot_block_when_part_of_slot_is_taken(self, ranges_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        ranges_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        ranges_facade.block(resource_id, self.LUNCH, owner)
+
+        result = ranges_facade.block(resource_id, self.MORNING, Owner.new_one())
+
+        assert result is False
+        assert self._stored_ranges(session, resource_id) == 3
+        assert ranges_facade.load_calendar(resource_id, self.ONE_DAY).taken_by(owner) == (self.LUNCH,)
+
+    def test_disables_range(self, ranges_facade: AvailabilityFacade) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        ranges_facade.create_resource_slots(resource_id, self.ONE_DAY)
+
+        result = ranges_facade.disable(resource_id, self.AFTERNOON, owner)
+
+        assert result is True
+        assert ranges_facade.find(resource_id, self.AFTERNOON).is_disabled_entirely_by(owner)
+        assert ranges_facade.load_calendar(resource_id, self.ONE_DAY).available_slots() == (self.MORNING,)
+
+    def test_blocks_random_available_resource(self, ranges_facade: AvailabilityFacade) -> None:
+        taken, free = ResourceId.new_one(), ResourceId.new_one()
+        owner = Owner.new_one()
+        ranges_facade.create_resource_slots(taken, self.ONE_DAY)
+        ranges_facade.create_resource_slots(free, self.ONE_DAY)
+        ranges_facade.block(taken, self.ONE_DAY, Owner.new_one())
+
+        result = ranges_facade.block_random_available({taken, free}, self.MORNING, owner)
+
+        assert result == free
+        assert ranges_facade.load_calendar(free, self.ONE_DAY).taken_by(owner) == (self.MORNING,)
+
+    def test_blocks_many_resources(self, ranges_facade: AvailabilityFacade, session: Session) -> None:
+        first, second = ResourceId.new_one(), ResourceId.new_one()
+        owner = Owner.new_one()
+        ranges_facade.create_resource_slots(first, self.ONE_DAY)
+        ranges_facade.create_resource_slots(second, self.ONE_DAY)
+
+        results = ranges_facade.block_many(
+            [
+                AvailabilityRequest(first, self.MORNING, owner),
+                AvailabilityRequest(first, self.LUNCH, owner),
+                AvailabilityRequest(second, self.LUNCH, Owner.new_one()),
+            ]
+        )
+
+        assert results == [True, True, True]
+        assert self._stored_ranges(session, first) == 2
+        assert ranges_facade.load_calendar(first, self.ONE_DAY).taken_by(owner) == (
+            TimeSlot(self.MORNING.from_, self.LUNCH.to),
+        )
+        assert self._stored_ranges(session, second) == 3
+
+    def test_selects_only_entirely_free_resources(self, ranges_facade: AvailabilityFacade) -> None:
+        partially_taken, free = ResourceId.new_one(), ResourceId.new_one()
+        ranges_facade.create_resource_slots(partially_taken, self.MORNING)
+        ranges_facade.create_resource_slots(partially_taken, self.AFTERNOON)
+        ranges_facade.create_resource_slots(free, self.MORNING)
+        ranges_facade.create_resource_slots(free, self.AFTERNOON)
+        ranges_facade.block(partially_taken, self.LUNCH, Owner.new_one())
+
+        result = ranges_facade.block_any_available(
+            [partially_taken, free], self.ONE_DAY, Owner.new_one(), ResourceSelectionPolicy.FIRST_FIT
+        )
+
+        assert result == free
+
+    def test_rejects_overlapping_ranges(self, session: Session) -> None:
+        repository = ResourceAvailabilityRangesRepository(session)
+        resource_id = ResourceId.new_one()
+        repository.add_time_blocks(resource_id, AtomicTimeBlock.split(self.ONE_DAY, DurationUnit.default()))
+
+        with pytest.raises(IntegrityError):
+            repository.add_time_blocks(resource_id, AtomicTimeBlock.split(self.MORNING, DurationUnit.default()))
+
+    def test_loads_time_block_by_id(self, session: Session) -> None:
+        repository = ResourceAvailabilityRangesRepository(session)
+        resource_id = ResourceId.new_one()
+        repository.add_time_blocks(resource_id, AtomicTimeBlock.split(self.ONE_DAY, DurationUnit.default()))
+        time_block = repository.load_all_within_slot(
+            resource_id, NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        )[5]
+
+        loaded = ResourceAvailabilityRangesRepository(session).load_by_id(time_block.id)
+
+        assert (loaded.id, loaded.resource_id, loaded.time_block) == (
+            time_block.id,
+            resource_id,
+            time_block.time_block,
+        )
+        with pytest.raises(ResourceAvailabilityRangesRepository.NotFoundError):
+            _ = repository.load_by_id(ResourceAvailabilityId.new_one())
+
+    def test_loads_time_block_of_its_own_resource(self, session: Session) -> None:
+        repository = ResourceAvailabilityRangesRepository(session)
+        resource_id = ResourceId.new_one()
+        # ids sharing their upper half with the other resource's used to be mixed up
+        other_resource_id = ResourceId(UUID(int=resource_id.id.int ^ 1))
+        slot = NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        for resource in (resource_id, other_resource_id):
+            repository.add_time_blocks(resource, AtomicTimeBlock.split(self.ONE_DAY, DurationUnit.default()))
+        time_block = repository.load_all_within_slot(other_resource_id, slot)[5]
+
+        loaded = repository.load_by_id(time_block.id)
+
+        assert time_block.id.id.version == 5
+        assert time_block.id not in {block.id for block in repository.load_all_within_slot(resource_id, slot)}
+        assert (loaded.id, loaded.resource_id) == (time_block.id, other_resource_id)
+
+    def test_does_not_load_time_block_after_transaction_ends(self, session: Session) -> None:
+        repository = ResourceAvailabilityRangesRepository(session)
+        resource_id = ResourceId.new_one()
+        repository.add_time_blocks(resource_id, AtomicTimeBlock.split(self.ONE_DAY, DurationUnit.default()))
+        time_block = repository.load_all_within_slot(
+            resource_id, NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        )[0]
+        session.commit()
+
+        with pytest.raises(ResourceAvailabilityRangesRepository.NotFoundError):
+            _ = repository.load_by_id(time_block.id)
+
+
+class TestAvailabilityRangesConcurrency:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+
+    def test_rejects_writing_ranges_changed_since_loaded(self, session_factory: Callable[[], Session]) -> None:
+        session, concurrent_session = session_factory(), session_factory()
+        slot = NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        resource_id = self._create_day(session)
+        concurrent_repository = ResourceAvailabilityRangesRepository(concurrent_session)
+        concurrently_loaded = concurrent_repository.load_grouped_within_slot(resource_id, slot)
+
+        assert ResourceAvailabilityRangesRepository(session).block_within_slot(resource_id, slot, Owner.new_one())
+        session.commit()
+
+        assert concurrently_loaded.block(Owner.new_one())
+        with pytest.raises(StaleDataError):
+            concurrent_repository.add(concurrently_loaded)
+        concurrent_session.close()
+        session.close()
+
+    def test_blocks_slot_once_when_blocking_concurrently(self, session_factory: Callable[[], Session]) -> None:
+        setup_session = session_factory()
+        slot = NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        resource_id = self._create_day(setup_session)
+        setup_session.close()
+        first_blocked = threading.Event()
+        results: list[bool] = []
+
+        def block_and_commit_later() -> None:
+            session = session_factory()
+            results.append(
+                ResourceAvailabilityRangesRepository(session).block_within_slot(resource_id, slot, Owner.new_one())
+            )
+            first_blocked.set()
+            threading.Event().wait(0.2)
+            session.commit()
+            session.close()
+
+        first = threading.Thread(target=block_and_commit_later)
+        first.start()
+        assert first_blocked.wait(5)
+        session = session_factory()
+        results.append(
+            ResourceAvailabilityRangesRepository(session).block_within_slot(resource_id, slot, Owner.new_one())
+        )
+        session.commit()
+        session.close()
+        first.join()
+
+        assert results == [True, False]
+
+    def test_forgets_loaded_ranges_when_transaction_ends(self, session: Session) -> None:
+        slot = NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        resource_id = self._create_day(session)
+        _ = ResourceAvailabilityRangesRepository(session).load_grouped_within_slot(resource_id, slot)
+        assert LoadedRanges.of(session).ranges
+
+        session.commit()
+        assert not LoadedRanges.of(session).ranges
+
+        _ = ResourceAvailabilityRangesRepository(session).load_grouped_within_slot(resource_id, slot)
+        session.rollback()
+        assert not LoadedRanges.of(session).ranges
+
+    def test_gives_up_locking_ranges_replaced_on_every_attempt(self, session: Session) -> None:
+        slot = NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        replaced_every_time = [
+            mock({"all": lambda: [mock({"id": uuid4()})]})
+            for _ in range(ResourceAvailabilityRangesRepository.MAX_LOCK_ATTEMPTS + 1)
+        ]
+        when(session).execute(...).thenReturn(*replaced_every_time)
+
+        with pytest.raises(StaleDataError):
+            _ = ResourceAvailabilityRangesRepository(session).block_within_slot(
+                ResourceId.new_one(), slot, Owner.new_one()
+            )
+
+    @staticmethod
+    def _create_day(session: Session) -> ResourceId:
+        resource_id = ResourceId.new_one()
+        ResourceAvailabilityRangesRepository(session).add_time_blocks(
+            resource_id, AtomicTimeBlock.split(TestAvailabilityRangesConcurrency.ONE_DAY, DurationUnit.default())
+        )
+        session.commit()
+        return resource_id
@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..blockade import Blockade
+from ..blockades import Blockades
+from ..grouped_resource_availability import GroupedResourceAvailability
+from ..owner import Owner
+from ..resource_availability_id import ResourceAvailabilityId
+from ..resource_id import ResourceId
+from ..time_blocks.atomic_time_block import AtomicTimeBlock
+from ..time_blocks.duration_unit import DurationUnit
+
+
+class TestBlockades:
+    OWNER_1 = Owner.new_one()
+    OWNER_2 = Owner.new_one()
+
+    def test_blocks_all_available_blocks(self) -> None:
+        blockades = Blockades([Blockade.none(), Blockade.owned_by(self.OWNER_1), Blockade.none()])
+
+        result = blockades.block(self.OWNER_1)
+
+        assert result is True
+        assert blockades.blocked_entirely_by(self.OWNER_1)
+        assert list(blockades) == [Blockade.owned_by(self.OWNER_1)] * 3
+
+    def test_blocks_nothing_when_any_block_is_taken_by_someone_else(self) -> None:
+        blockades = Blockades([Blockade.none(), Blockade.owned_by(self.OWNER_2)])
+
+        result = blockades.block(self.OWNER_1)
+
+        assert result is False
+        assert list(blockades) == [Blockade.none(), Blockade.owned_by(self.OWNER_2)]
+
+    def test_releases_nothing_when_any_block_is_disabled(self) -> None:
+        blockades = Blockades([Blockade.owned_by(self.OWNER_1), Blockade.disable(self.OWNER_1)])
+
+        result = blockades.release(self.OWNER_1)
+
+        assert result is False
+        assert blockades.owners == frozenset({self.OWNER_1})
+
+    def test_disables_all_blocks(self) -> None:
+        blockades = Blockades([Blockade.none(), Blockade.owned_by(self.OWNER_2)])
+
+        result = blockades.disable(self.OWNER_1)
+
+        assert result is True
+        assert blockades.is_disabled_entirely_by(self.OWNER_1)
+        assert not blockades.is_available_for(self.OWNER_1)
+
+    def test_finds_positions_blocked_by_owner(self) -> None:
+        blockades = Blockades([Blockade.owned_by(self.OWNER_1), Blockade.none(), Blockade.owned_by(self.OWNER_1)])
+
+        assert blockades.positions_blocked_by(self.OWNER_1) == [0, 2]
+        assert blockades.positions_blocked_by(self.OWNER_2) == []
+        assert blockades.owners == frozenset({self.OWNER_1, Owner.none()})
+
+    def test_assigns_slice_back(self) -> None:
+        blockades = Blockades([Blockade.none(), Blockade.none(), Blockade.disable(self.OWNER_2)])
+        middle = blockades.slice(1, 3)
+
+        assert middle.disable(self.OWNER_1)
+        blockades.assign(1, middle)
+
+        assert list(blockades) == [Blockade.none(), Blockade.disable(self.OWNER_1), Blockade.disable(self.OWNER_1)]
+        assert blockades.positions_differing_from(Blockades([Blockade.none()] * 3)) == [1, 2]
+
+
+class TestGroupedResourceAvailabilityBlockades:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    MORNING = TimeSlot(ONE_DAY.from_, ONE_DAY.from_ + timedelta(hours=12))
+    OWNER = Owner.new_one()
+
+    def test_builds_availabilities_with_changed_blockades(self) -> None:
+        grouped = GroupedResourceAvailability.of(ResourceId.new_one(), self.ONE_DAY, DurationUnit.default())
+
+        result = grouped.block(self.OWNER)
+
+        assert result is True
+        assert all(availability.blocked_by == self.OWNER for availability in grouped.resource_availabilities)
+
+    def test_changes_nothing_when_empty(self) -> None:
+        grouped = GroupedResourceAvailability(ResourceId.new_one())
+
+        assert grouped.block(self.OWNER) is False
+        assert grouped.disable(self.OWNER) is False
+        assert grouped.resource_id is None
+
+    def test_merges_changes_of_time_blocks_within_slot(self) -> None:
+        grouped = self._loaded_day()
+        morning = grouped.within(self.MORNING)
+
+        assert morning.block(self.OWNER)
+        grouped.merge(morning)
+
+        assert len(morning) == 48
+        assert grouped.within(self.MORNING).blocked_entirely_by(self.OWNER)
+        assert grouped.within(TimeSlot(self.MORNING.to, self.ONE_DAY.to)).blocked_entirely_by(Owner.none())
+
+    def test_reports_only_changed_time_blocks_until_saved(self) -> None:
+        grouped = self._loaded_day()
+        morning = grouped.within(self.MORNING)
+        _ = morning.block(self.OWNER)
+        grouped.merge(morning)
+
+        changed = grouped.changed_time_blocks()
+        grouped.saved()
+
+        assert [state.time_block for state in changed] == [state.time_block for state in morning.time_blocks()]
+        assert {state.version for state in changed} == {1}
+        assert grouped.changed_time_blocks() == []
+        assert {state.version for state in grouped.within(self.MORNING).time_blocks()} == {2}
+
+    def test_reports_new_time_blocks_as_changed(self) -> None:
+        grouped = GroupedResourceAvailability.of(ResourceId.new_one(), self.ONE_DAY, DurationUnit.default())
+
+        assert len(grouped.changed_time_blocks()) == 96
+
+    def _loaded_day(self) -> GroupedResourceAvailability:
+        grouped = GroupedResourceAvailability(ResourceId.new_one())
+        for time_block in AtomicTimeBlock.split(self.ONE_DAY, DurationUnit.default()):
+            grouped.append(ResourceAvailabilityId.new_one(), time_block.from_, time_block.to, Blockade.none(), 1)
+        return grouped
@@ -0,0 +1,147 @@
+import threading
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..calendar import Calendar
+from ..owner import Owner
+from ..repository.calendar_cache import CalendarCache, SessionCalendarCache
+from ..resource_id import ResourceId
+
+
+class TestCalendarCache:
+    JAN_1 = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    JAN_2 = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 2)
+    JAN_1_2 = TimeSlot(JAN_1.from_, JAN_2.to)
+    MORNING = TimeSlot(JAN_2.from_, JAN_2.from_ + timedelta(hours=12))
+
+    def test_serves_the_same_window(self) -> None:
+        cache = CalendarCache()
+        resource_id = ResourceId.new_one()
+        calendar = Calendar.with_available_slots(resource_id, self.JAN_1)
+        cache.put(resource_id, self.JAN_1, calendar)
+
+        assert cache.get(resource_id, self.JAN_1) == calendar
+        assert cache.get(ResourceId.new_one(), self.JAN_1) is None
+        assert cache.get(resource_id, self.JAN_1_2) is None
+
+    def test_serves_sub_window_by_slicing_larger_one(self) -> None:
+        cache = CalendarCache()
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        cache.put(
+            resource_id,
+            self.JAN_1_2,
+            Calendar(resource_id, {Owner.none(): [self.JAN_1], owner: [TimeSlot(self.JAN_1.to, self.MORNING.to)]}),
+        )
+
+        assert cache.get(resource_id, self.JAN_2) == Calendar(resource_id, {owner: [self.MORNING]})
+
+    def test_evicts_least_recently_used_calendar(self) -> None:
+        cache = CalendarCache(max_size=2)
+        first, second, third = ResourceId.new_one(), ResourceId.new_one(), ResourceId.new_one()
+        for resource_id in (first, second):
+            cache.put(resource_id, self.JAN_1, Calendar.empty(resource_id))
+        _ = cache.get(first, self.JAN_1)
+
+        cache.put(third, self.JAN_1, Calendar.empty(third))
+
+        assert cache.get(first, self.JAN_1) is not None
+        assert cache.get(second, self.JAN_1) is None
+        assert cache.get(third, self.JAN_1) is not None
+
+    def test_invalidates_only_windows_overlapping_changed_slot(self) -> None:
+        cache = CalendarCache()
+        resource_id, another_resource_id = ResourceId.new_one(), ResourceId.new_one()
+        cache.put(resource_id, self.JAN_1, Calendar.empty(resource_id))
+        cache.put(resource_id, self.JAN_1_2, Calendar.empty(resource_id))
+        cache.put(resource_id, TimeSlot.create_daily_time_slot_at_utc(2021, 1, 5), Calendar.empty(resource_id))
+        cache.put(another_resource_id, self.JAN_2, Calendar.empty(another_resource_id))
+
+        cache.invalidate(resource_id, self.MORNING)
+
+        assert cache.get(resource_id, self.JAN_1) is not None
+        assert cache.get(resource_id, self.JAN_1_2) is None
+        assert cache.get(resource_id, TimeSlot.create_daily_time_slot_at_utc(2021, 1, 5)) is not None
+        assert cache.get(another_resource_id, self.JAN_2) is not None
+
+    def test_does_not_share_calendar_loaded_before_invalidation(self) -> None:
+        shared = CalendarCache()
+        cache = SessionCalendarCache.of(Session(), shared)
+        resource_id = ResourceId.new_one()
+        generation = cache.generation
+
+        shared.invalidate(resource_id, self.JAN_1)
+        cache.put(resource_id, self.JAN_1, Calendar.with_available_slots(resource_id, self.JAN_1), generation)
+
+        assert shared.get(resource_id, self.JAN_1) is None
+
+    def test_keeps_calendars_of_changed_resources_to_the_session(self) -> None:
+        shared = CalendarCache()
+        cache = SessionCalendarCache.of(Session(), shared)
+        resource_id = ResourceId.new_one()
+        calendar = Calendar.with_available_slots(resource_id, self.JAN_1)
+
+        cache.invalidate(resource_id, self.JAN_1)
+        cache.put(resource_id, self.JAN_1, calendar, cache.generation)
+
+        assert cache.get(resource_id, self.JAN_1) == calendar
+        assert shared.get(resource_id, self.JAN_1) is None
+        assert SessionCalendarCache.of(Session(), shared).get(resource_id, self.JAN_1) is None
+
+    def test_invalidates_changes_in_shared_cache_once_session_commits(self) -> None:
+        shared, session = CalendarCache(), Session()
+        resource_id = ResourceId.new_one()
+        SessionCalendarCache.of(session, shared).invalidate(resource_id, self.JAN_1)
+        shared.put(resource_id, self.JAN_1, Calendar.empty(resource_id))
+
+        session.commit()
+
+        assert shared.get(resource_id, self.JAN_1) is None
+
+    def test_forgets_session_caches_when_transaction_ends(self) -> None:
+        shared, session = CalendarCache(), Session()
+        resource_id = ResourceId.new_one()
+        cache = SessionCalendarCache.of(session, shared)
+        cache.invalidate(resource_id, self.JAN_1)
+        _ = session.begin()
+
+        session.close()
+
+        assert SessionCalendarCache.of(session, shared) is not cache
+        assert session.info[SessionCalendarCache._INFO_KEY].keys() == {shared.token}  # noqa: SLF001
+
+    def test_registers_session_listeners_once_for_all_shared_caches(self) -> None:
+        session = Session()
+
+        caches = {SessionCalendarCache.of(session, CalendarCache()) for _ in range(10)}
+
+        assert len(caches) == 10
+        assert len(session.dispatch.after_commit) == 1
+        assert len(session.dispatch.after_transaction_end) == 1
+
+    def test_can_be_shared_between_threads(self) -> None:
+        cache = CalendarCache(max_size=8)
+        resource_ids = [ResourceId.new_one() for _ in range(16)]
+        errors: list[Exception] = []
+
+        def use_cache() -> None:
+            try:
+                for _ in range(200):
+                    for resource_id in resource_ids:
+                        cache.put(resource_id, self.JAN_1, Calendar.empty(resource_id))
+                        _ = cache.get(resource_id, self.JAN_1)
+                        cache.invalidate(resource_id, self.MORNING)
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        threads = [threading.Thread(target=use_cache) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(cache._calendars) <= 8  # noqa: SLF001
@@ -0,0 +1,119 @@
+import pytest
+from lagom import Container
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..availability_facade import AvailabilityFacade
+from ..availability_request import AvailabilityRequest
+from ..owner import Owner
+from ..repository.availability_sqla_repository import ResourceAvailabilityRepository
+from ..repository.calendar_cache import CalendarCache
+from ..repository.calendar_segments_sqla_repository import (
+    SegmentedResourceAvailabilityRepository,
+    calendar_segments,
+)
+from ..repository.resource_availability_read_model import ResourceAvailabilityReadModel
+from ..repository.resource_availability_segments_read_model import ResourceAvailabilitySegmentsReadModel
+from ..resource_id import ResourceId
+
+
+@pytest.fixture
+def segments_facade(container: Container) -> AvailabilityFacade:
+    container[ResourceAvailabilityRepository] = SegmentedResourceAvailabilityRepository
+    container[ResourceAvailabilityReadModel] = ResourceAvailabilitySegmentsReadModel
+    return container.resolve(AvailabilityFacade)
+
+
+class TestCalendarSegments:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    ENTIRE_MONTH = TimeSlot.create_monthly_time_slot_at_utc(2021, 1)
+    MORNING = TimeSlot(ONE_DAY.from_, ONE_DAY.from_.replace(hour=12))
+    AFTERNOON = TimeSlot(MORNING.to, ONE_DAY.to)
+    LUNCH = TimeSlot(MORNING.to.replace(hour=11), MORNING.to.replace(hour=13))
+
+    @staticmethod
+    def _stored_segments(session: Session, resource_id: ResourceId) -> int:
+        stmt = select(func.count()).select_from(calendar_segments).where(calendar_segments.c.resource_id == resource_id)
+        return session.execute(stmt).scalar_one()
+
+    def test_stores_created_slots_as_one_segment(self, segments_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+
+        segments_facade.create_resource_slots(resource_id, self.MORNING)
+        segments_facade.create_resource_slots(resource_id, self.AFTERNOON)
+
+        assert self._stored_segments(session, resource_id) == 1
+        assert segments_facade.load_calendar(resource_id, self.ENTIRE_MONTH).available_slots() == (self.ONE_DAY,)
+
+    def test_blocking_splits_segment(self, segments_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        segments_facade.create_resource_slots(resource_id, self.ONE_DAY)
+
+        result = segments_facade.block(resource_id, self.LUNCH, owner)
+
+        assert result is True
+        assert self._stored_segments(session, resource_id) == 3
+        daily_calendar = segments_facade.load_calendar(resource_id, self.ONE_DAY)
+        assert daily_calendar.taken_by(owner) == (self.LUNCH,)
+        assert daily_calendar.available_slots() == (
+            TimeSlot(self.ONE_DAY.from_, self.LUNCH.from_),
+            TimeSlot(self.LUNCH.to, self.ONE_DAY.to),
+        )
+
+    def test_releasing_merges_segments(self, segments_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        segments_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        segments_facade.block(resource_id, self.LUNCH, owner)
+
+        result = segments_facade.release(resource_id, self.LUNCH, owner)
+
+        assert result is True
+        assert self._stored_segments(session, resource_id) == 1
+
+    def test_failed_block_keeps_segments(self, segments_facade: AvailabilityFacade, session: Session) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        segments_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        segments_facade.block(resource_id, self.LUNCH, owner)
+
+        result = segments_facade.block(resource_id, self.MORNING, Owner.new_one())
+
+        assert result is False
+        assert self._stored_segments(session, resource_id) == 3
+        assert segments_facade.load_calendar(resource_id, self.ONE_DAY).taken_by(owner) == (self.LUNCH,)
+
+    def test_keeps_segments_of_many_changes(self, segments_facade: AvailabilityFacade, session: Session) -> None:
+        first, second = ResourceId.new_one(), ResourceId.new_one()
+        owner, disabling_owner = Owner.new_one(), Owner.new_one()
+        segments_facade.create_resource_slots(first, self.ONE_DAY)
+        segments_facade.create_resource_slots(second, self.ONE_DAY)
+
+        results = segments_facade.block_many(
+            [AvailabilityRequest(first, self.MORNING, owner), AvailabilityRequest(first, self.LUNCH, owner)]
+        )
+        segments_facade.disable(second, self.AFTERNOON, disabling_owner)
+
+        assert results == [True, True]
+        assert self._stored_segments(session, first) == 2
+        assert segments_facade.load_calendar(first, self.ONE_DAY).taken_by(owner) == (
+            TimeSlot(self.MORNING.from_, self.LUNCH.to),
+        )
+        second_calendar = segments_facade.load_calendar(second, self.ONE_DAY)
+        assert second_calendar.taken_by(disabling_owner) == (self.AFTERNOON,)
+        assert second_calendar.available_slots() == (self.MORNING,)
+
+    def test_loads_same_calendars_as_time_blocks(self, segments_facade: AvailabilityFacade, session: Session) -> None:
+        first, second = ResourceId.new_one(), ResourceId.new_one()
+        segments_facade.create_resource_slots(first, self.ONE_DAY)
+        segments_facade.create_resource_slots(second, self.ONE_DAY)
+        segments_facade.block(first, self.LUNCH, Owner.new_one())
+        segments_facade.block(second, self.MORNING, Owner.new_one())
+
+        calendars = segments_facade.load_calendars({first, second}, self.ONE_DAY)
+
+        time_blocks_read_model = ResourceAvailabilityReadModel(session, CalendarCache())
+        assert calendars == time_blocks_read_model.load_all({first, second}, self.ONE_DAY)
@@ -3,22 +3,27 @@ import threading
 import time
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import StaleDataError
 
 from schedule.shared.timeslot import TimeSlot
 
+from ..grouped_resource_availability import GroupedResourceAvailability
 from ..owner import Owner
 from ..repository.availability_sqla_repository import (
     ResourceAvailabilityRepository,
 )
 from ..resource_availability import ResourceAvailability
 from ..resource_availability_id import ResourceAvailabilityId
+from ..resource_id import ResourceId
 from ..time_blocks.atomic_time_block import AtomicTimeBlock
 from ..time_blocks.duration_unit import DurationUnit
+from ..time_blocks.normalized_slot import NormalizedSlot
 
 
 class TestResourceAvailabilityLoading:
@@ -40,6 +45,174 @@ class TestResourceAvailabilityLoading:
         assert loaded.blocked_by == resource_availability.blocked_by
 
 
+class TestResourceAvailabilityBulkCreation:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+
+    def test_adds_available_time_blocks(self, repository: ResourceAvailabilityRepository) -> None:
+        resource_id = ResourceId.new_one()
+        time_blocks = AtomicTimeBlock.split(time_slot=self.ONE_DAY, duration_unit=DurationUnit.default())
+
+        repository.add_time_blocks(resource_id, time_blocks)
+
+        loaded = repository.load_all_within_slot(
+            resource_id, NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        )
+        assert sorted((availability._time_block for availability in loaded), key=lambda x: x.from_) == time_blocks
+        assert all(availability.blocked_by == Owner.none() for availability in loaded)
+        assert all(not availability.is_disabled() for availability in loaded)
+        assert all(availability._version == 1 for availability in loaded)
+
+    def test_added_time_blocks_can_be_updated_with_optimistic_locking(
+        self, repository: ResourceAvailabilityRepository
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        repository.add_time_blocks(
+            resource_id, AtomicTimeBlock.split(time_slot=self.ONE_DAY, duration_unit=DurationUnit.default())
+        )
+        loaded = repository.load_all_within_slot(
+            resource_id, NormalizedSlot.from_time_slot(self.ONE_DAY, DurationUnit.default())
+        )[0]
+
+        loaded.block(Owner.new_one())
+        repository.add(loaded)
+
+        assert repository.load_by_id(loaded.id)._version == 2
+
+
+class TestResourceAvailabilitySetBasedUpdates:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    NORMALIZED_DAY = NormalizedSlot.from_time_slot(ONE_DAY, DurationUnit.default())
+    FIRST_HOUR = NormalizedSlot(ONE_DAY.from_, ONE_DAY.from_.replace(hour=1))
+
+    def _create_day(self, repository: ResourceAvailabilityRepository) -> ResourceId:
+        resource_id = ResourceId.new_one()
+        repository.add_time_blocks(
+            resource_id, AtomicTimeBlock.split(time_slot=self.ONE_DAY, duration_unit=DurationUnit.default())
+        )
+        return resource_id
+
+    def test_blocks_all_time_blocks_with_a_single_update(
+        self, repository: ResourceAvailabilityRepository, session: Session
+    ) -> None:
+        resource_id = self._create_day(repository)
+        owner = Owner.new_one()
+        statements: list[str] = []
+
+        def record(*args: Any) -> None:
+            statements.append(args[2])
+
+        event.listen(session.get_bind(), "before_cursor_execute", record)
+        try:
+            result = repository.block_within_slot(resource_id, self.NORMALIZED_DAY, owner)
+        finally:
+            event.remove(session.get_bind(), "before_cursor_execute", record)
+
+        assert result is True
+        assert len([statement for statement in statements if "UPDATE" in statement]) == 1
+        loaded = repository.load_all_within_slot(resource_id, self.NORMALIZED_DAY)
+        assert all(availability.blocked_by == owner for availability in loaded)
+        assert all(availability._version == 2 for availability in loaded)
+
+    def test_blocks_nothing_when_part_of_slot_is_taken(self, repository: ResourceAvailabilityRepository) -> None:
+        resource_id = self._create_day(repository)
+        owner = Owner.new_one()
+        repository.block_within_slot(resource_id, self.FIRST_HOUR, owner)
+
+        result = repository.block_within_slot(resource_id, self.NORMALIZED_DAY, Owner.new_one())
+
+        assert result is False
+        owners = repository.owners_within_slot(resource_id, self.NORMALIZED_DAY)
+        assert owners == frozenset({owner, Owner.none()})
+
+    def test_blocks_nothing_when_no_time_blocks_exist(self, repository: ResourceAvailabilityRepository) -> None:
+        result = repository.block_within_slot(ResourceId.new_one(), self.NORMALIZED_DAY, Owner.new_one())
+
+        assert result is False
+
+    def test_releases_only_own_time_blocks(self, repository: ResourceAvailabilityRepository) -> None:
+        resource_id = self._create_day(repository)
+        owner = Owner.new_one()
+        repository.block_within_slot(resource_id, self.FIRST_HOUR, owner)
+
+        assert repository.release_within_slot(resource_id, self.FIRST_HOUR, Owner.new_one()) is False
+        assert repository.release_within_slot(resource_id, self.FIRST_HOUR, owner) is True
+        assert repository.owners_within_slot(resource_id, self.NORMALIZED_DAY) == frozenset({Owner.none()})
+
+    def test_refreshes_loaded_time_blocks(self, repository: ResourceAvailabilityRepository) -> None:
+        resource_id = self._create_day(repository)
+        owner = Owner.new_one()
+        loaded = repository.load_all_within_slot(resource_id, self.FIRST_HOUR)
+
+        repository.disable_within_slot(resource_id, self.FIRST_HOUR, owner)
+
+        assert all(availability.is_disabled_by(owner) for availability in loaded)
+
+    def test_set_based_update_makes_concurrently_loaded_time_blocks_stale(
+        self, session_factory: Callable[[], Session]
+    ) -> None:
+        session = session_factory()
+        repository = ResourceAvailabilityRepository(session)
+        resource_id = self._create_day(repository)
+        session.commit()
+        concurrent_session = session_factory()
+        concurrently_loaded = ResourceAvailabilityRepository(concurrent_session).load_all_within_slot(
+            resource_id, self.FIRST_HOUR
+        )[0]
+
+        repository.block_within_slot(resource_id, self.FIRST_HOUR, Owner.new_one())
+        session.commit()
+
+        concurrently_loaded.block(Owner.new_one())
+        with pytest.raises(StaleDataError):
+            ResourceAvailabilityRepository(concurrent_session).add(concurrently_loaded)
+        concurrent_session.close()
+        session.close()
+
+
+class TestGroupedResourceAvailabilityPersistence:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    NORMALIZED_DAY = NormalizedSlot.from_time_slot(ONE_DAY, DurationUnit.default())
+    FIRST_HOUR = NormalizedSlot(ONE_DAY.from_, ONE_DAY.from_.replace(hour=1))
+
+    def test_loads_and_saves_group_without_time_block_objects(
+        self, repository: ResourceAvailabilityRepository, session: Session
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        repository.add(GroupedResourceAvailability.of(resource_id, self.ONE_DAY, DurationUnit.default()))
+        owner = Owner.new_one()
+
+        grouped = repository.load_grouped_within_slot(resource_id, self.NORMALIZED_DAY)
+        morning = grouped.within(self.FIRST_HOUR)
+        assert morning.block(owner)
+        grouped.merge(morning)
+        repository.add(grouped)
+
+        assert not any(isinstance(model, ResourceAvailability) for model in session.identity_map.values())
+        assert repository.load_grouped_within_slot(resource_id, self.FIRST_HOUR).blocked_entirely_by(owner)
+        assert {
+            state.version for state in repository.load_grouped_within_slot(resource_id, self.FIRST_HOUR).time_blocks()
+        } == {2}
+        assert len(repository.load_grouped_within_slot(resource_id, self.NORMALIZED_DAY).find_blocked_by(owner)) == 4
+
+    def test_rejects_saving_group_changed_since_loaded(self, session_factory: Callable[[], Session]) -> None:
+        session, concurrent_session = session_factory(), session_factory()
+        repository = ResourceAvailabilityRepository(session)
+        resource_id = ResourceId.new_one()
+        repository.add(GroupedResourceAvailability.of(resource_id, self.ONE_DAY, DurationUnit.default()))
+        session.commit()
+        concurrent_repository = ResourceAvailabilityRepository(concurrent_session)
+        concurrently_loaded = concurrent_repository.load_grouped_within_slot(resource_id, self.FIRST_HOUR)
+
+        assert repository.block_within_slot(resource_id, self.FIRST_HOUR, Owner.new_one())
+        session.commit()
+
+        assert concurrently_loaded.disable(Owner.new_one())
+        with pytest.raises(StaleDataError):
+            concurrent_repository.add(concurrently_loaded)
+        concurrent_session.close()
+        session.close()
+
+
 class TestResourceAvailabilityOptimisticLocking:
     ONE_MONTH = TimeSlot.create_monthly_time_slot_at_utc(2021, 1)
 
@@ -1,10 +1,15 @@
+from datetime import timedelta
+from typing import Any
+
 import pytest
 
 from schedule.shared.timeslot import TimeSlot
 
 from ..availability_facade import AvailabilityFacade
 from ..owner import Owner
+from ..repository.availability_sqla_repository import ResourceAvailabilityRepository
 from ..resource_id import ResourceId
+from ..resource_selection_policy import ResourceSelectionPolicy
 
 
 class TestTakingRandomResource:
@@ -48,6 +53,101 @@ class TestTakingRandomResource:
 
         assert taken_1 is None
 
+    def test_skips_resources_taken_for_part_of_slot(self) -> None:
+        partially_taken = ResourceId.new_one()
+        free = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        self._availability.create_resource_slots(partially_taken, one_day)
+        self._availability.create_resource_slots(free, one_day)
+        _ = self._availability.block(
+            partially_taken, TimeSlot(one_day.from_, one_day.from_ + timedelta(hours=1)), Owner.new_one()
+        )
+
+        for _ in range(5):
+            owner = Owner.new_one()
+            taken = self._availability.block_random_available({partially_taken, free}, one_day, owner)
+            if taken is None:
+                break
+            assert taken == free
+            assert self._availability.release(free, one_day, owner)
+
+    def test_skips_resources_without_slots_for_part_of_slot(self) -> None:
+        resource_id = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        self._availability.create_resource_slots(resource_id, one_day)
+
+        taken = self._availability.block_random_available(
+            {resource_id}, TimeSlot(one_day.from_, one_day.to + timedelta(hours=1)), Owner.new_one()
+        )
+
+        assert taken is None
+
+    def test_first_fit_takes_first_available_resource(self) -> None:
+        resource_ids = [ResourceId.new_one() for _ in range(3)]
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        for resource_id in resource_ids:
+            self._availability.create_resource_slots(resource_id, one_day)
+        _ = self._availability.block(resource_ids[0], one_day, Owner.new_one())
+
+        taken = self._availability.block_any_available(
+            resource_ids, one_day, Owner.new_one(), ResourceSelectionPolicy.FIRST_FIT
+        )
+
+        assert taken == resource_ids[1]
+
+    def test_least_loaded_takes_resource_taken_for_the_shortest_time_nearby(self) -> None:
+        busy, less_busy = ResourceId.new_one(), ResourceId.new_one()
+        jan_1 = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        jan_2 = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 2)
+        jan_1_2 = TimeSlot(jan_1.from_, jan_2.to)
+        self._availability.create_resource_slots(busy, jan_1_2)
+        self._availability.create_resource_slots(less_busy, jan_1_2)
+        _ = self._availability.block(busy, jan_1, Owner.new_one())
+        _ = self._availability.block(
+            less_busy, TimeSlot(jan_1.from_, jan_1.from_ + timedelta(hours=1)), Owner.new_one()
+        )
+
+        taken = self._availability.block_any_available(
+            [busy, less_busy], jan_2, Owner.new_one(), ResourceSelectionPolicy.LEAST_LOADED
+        )
+
+        assert taken == less_busy
+
+    def test_tries_next_resource_when_chosen_one_was_taken_concurrently(self, when: Any) -> None:
+        taken_concurrently, free = ResourceId.new_one(), ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        self._availability.create_resource_slots(taken_concurrently, one_day)
+        self._availability.create_resource_slots(free, one_day)
+        _ = self._availability.block(taken_concurrently, one_day, Owner.new_one())
+        when(ResourceAvailabilityRepository).find_available_resources_within(...).thenReturn(
+            [
+                taken_concurrently,
+                free,
+            ]
+        )
+        owner = Owner.new_one()
+
+        taken = self._availability.block_random_available({taken_concurrently, free}, one_day, owner)
+
+        assert taken == free
+        assert self._resource_is_taken_by_owner(free, owner, one_day)
+
+    def test_tries_further_candidates_when_whole_batch_was_taken_concurrently(self, when: Any) -> None:
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        taken_concurrently = [ResourceId.new_one() for _ in range(AvailabilityFacade.CANDIDATES_BATCH_SIZE)]
+        free = ResourceId.new_one()
+        for resource_id in [*taken_concurrently, free]:
+            self._availability.create_resource_slots(resource_id, one_day)
+        for resource_id in taken_concurrently:
+            _ = self._availability.block(resource_id, one_day, Owner.new_one())
+        when(ResourceAvailabilityRepository).find_available_resources_within(...).thenReturn(taken_concurrently, [free])
+        owner = Owner.new_one()
+
+        taken = self._availability.block_random_available([*taken_concurrently, free], one_day, owner)
+
+        assert taken == free
+        assert self._resource_is_taken_by_owner(free, owner, one_day)
+
     def _resource_is_taken_by_owner(self, resource_id: ResourceId, owner: Owner, one_day: TimeSlot) -> bool:
         resource_availability = self._availability.find(resource_id, one_day)
         return all(availability.blocked_by == owner for availability in resource_availability.resource_availabilities)
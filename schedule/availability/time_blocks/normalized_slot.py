@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
 from typing import override
 
 from schedule.shared.timeslot import TimeSlot
@@ -13,8 +14,7 @@ from .duration_unit import DurationUnit
 class NormalizedSlot(TimeSlot):
     @classmethod
     def from_time_slot(cls, time_slot: TimeSlot, duration_unit: DurationUnit) -> NormalizedSlot:
-        normalizer = TimeSlotNormalizer(duration_unit=duration_unit)
-        return normalizer.slot_to_normalized_slot(time_slot=time_slot)
+        return _normalize(time_slot, duration_unit, time_slot.from_.tzinfo, time_slot.to.tzinfo)
 
     @override
     def __eq__(self, other: object) -> bool:
@@ -40,14 +40,29 @@ class TimeSlotNormalizer:
 
     def _normalize_start(self, initial_start: datetime) -> datetime:
         closest_segment_start = initial_start.replace(minute=0, second=0, microsecond=0)
-        if closest_segment_start + self._duration_unit.value > initial_start:
+        offset = initial_start - closest_segment_start
+        if offset < self._duration_unit.value:
             return closest_segment_start
-        while closest_segment_start < initial_start:
-            closest_segment_start += self._duration_unit.value
-        return closest_segment_start
+        return closest_segment_start + self._segments_covering(offset) * self._duration_unit.value
 
     def _normalize_end(self, initial_end: datetime) -> datetime:
         closest_segment_end = initial_end.replace(minute=0, second=0, microsecond=0)
-        while initial_end > closest_segment_end:
-            closest_segment_end += self._duration_unit.value
-        return closest_segment_end
+        return (
+            closest_segment_end + self._segments_covering(initial_end - closest_segment_end) * self._duration_unit.value
+        )
+
+    def _segments_covering(self, offset: timedelta) -> int:
+        return -(-offset // self._duration_unit.value)
+
+
+NORMALIZED_SLOTS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=NORMALIZED_SLOTS_CACHE_SIZE)
+def _normalize(
+    time_slot: TimeSlot,
+    duration_unit: DurationUnit,
+    *_time_zones: tzinfo | None,
+) -> NormalizedSlot:
+    # datetimes in different time zones compare equal, time zones are part of the key to tell them apart
+    return TimeSlotNormalizer(duration_unit=duration_unit).slot_to_normalized_slot(time_slot=time_slot)
@@ -80,3 +80,18 @@ class TestSegments:
             TimeSlot(datetime(2023, 9, 9), datetime(2023, 9, 9, 0, 30)),
             TimeSlot(datetime(2023, 9, 9, 0, 30), datetime(2023, 9, 9, 0, 59)),
         ]
+
+    def test_splits_lazily(self) -> None:
+        one_year = TimeSlot(datetime(2023, 1, 1), datetime(2024, 1, 1))
+
+        blocks = AtomicTimeBlock.iter_split(one_year, DurationUnit(15))
+
+        assert next(blocks) == TimeSlot(datetime(2023, 1, 1), datetime(2023, 1, 1, 0, 15))
+        assert next(blocks) == TimeSlot(datetime(2023, 1, 1, 0, 15), datetime(2023, 1, 1, 0, 30))
+
+    def test_lazy_splitting_yields_the_same_blocks(self) -> None:
+        time_slot = TimeSlot(datetime(2023, 9, 9, 0, 10), datetime(2023, 9, 10, 3, 7))
+
+        assert list(AtomicTimeBlock.iter_split(time_slot, DurationUnit(45))) == AtomicTimeBlock.split(
+            time_slot, DurationUnit(45)
+        )
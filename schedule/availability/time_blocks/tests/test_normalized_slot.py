@@ -1,11 +1,11 @@
-from datetime import datetime
+from datetime import UTC, datetime, timedelta, timezone
 
 import pytest
 
 from schedule.shared.timeslot.time_slot import TimeSlot
 
 from ..duration_unit import DurationUnit
-from ..normalized_slot import NormalizedSlot
+from ..normalized_slot import NormalizedSlot, TimeSlotNormalizer
 
 
 class TestSlotToNormalizedSlod:
@@ -52,3 +52,45 @@ class TestSlotToNormalizedSlod:
         normalized = NormalizedSlot.from_time_slot(TimeSlot(start, end), fifteen_minutes)
 
         assert normalized == TimeSlot(start, end)
+
+    @pytest.mark.parametrize("minutes", [15, 30, 45, 90, 60 * 24])
+    @pytest.mark.parametrize("offset", [timedelta(0), timedelta(minutes=7), timedelta(minutes=44, seconds=1)])
+    def test_normalizes_like_stepping_one_unit_at_a_time(self, minutes: int, offset: timedelta) -> None:
+        duration_unit = DurationUnit(minutes)
+        start = datetime(2023, 9, 9, 5) + offset
+        time_slot = TimeSlot(start, start + timedelta(minutes=100))
+
+        normalized = TimeSlotNormalizer(duration_unit).slot_to_normalized_slot(time_slot)
+
+        assert normalized == self._normalize_stepwise(time_slot, duration_unit.value)
+
+    def test_reuses_normalization_of_the_same_slot(self) -> None:
+        time_slot = TimeSlot(datetime(2023, 9, 9, 0, 10), datetime(2023, 9, 9, 0, 59))
+        one_hour = DurationUnit(60)
+
+        assert NormalizedSlot.from_time_slot(time_slot, one_hour) is NormalizedSlot.from_time_slot(time_slot, one_hour)
+
+    def test_tells_apart_the_same_instants_in_different_time_zones(self) -> None:
+        start = datetime(2023, 9, 9, 1, tzinfo=UTC)
+        time_slot = TimeSlot(start, start + timedelta(hours=1))
+        half_past = timezone(timedelta(minutes=30))
+        same_slot_elsewhere = TimeSlot(start.astimezone(half_past), (start + timedelta(hours=1)).astimezone(half_past))
+        one_hour = DurationUnit(60)
+
+        assert NormalizedSlot.from_time_slot(time_slot, one_hour) == time_slot
+        assert NormalizedSlot.from_time_slot(same_slot_elsewhere, one_hour) == TimeSlot(
+            start - timedelta(minutes=30), start + timedelta(hours=1, minutes=30)
+        )
+
+    @staticmethod
+    def _normalize_stepwise(time_slot: TimeSlot, unit: timedelta) -> TimeSlot:
+        start = time_slot.from_.replace(minute=0, second=0, microsecond=0)
+        if start + unit <= time_slot.from_:
+            while start < time_slot.from_:
+                start += unit
+        end = time_slot.to.replace(minute=0, second=0, microsecond=0)
+        while time_slot.to > end:
+            end += unit
+        if TimeSlot(start, end).within(TimeSlot(start, start + unit)):
+            return TimeSlot(start, start + unit)
+        return TimeSlot(start, end)
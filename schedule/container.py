@@ -1,5 +1,6 @@
 from lagom import Container
 
+from schedule.availability.repository.calendar_cache import CalendarCache
 from schedule.shared.event import EventBus, EventPublisher, SyncExecutor
 
 
@@ -8,4 +9,5 @@ def build() -> Container:
     executor = SyncExecutor()
     container[EventPublisher] = lambda c: EventBus(c, executor)  # type: ignore[type-abstract]
     container[EventBus] = lambda c: EventBus(c, executor)
+    container[CalendarCache] = CalendarCache()
     return container
@@ -1,6 +1,7 @@
 from .item import Item
 from .optimization_facade import OptimizationFacade
+from .optimization_mode import OptimizationMode
 from .total_capacity import TotalCapacity
 from .total_weight import TotalWeight
 
-__all__ = ["Item", "OptimizationFacade", "TotalCapacity", "TotalWeight"]
+__all__ = ["Item", "OptimizationFacade", "OptimizationMode", "TotalCapacity", "TotalWeight"]
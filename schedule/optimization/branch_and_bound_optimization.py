@@ -0,0 +1,147 @@
+from collections.abc import Callable, Iterable, Iterator
+
+from schedule.shared.typing_extensions import Comparable
+
+from .capacity_dimension import CapacityDimension
+from .item import Item
+from .result import OptimizationResult
+from .total_capacity import TotalCapacity
+from .weight_dimension import WeightDimension
+
+type CapacityMask = int
+type Candidate[T: CapacityDimension] = tuple[Item[T], int, list[CapacityMask]]
+type Selection[T: CapacityDimension] = tuple[Item[T], CapacityMask, Selection[T]] | None
+type Node[T: CapacityDimension] = tuple[int, CapacityMask, int, Selection[T]]
+
+
+class BranchAndBoundOptimization[T: CapacityDimension]:
+    """Finds the most profitable set of items that can be given disjoint concrete capacities.
+
+    As in DpOptimization, weight components of a single item may share a capacity,
+    while capacities are never shared between items.
+    """
+
+    class NodeBudgetExceededError(Exception):
+        pass
+
+    def __init__(self, node_budget: int) -> None:
+        self._node_budget: int = node_budget
+        self._visited_nodes: int = 0
+
+    def calculate(
+        self,
+        items: Iterable[Item[T]],
+        total_capacity: TotalCapacity[T],
+        sort_key_getter: Callable[[Item[T]], Comparable],
+    ) -> OptimizationResult[T]:
+        items = list(items)
+        capacities = total_capacity.capacities
+        self._visited_nodes = 0
+
+        best_profit, best_selection = self._search(self._candidates(items, capacities, sort_key_getter))
+
+        chosen: list[tuple[Item[T], CapacityMask]] = []
+        while best_selection is not None:
+            item, assignment, best_selection = best_selection
+            chosen.append((item, assignment))
+        chosen.reverse()
+
+        automatically_included_items = [item for item in items if item.is_weight_zero()]
+        guaranteed_value = sum(item.value for item in automatically_included_items)
+        return OptimizationResult(
+            best_profit + guaranteed_value,
+            [item for item, _ in chosen] + automatically_included_items,
+            {item: self._capacities_of(assignment, capacities) for item, assignment in chosen},
+            is_exact=True,
+        )
+
+    def _candidates(
+        self,
+        items: list[Item[T]],
+        capacities: tuple[T, ...],
+        sort_key_getter: Callable[[Item[T]], Comparable],
+    ) -> list[Candidate[T]]:
+        masks_by_component: dict[WeightDimension[T], CapacityMask] = {}
+        candidates: list[Candidate[T]] = []
+        for item in sorted(items, key=sort_key_getter):
+            if item.is_weight_zero():
+                continue
+            component_masks = [
+                self._mask_of(component, capacities, masks_by_component) for component in item.total_weight.components
+            ]
+            if all(component_masks):
+                candidates.append((item, int(item.value), component_masks))
+        return candidates
+
+    def _search(self, candidates: list[Candidate[T]]) -> tuple[int, Selection[T]]:
+        best_profit = 0
+        best_selection: Selection[T] = None
+        root: Node[T] = (0, 0, 0, None)
+        stack: list[Iterator[Node[T]]] = [iter([root])]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+            self._visit()
+            index, used, profit, selection = node
+            if profit > best_profit:
+                best_profit, best_selection = profit, selection
+            if index == len(candidates) or profit + self._optimistic_profit(candidates[index:], used) <= best_profit:
+                continue
+            stack.append(self._children(node, candidates[index]))
+        return best_profit, best_selection
+
+    def _children(self, node: Node[T], candidate: Candidate[T]) -> Iterator[Node[T]]:
+        index, used, profit, selection = node
+        item, value, component_masks = candidate
+        for assignment in self._assignments(component_masks, used):
+            yield index + 1, used | assignment, profit + value, (item, assignment, selection)
+        yield index + 1, used, profit, selection
+
+    def _assignments(self, component_masks: list[CapacityMask], used: CapacityMask) -> Iterator[CapacityMask]:
+        seen: set[CapacityMask] = set()
+
+        def extend(assignment: CapacityMask) -> Iterator[CapacityMask]:
+            self._visit()
+            unsatisfied = next((mask for mask in component_masks if not mask & assignment), None)
+            if unsatisfied is None:
+                if assignment not in seen:
+                    seen.add(assignment)
+                    yield assignment
+                return
+            available = unsatisfied & ~used
+            while available:
+                lowest = available & -available
+                yield from extend(assignment | lowest)
+                available ^= lowest
+
+        return extend(0)
+
+    def _optimistic_profit(self, candidates: list[Candidate[T]], used: CapacityMask) -> int:
+        return sum(
+            value
+            for _, value, component_masks in candidates
+            if value > 0 and all(mask & ~used for mask in component_masks)
+        )
+
+    def _visit(self) -> None:
+        self._visited_nodes += 1
+        if self._visited_nodes > self._node_budget:
+            raise self.NodeBudgetExceededError
+
+    @staticmethod
+    def _mask_of(
+        component: WeightDimension[T],
+        capacities: tuple[T, ...],
+        masks_by_component: dict[WeightDimension[T], CapacityMask],
+    ) -> CapacityMask:
+        if component not in masks_by_component:
+            masks_by_component[component] = sum(
+                1 << position for position, capacity in enumerate(capacities) if component.is_satisfied_by(capacity)
+            )
+        return masks_by_component[component]
+
+    @staticmethod
+    def _capacities_of(assignment: CapacityMask, capacities: tuple[T, ...]) -> set[T]:
+        return {capacity for position, capacity in enumerate(capacities) if assignment >> position & 1}
@@ -0,0 +1,14 @@
+from collections.abc import Callable, Sequence
+from typing import Protocol
+
+from .capacity_dimension import CapacityDimension
+from .weight_dimension import WeightDimension
+
+
+class CapacityIndex[T: CapacityDimension](Protocol):
+    def first_satisfying(self, weight_component: WeightDimension[T]) -> T | None: ...
+
+    def remove(self, *capacities: T) -> None: ...
+
+
+type CapacityIndexFactory[T: CapacityDimension] = Callable[[Sequence[T]], CapacityIndex[T]]
@@ -0,0 +1,16 @@
+from importlib.util import find_spec
+
+from .capacity_dimension import CapacityDimension
+from .dp_table import DpTable
+from .python_dp_table import PythonDpTable
+
+NUMPY_AVAILABLE = find_spec("numpy") is not None
+INT64_MAX = 2**63 - 1
+
+
+def default_dp_table[T: CapacityDimension](capacities_size: int, total_value: int) -> DpTable[T]:
+    if NUMPY_AVAILABLE and total_value <= INT64_MAX:
+        from .numpy_dp_table import NumpyDpTable  # noqa: PLC0415
+
+        return NumpyDpTable[T](capacities_size)
+    return PythonDpTable[T](capacities_size)
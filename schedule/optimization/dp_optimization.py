@@ -3,72 +3,169 @@ from collections.abc import Callable, Iterable, Sequence
 from schedule.shared.typing_extensions import Comparable
 
 from .capacity_dimension import CapacityDimension
+from .capacity_index import CapacityIndex, CapacityIndexFactory
+from .default_dp_table import default_dp_table
+from .dp_table import DpTable, DpTableFactory
 from .item import Item
+from .k_best_dp_table import KBestDpTable
+from .memoized_capacity_index import MemoizedCapacityIndex
 from .result import OptimizationResult
 from .total_capacity import TotalCapacity
 from .total_weight import TotalWeight
 
 
 class DpOptimization[T: CapacityDimension]:
+    def __init__(
+        self,
+        capacity_index_factory: CapacityIndexFactory[T] = MemoizedCapacityIndex,
+        dp_table_factory: DpTableFactory[T] = default_dp_table,
+    ) -> None:
+        self._capacity_index_factory: CapacityIndexFactory[T] = capacity_index_factory
+        self._dp_table_factory: DpTableFactory[T] = dp_table_factory
+
     def calculate(
         self,
         items: Iterable[Item[T]],
         total_capacity: TotalCapacity[T],
         sort_key_getter: Callable[[Item[T]], Comparable],
     ) -> OptimizationResult[T]:
-        capacities_size = len(total_capacity)
-        dp = [0] * (capacities_size + 1)
-        chosen_items_list: list[list[Item[T]]] = [[] for _ in range(capacities_size + 1)]
-        allocated_capacities_list: list[set[CapacityDimension]] = [set() for _ in range(capacities_size + 1)]
-
-        for i in range(capacities_size + 1):
-            chosen_items_list[i] = []
-            allocated_capacities_list[i] = set()
-
-        all_capacities = total_capacity.capacities
+        sorted_items = sorted(items, key=sort_key_getter)
+        dp = self._dp_table_factory(len(total_capacity), self._total_value(sorted_items))
+        capacity_index = self._capacity_index_factory(total_capacity.capacities)
         item_to_capacities_map: dict[Item[T], set[T]] = {}
 
-        for item in sorted(items, key=sort_key_getter):
-            chosen_capacities = self._match_capacities(
-                item.total_weight,
-                all_capacities,
-            )
-            all_capacities = tuple(capacity for capacity in all_capacities if capacity not in chosen_capacities)
-
-            if not chosen_capacities:
-                continue
+        for item in sorted_items:
+            chosen_capacities = self._match_capacities(item.total_weight, capacity_index)
+            self._include(item, chosen_capacities, capacity_index, dp, item_to_capacities_map)
 
-            sum_value = int(item.value)
-            chosen_capacities_count = len(chosen_capacities)
+        return self._result(items, dp, item_to_capacities_map)
 
-            for j in range(capacities_size, chosen_capacities_count - 1, -1):
-                if dp[j] < sum_value + dp[j - chosen_capacities_count]:
-                    dp[j] = sum_value + dp[j - chosen_capacities_count]
-
-                    chosen_items_list[j] = chosen_items_list[j - chosen_capacities_count].copy()
-                    chosen_items_list[j].append(item)
+    def calculate_with_each_additional_capacity(
+        self,
+        items: Iterable[Item[T]],
+        total_capacity: TotalCapacity[T],
+        additional_capacities: Sequence[T],
+        sort_key_getter: Callable[[Item[T]], Comparable],
+    ) -> tuple[OptimizationResult[T], list[OptimizationResult[T]]]:
+        """Solve once without and once with each additional capacity appended, sharing the common prefix.
+
+        Adding a capacity at the end only changes the run from the first item that fails without it
+        and succeeds with it, so only the remainder of the run is solved again for that capacity.
+        As in calculate, consuming a capacity consumes any equal one too, so an additional capacity equal to one
+        already consumed unlocks nothing.
+        """
+        items = list(items)
+        sorted_items = sorted(items, key=sort_key_getter)
+        capacities_size = len(total_capacity)
+        dp = self._dp_table_factory(capacities_size + 1, self._total_value(sorted_items))
+        capacity_index = self._capacity_index_factory(total_capacity.capacities)
+        item_to_capacities_map: dict[Item[T], set[T]] = {}
+        consumed_capacities: set[T] = set()
+        diverged: dict[int, OptimizationResult[T]] = {}
+        pending = dict(enumerate(additional_capacities))
+
+        for position, item in enumerate(sorted_items):
+            chosen_capacities = self._match_capacities(item.total_weight, capacity_index)
+            unlockable = [] if chosen_capacities else list(pending.items())
+            for number, additional_capacity in unlockable:
+                if additional_capacity in consumed_capacities:
+                    del pending[number]
+                    continue
+                chosen_with_additional = self._match_capacities(item.total_weight, capacity_index, additional_capacity)
+                if not chosen_with_additional:
+                    continue
+                del pending[number]
+                fork_index = self._capacity_index_factory((*total_capacity.capacities, additional_capacity))
+                fork_index.remove(*consumed_capacities)
+                fork_dp = dp.copy()
+                fork_map = item_to_capacities_map.copy()
+                self._include(item, chosen_with_additional, fork_index, fork_dp, fork_map)
+                for next_item in sorted_items[position + 1 :]:
+                    next_chosen = self._match_capacities(next_item.total_weight, fork_index)
+                    self._include(next_item, next_chosen, fork_index, fork_dp, fork_map)
+                diverged[number] = self._result(items, fork_dp, fork_map)
+            consumed_capacities.update(chosen_capacities)
+            self._include(item, chosen_capacities, capacity_index, dp, item_to_capacities_map)
+
+        without_additional = self._result(items, dp, item_to_capacities_map, capacities_size)
+        with_unused_additional = self._result(items, dp, item_to_capacities_map)
+        return without_additional, [
+            diverged.get(number, with_unused_additional) for number in range(len(additional_capacities))
+        ]
+
+    def calculate_k_best(
+        self,
+        items: Iterable[Item[T]],
+        total_capacity: TotalCapacity[T],
+        k: int,
+        sort_key_getter: Callable[[Item[T]], Comparable],
+    ) -> list[OptimizationResult[T]]:
+        """Return up to k most profitable distinct selections, the first one being the calculate result."""
+        items = list(items)
+        dp = KBestDpTable[T](len(total_capacity), k)
+        capacity_index = self._capacity_index_factory(total_capacity.capacities)
+        item_to_capacities_map: dict[Item[T], set[T]] = {}
 
-                    allocated_capacities_list[j].update(chosen_capacities)
+        for item in sorted(items, key=sort_key_getter):
+            chosen_capacities = self._match_capacities(item.total_weight, capacity_index)
+            self._include(item, chosen_capacities, capacity_index, dp, item_to_capacities_map)
 
-            item_to_capacities_map[item] = set(chosen_capacities)
+        automatically_included_items = [item for item in items if item.is_weight_zero()]
+        guaranteed_value = sum(item.value for item in automatically_included_items)
+        return [
+            OptimizationResult(
+                profit + guaranteed_value,
+                chosen_items + automatically_included_items,
+                {item: item_to_capacities_map[item] for item in chosen_items},
+            )
+            for profit, chosen_items in dp.best()
+        ]
 
+    def _include(
+        self,
+        item: Item[T],
+        chosen_capacities: list[T],
+        capacity_index: CapacityIndex[T],
+        dp: DpTable[T] | KBestDpTable[T],
+        item_to_capacities_map: dict[Item[T], set[T]],
+    ) -> None:
+        capacity_index.remove(*chosen_capacities)
+        if not chosen_capacities:
+            return
+        dp.include(item, int(item.value), len(chosen_capacities))
+        item_to_capacities_map[item] = set(chosen_capacities)
+
+    def _result(
+        self,
+        items: Iterable[Item[T]],
+        dp: DpTable[T],
+        item_to_capacities_map: dict[Item[T], set[T]],
+        capacities_size: int | None = None,
+    ) -> OptimizationResult[T]:
         automatically_included_items = [item for item in items if item.is_weight_zero()]
         guaranteed_value = sum(item.value for item in automatically_included_items)
 
-        chosen_items_list[capacities_size].extend(automatically_included_items)
         return OptimizationResult(
-            dp[capacities_size] + guaranteed_value,
-            chosen_items_list[capacities_size],
+            dp.profit(capacities_size) + guaranteed_value,
+            dp.chosen_items(capacities_size) + automatically_included_items,
             item_to_capacities_map,
         )
 
-    def _match_capacities(self, total_weight: TotalWeight[T], available_capacities: Sequence[T]) -> list[T]:
+    @staticmethod
+    def _total_value(items: Iterable[Item[T]]) -> int:
+        return sum(abs(int(item.value)) for item in items)
+
+    def _match_capacities(
+        self,
+        total_weight: TotalWeight[T],
+        available_capacities: CapacityIndex[T],
+        additional_capacity: T | None = None,
+    ) -> list[T]:
         result: list[T] = []
         for weight_component in total_weight.components:
-            matching_capacity: T | None = next(
-                (capacity for capacity in available_capacities if weight_component.is_satisfied_by(capacity)),
-                None,
-            )
+            matching_capacity = available_capacities.first_satisfying(weight_component)
+            if not matching_capacity and additional_capacity and weight_component.is_satisfied_by(additional_capacity):
+                matching_capacity = additional_capacity
 
             if matching_capacity:
                 result.append(matching_capacity)
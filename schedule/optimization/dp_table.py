@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Protocol
+
+from .capacity_dimension import CapacityDimension
+from .item import Item
+
+
+class DpTable[T: CapacityDimension](Protocol):
+    def include(self, item: Item[T], value: int, weight: int) -> None: ...
+
+    def profit(self, capacities_size: int | None = None) -> int: ...
+
+    def chosen_items(self, capacities_size: int | None = None) -> list[Item[T]]: ...
+
+    def copy(self) -> DpTable[T]: ...
+
+
+type DpTableFactory[T: CapacityDimension] = Callable[[int, int], DpTable[T]]
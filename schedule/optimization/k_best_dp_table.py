@@ -0,0 +1,34 @@
+from heapq import merge
+from itertools import islice
+
+from .capacity_dimension import CapacityDimension
+from .item import Item
+
+type Selection[T: CapacityDimension] = tuple[Item[T], Selection[T]] | None
+
+
+class KBestDpTable[T: CapacityDimension]:
+    """Keeps the k most profitable distinct selections per cell instead of only the best one."""
+
+    def __init__(self, capacities_size: int, k: int) -> None:
+        self._capacities_size: int = capacities_size
+        self._k: int = k
+        self._cells: list[list[tuple[int, Selection[T]]]] = [[(0, None)] for _ in range(capacities_size + 1)]
+
+    def include(self, item: Item[T], value: int, weight: int) -> None:
+        cells = self._cells
+        for j in range(self._capacities_size, weight - 1, -1):
+            with_item = [(profit + value, (item, selection)) for profit, selection in cells[j - weight]]
+            cells[j] = list(islice(merge(cells[j], with_item, key=lambda x: -x[0]), self._k))
+
+    def best(self) -> list[tuple[int, list[Item[T]]]]:
+        return [(profit, self._unwind(selection)) for profit, selection in self._cells[self._capacities_size]]
+
+    @staticmethod
+    def _unwind(selection: Selection[T]) -> list[Item[T]]:
+        result: list[Item[T]] = []
+        while selection is not None:
+            item, selection = selection
+            result.append(item)
+        result.reverse()
+        return result
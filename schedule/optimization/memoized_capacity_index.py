@@ -0,0 +1,37 @@
+from collections.abc import Sequence
+
+from .capacity_dimension import CapacityDimension
+from .weight_dimension import WeightDimension
+
+
+class MemoizedCapacityIndex[T: CapacityDimension]:
+    """Finds capacities satisfying a weight component once, then serves them in original order."""
+
+    def __init__(self, capacities: Sequence[T]) -> None:
+        self._capacities: tuple[T, ...] = tuple(capacities)
+        self._removed: bytearray = bytearray(len(self._capacities))
+        self._positions_by_capacity: dict[T, list[int]] = {}
+        for position, capacity in enumerate(self._capacities):
+            self._positions_by_capacity.setdefault(capacity, []).append(position)
+        self._satisfying_positions: dict[WeightDimension[T], list[int]] = {}
+        self._cursors: dict[WeightDimension[T], int] = {}
+
+    def first_satisfying(self, weight_component: WeightDimension[T]) -> T | None:
+        positions = self._satisfying_positions.get(weight_component)
+        if positions is None:
+            positions = [
+                position
+                for position, capacity in enumerate(self._capacities)
+                if not self._removed[position] and weight_component.is_satisfied_by(capacity)
+            ]
+            self._satisfying_positions[weight_component] = positions
+        cursor = self._cursors.get(weight_component, 0)
+        while cursor < len(positions) and self._removed[positions[cursor]]:
+            cursor += 1
+        self._cursors[weight_component] = cursor
+        return self._capacities[positions[cursor]] if cursor < len(positions) else None
+
+    def remove(self, *capacities: T) -> None:
+        for capacity in capacities:
+            for position in self._positions_by_capacity.get(capacity, ()):
+                self._removed[position] = 1
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+from .capacity_dimension import CapacityDimension
+from .item import Item
+
+
+class NumpyDpTable[T: CapacityDimension]:
+    """Runs each item's sweep as one shifted maximum and keeps per-item improvement masks for reconstruction."""
+
+    def __init__(self, capacities_size: int) -> None:
+        self._capacities_size: int = capacities_size
+        self._dp: npt.NDArray[np.int64] = np.zeros(capacities_size + 1, dtype=np.int64)
+        self._improvements: list[tuple[Item[T], int, npt.NDArray[np.bool_]]] = []
+
+    def include(self, item: Item[T], value: int, weight: int) -> None:
+        if weight > self._capacities_size:
+            return
+        candidate = self._dp[: self._capacities_size + 1 - weight] + value
+        improved = self._dp[weight:] < candidate
+        self._dp[weight:] = np.where(improved, candidate, self._dp[weight:])
+        self._improvements.append((item, weight, improved))
+
+    def profit(self, capacities_size: int | None = None) -> int:
+        return int(self._dp[self._capacities_size if capacities_size is None else capacities_size])
+
+    def chosen_items(self, capacities_size: int | None = None) -> list[Item[T]]:
+        result: list[Item[T]] = []
+        j = self._capacities_size if capacities_size is None else capacities_size
+        for item, weight, improved in reversed(self._improvements):
+            if j >= weight and improved[j - weight]:
+                result.append(item)
+                j -= weight
+        result.reverse()
+        return result
+
+    def copy(self) -> NumpyDpTable[T]:
+        table = NumpyDpTable[T](self._capacities_size)
+        table._dp = self._dp.copy()
+        table._improvements = self._improvements.copy()
+        return table
@@ -1,24 +1,65 @@
-from collections.abc import Callable
+import logging
+from collections.abc import Callable, Sequence
 
 from schedule.shared.typing_extensions import Comparable
 
+from .branch_and_bound_optimization import BranchAndBoundOptimization
 from .capacity_dimension import CapacityDimension
 from .dp_optimization import DpOptimization
 from .item import Item
+from .optimization_mode import OptimizationMode
 from .result import OptimizationResult
 from .total_capacity import TotalCapacity
 
+logger = logging.getLogger(__name__)
+
 
 class OptimizationFacade:
+    DEFAULT_NODE_BUDGET: int = 100_000
+
     def calculate[T: CapacityDimension](
         self,
         items: list[Item[T]],
         total_capacity: TotalCapacity[T],
         sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+        mode: OptimizationMode = OptimizationMode.HEURISTIC,
+        node_budget: int = DEFAULT_NODE_BUDGET,
     ) -> OptimizationResult[T]:
+        """Exact mode falls back to the heuristic when the search exceeds node_budget.
+
+        Only results of a completed exact search are marked is_exact; a fallback is also logged as a warning.
+        """
         sort_key_getter = sort_key_getter or self.default_loss_function
+        if mode == OptimizationMode.EXACT:
+            try:
+                return BranchAndBoundOptimization[T](node_budget).calculate(items, total_capacity, sort_key_getter)
+            except BranchAndBoundOptimization.NodeBudgetExceededError:
+                logger.warning("Exact optimization exceeded node budget of %d, falling back to heuristic", node_budget)
         return DpOptimization[T]().calculate(items, total_capacity, sort_key_getter)
 
+    def calculate_with_each_additional_capacity[T: CapacityDimension](
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity[T],
+        additional_capacities: Sequence[T],
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+    ) -> tuple[OptimizationResult[T], list[OptimizationResult[T]]]:
+        """Calculate without additional capacities and then with each of them added in turn."""
+        sort_key_getter = sort_key_getter or self.default_loss_function
+        return DpOptimization[T]().calculate_with_each_additional_capacity(
+            items, total_capacity, additional_capacities, sort_key_getter
+        )
+
+    def calculate_k_best[T: CapacityDimension](
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity[T],
+        k: int,
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+    ) -> list[OptimizationResult[T]]:
+        sort_key_getter = sort_key_getter or self.default_loss_function
+        return DpOptimization[T]().calculate_k_best(items, total_capacity, k, sort_key_getter)
+
     @staticmethod
     def default_loss_function[T: CapacityDimension](x: Item[T]) -> Comparable:
         return -x.value
@@ -0,0 +1,6 @@
+from enum import StrEnum, auto
+
+
+class OptimizationMode(StrEnum):
+    HEURISTIC = auto()
+    EXACT = auto()
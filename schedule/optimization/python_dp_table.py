@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from .capacity_dimension import CapacityDimension
+from .item import Item
+
+type ChosenItems[T: CapacityDimension] = tuple[Item[T], ChosenItems[T]] | None
+
+
+class PythonDpTable[T: CapacityDimension]:
+    def __init__(self, capacities_size: int) -> None:
+        self._capacities_size: int = capacities_size
+        self._dp: list[int] = [0] * (capacities_size + 1)
+        self._chosen_items: list[ChosenItems[T]] = [None] * (capacities_size + 1)
+
+    def include(self, item: Item[T], value: int, weight: int) -> None:
+        dp = self._dp
+        chosen_items = self._chosen_items
+        for j in range(self._capacities_size, weight - 1, -1):
+            if dp[j] < value + dp[j - weight]:
+                dp[j] = value + dp[j - weight]
+                chosen_items[j] = (item, chosen_items[j - weight])
+
+    def profit(self, capacities_size: int | None = None) -> int:
+        return self._dp[self._capacities_size if capacities_size is None else capacities_size]
+
+    def chosen_items(self, capacities_size: int | None = None) -> list[Item[T]]:
+        result: list[Item[T]] = []
+        chosen_items = self._chosen_items[self._capacities_size if capacities_size is None else capacities_size]
+        while chosen_items is not None:
+            item, chosen_items = chosen_items
+            result.append(item)
+        result.reverse()
+        return result
+
+    def copy(self) -> PythonDpTable[T]:
+        table = PythonDpTable[T](self._capacities_size)
+        table._dp = self._dp.copy()
+        table._chosen_items = self._chosen_items.copy()
+        return table
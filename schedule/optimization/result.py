@@ -18,6 +18,7 @@ class OptimizationResult[T: CapacityDimension]:
     profit: Decimal = a.field(converter=number_to_decimal)
     chosen_items: list[Item[T]]
     item_to_capacities: dict[Item[T], set[T]]
+    is_exact: bool = a.field(default=False, eq=False, kw_only=True)
 
     @override
     def __str__(self) -> str:
@@ -0,0 +1,111 @@
+import random
+
+from ..dp_optimization import DpOptimization
+from ..item import Item
+from ..optimization_facade import OptimizationFacade
+from ..total_capacity import TotalCapacity
+from ..total_weight import TotalWeight
+from .capability_capacity_dimension import CapabilityCapacityDimension, CapabilityWeightDimension
+
+
+class TestAdditionalCapacities:
+    def test_result_without_additional_capacities_is_same_as_plain_calculation(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        item1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item2 = Item("Item2", 40, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        capacity = TotalCapacity.of(CapabilityCapacityDimension("anna", "JAVA", "Skill"))
+
+        without_additional, _ = optimization_facade.calculate_with_each_additional_capacity(
+            [item1, item2], capacity, [CapabilityCapacityDimension("zbyniu", "JAVA", "Skill")]
+        )
+
+        assert without_additional == optimization_facade.calculate([item1, item2], capacity)
+
+    def test_each_additional_capacity_is_evaluated_separately(self, optimization_facade: OptimizationFacade) -> None:
+        item1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item2 = Item("Item2", 40, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item3 = Item("Item3", 30, TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill")))
+        capacity = TotalCapacity.of(CapabilityCapacityDimension("anna", "JAVA", "Skill"))
+
+        without_additional, with_each = optimization_facade.calculate_with_each_additional_capacity(
+            [item1, item2, item3],
+            capacity,
+            [
+                CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+                CapabilityCapacityDimension("kasia", "PYTHON", "Skill"),
+                CapabilityCapacityDimension("marek", "GO", "Skill"),
+            ],
+        )
+
+        assert without_additional.profit == 100
+        assert [result.profit for result in with_each] == [140, 130, 100]
+
+    def test_gives_same_results_as_calculating_with_capacity_appended(self) -> None:
+        rng = random.Random(11)
+        skills = ["JAVA", "PYTHON", "GO", "RUST"]
+        optimization = DpOptimization[CapabilityCapacityDimension]()
+        for _ in range(20):
+            capacities = [CapabilityCapacityDimension(f"res{i}", rng.choice(skills), "Skill") for i in range(12)]
+            additional = [CapabilityCapacityDimension(f"new{i}", rng.choice(skills), "Skill") for i in range(6)]
+            items = [
+                Item(
+                    f"Item{i}",
+                    rng.randint(1, 100),
+                    TotalWeight.of(
+                        *[CapabilityWeightDimension(rng.choice(skills), "Skill") for _ in range(rng.randint(0, 3))]
+                    ),
+                )
+                for i in range(15)
+            ]
+
+            without_additional, with_each = optimization.calculate_with_each_additional_capacity(
+                items, TotalCapacity(capacities), additional, OptimizationFacade.default_loss_function
+            )
+
+            assert without_additional == optimization.calculate(
+                items, TotalCapacity(capacities), OptimizationFacade.default_loss_function
+            )
+            for additional_capacity, result in zip(additional, with_each, strict=True):
+                assert result == optimization.calculate(
+                    items, TotalCapacity([*capacities, additional_capacity]), OptimizationFacade.default_loss_function
+                )
+
+    def test_gives_same_results_as_calculating_with_duplicate_capacity_appended(self) -> None:
+        rng = random.Random(7)
+        skills = ["JAVA", "PYTHON", "GO"]
+        optimization = DpOptimization[CapabilityCapacityDimension]()
+        for _ in range(30):
+            capacities = [CapabilityCapacityDimension(f"res{i}", rng.choice(skills), "Skill") for i in range(6)]
+            additional = [*capacities, CapabilityCapacityDimension("new", rng.choice(skills), "Skill")]
+            items = [
+                Item(
+                    f"Item{i}",
+                    rng.randint(1, 100),
+                    TotalWeight.of(
+                        *[CapabilityWeightDimension(rng.choice(skills), "Skill") for _ in range(rng.randint(1, 2))]
+                    ),
+                )
+                for i in range(8)
+            ]
+
+            _, with_each = optimization.calculate_with_each_additional_capacity(
+                items, TotalCapacity(capacities), additional, OptimizationFacade.default_loss_function
+            )
+
+            for additional_capacity, result in zip(additional, with_each, strict=True):
+                assert result == optimization.calculate(
+                    items, TotalCapacity([*capacities, additional_capacity]), OptimizationFacade.default_loss_function
+                )
+
+    def test_capacity_equal_to_consumed_one_unlocks_nothing(self, optimization_facade: OptimizationFacade) -> None:
+        anna = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+        item1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item2 = Item("Item2", 40, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+
+        _, [with_anna_again] = optimization_facade.calculate_with_each_additional_capacity(
+            [item1, item2], TotalCapacity.of(anna), [anna]
+        )
+
+        assert with_anna_again == optimization_facade.calculate([item1, item2], TotalCapacity.of(anna, anna))
+        assert with_anna_again.profit == 100
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from ..capacity_dimension import CapacityDimension
+from ..default_dp_table import INT64_MAX, default_dp_table
+from ..dp_optimization import DpOptimization
+from ..dp_table import DpTable
+from ..item import Item
+from ..optimization_facade import OptimizationFacade
+from ..python_dp_table import PythonDpTable
+from ..total_capacity import TotalCapacity
+from ..total_weight import TotalWeight
+from .capability_capacity_dimension import CapabilityCapacityDimension, CapabilityWeightDimension
+
+
+class TestDpTables:
+    def test_python_table_is_used_when_values_may_overflow_int64(self) -> None:
+        table: DpTable[CapacityDimension] = default_dp_table(10, INT64_MAX + 1)
+
+        assert isinstance(table, PythonDpTable)
+
+    def test_numpy_table_gives_identical_results(self) -> None:
+        _ = pytest.importorskip("numpy")
+        from .. import numpy_dp_table  # noqa: PLC0415
+
+        rng = random.Random(3)
+        skills = ["JAVA", "PYTHON", "GO"]
+        for _ in range(20):
+            capacities = [CapabilityCapacityDimension(f"res{i}", rng.choice(skills), "Skill") for i in range(30)]
+            items = [
+                Item(
+                    f"Item{i}",
+                    rng.choice([rng.randint(1, 100), rng.uniform(1, 100)]),
+                    TotalWeight.of(
+                        *[CapabilityWeightDimension(rng.choice(skills), "Skill") for _ in range(rng.randint(0, 3))]
+                    ),
+                )
+                for i in range(25)
+            ]
+
+            python = DpOptimization[CapabilityCapacityDimension](
+                dp_table_factory=lambda size, _: PythonDpTable(size)
+            ).calculate(items, TotalCapacity(capacities), OptimizationFacade.default_loss_function)
+            vectorized = DpOptimization[CapabilityCapacityDimension](
+                dp_table_factory=lambda size, _: numpy_dp_table.NumpyDpTable(size)
+            ).calculate(items, TotalCapacity(capacities), OptimizationFacade.default_loss_function)
+
+            assert python == vectorized
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from schedule.shared.timeslot.time_slot import TimeSlot
+
+from ..item import Item
+from ..optimization_facade import OptimizationFacade
+from ..optimization_mode import OptimizationMode
+from ..total_capacity import TotalCapacity
+from ..total_weight import TotalWeight
+from .capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityTimedCapacityDimension,
+    CapabilityTimedWeightDimension,
+    CapabilityWeightDimension,
+)
+
+
+class TestExactOptimization:
+    JUNE = TimeSlot.create_monthly_time_slot_at_utc(2020, 6)
+    FIRST_OF_JUNE = TimeSlot.create_daily_time_slot_at_utc(2020, 6, 1)
+
+    def test_finds_assignment_missed_by_heuristic(self, optimization_facade: OptimizationFacade) -> None:
+        short_item = Item(
+            "Item1", 100, TotalWeight.of(CapabilityTimedWeightDimension("JAVA", "Skill", self.FIRST_OF_JUNE))
+        )
+        long_item = Item("Item2", 90, TotalWeight.of(CapabilityTimedWeightDimension("JAVA", "Skill", self.JUNE)))
+        available_whole_month = CapabilityTimedCapacityDimension("anna", "JAVA", "Skill", self.JUNE)
+        available_one_day = CapabilityTimedCapacityDimension("zbyniu", "JAVA", "Skill", self.FIRST_OF_JUNE)
+        capacity = TotalCapacity.of(available_whole_month, available_one_day)
+
+        heuristic = optimization_facade.calculate([short_item, long_item], capacity)
+        exact = optimization_facade.calculate([short_item, long_item], capacity, mode=OptimizationMode.EXACT)
+
+        assert heuristic.profit == 100
+        assert not heuristic.is_exact
+        assert exact.profit == 190
+        assert exact.is_exact
+        assert exact.chosen_items == [short_item, long_item]
+        assert exact.item_to_capacities == {
+            short_item: {available_one_day},
+            long_item: {available_whole_month},
+        }
+
+    def test_reports_fallback_to_heuristic_when_node_budget_is_exceeded(
+        self, optimization_facade: OptimizationFacade, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        short_item = Item(
+            "Item1", 100, TotalWeight.of(CapabilityTimedWeightDimension("JAVA", "Skill", self.FIRST_OF_JUNE))
+        )
+        long_item = Item("Item2", 90, TotalWeight.of(CapabilityTimedWeightDimension("JAVA", "Skill", self.JUNE)))
+        capacity = TotalCapacity.of(
+            CapabilityTimedCapacityDimension("anna", "JAVA", "Skill", self.JUNE),
+            CapabilityTimedCapacityDimension("zbyniu", "JAVA", "Skill", self.FIRST_OF_JUNE),
+        )
+
+        result = optimization_facade.calculate(
+            [short_item, long_item], capacity, mode=OptimizationMode.EXACT, node_budget=1
+        )
+
+        assert result.profit == 100
+        assert not result.is_exact
+        assert "falling back to heuristic" in caplog.text
+
+    def test_items_with_zero_weight_are_always_chosen(self, optimization_facade: OptimizationFacade) -> None:
+        free_item = Item("Item1", 50, TotalWeight.zero())
+        java_item = Item("Item2", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+
+        result = optimization_facade.calculate(
+            [free_item, java_item],
+            TotalCapacity.of(CapabilityCapacityDimension("anna", "JAVA", "Skill")),
+            mode=OptimizationMode.EXACT,
+        )
+
+        assert result.profit == 150
+        assert result.chosen_items == [java_item, free_item]
+
+    def test_is_never_worse_than_heuristic(self, optimization_facade: OptimizationFacade) -> None:
+        rng = random.Random(7)
+        skills = ["JAVA", "PYTHON", "GO"]
+        for _ in range(20):
+            capacities = [CapabilityCapacityDimension(f"res{i}", rng.choice(skills), "Skill") for i in range(8)]
+            items = [
+                Item(
+                    f"Item{i}",
+                    rng.randint(1, 100),
+                    TotalWeight.of(
+                        *[CapabilityWeightDimension(rng.choice(skills), "Skill") for _ in range(rng.randint(1, 3))]
+                    ),
+                )
+                for i in range(6)
+            ]
+
+            heuristic = optimization_facade.calculate(items, TotalCapacity(capacities))
+            exact = optimization_facade.calculate(items, TotalCapacity(capacities), mode=OptimizationMode.EXACT)
+
+            assert exact.profit >= heuristic.profit
+            used = [capacity for item in exact.chosen_items for capacity in exact.item_to_capacities[item]]
+            assert len(used) == len(set(used))
@@ -0,0 +1,51 @@
+from ..item import Item
+from ..optimization_facade import OptimizationFacade
+from ..total_capacity import TotalCapacity
+from ..total_weight import TotalWeight
+from .capability_capacity_dimension import CapabilityCapacityDimension, CapabilityWeightDimension
+
+
+class TestKBestOptimization:
+    def test_best_selection_is_same_as_calculate_result(self, optimization_facade: OptimizationFacade) -> None:
+        item1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item2 = Item("Item2", 500, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item3 = Item("Item3", 300, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        capacity = TotalCapacity.of(
+            CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+            CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+        )
+
+        best = optimization_facade.calculate_k_best([item1, item2, item3], capacity, 3)[0]
+        calculated = optimization_facade.calculate([item1, item2, item3], capacity)
+
+        assert best.profit == calculated.profit
+        assert best.chosen_items == calculated.chosen_items
+
+    def test_returns_k_distinct_selections_ordered_by_profit(self, optimization_facade: OptimizationFacade) -> None:
+        item1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item2 = Item("Item2", 500, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item3 = Item("Item3", 300, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item4 = Item("Item4", 50, TotalWeight.zero())
+        capacity = TotalCapacity.of(
+            CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+            CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+        )
+
+        results = optimization_facade.calculate_k_best([item1, item2, item3, item4], capacity, 3)
+
+        assert [result.profit for result in results] == [850, 550, 350]
+        assert [set(result.chosen_items) for result in results] == [
+            {item2, item3, item4},
+            {item2, item4},
+            {item3, item4},
+        ]
+        assert set(results[1].item_to_capacities) == {item2}
+
+    def test_returns_fewer_selections_when_there_are_not_enough(self, optimization_facade: OptimizationFacade) -> None:
+        item1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+
+        results = optimization_facade.calculate_k_best(
+            [item1], TotalCapacity.of(CapabilityCapacityDimension("anna", "JAVA", "Skill")), 5
+        )
+
+        assert [result.profit for result in results] == [100, 0]
@@ -0,0 +1,92 @@
+import random
+from collections.abc import Sequence
+
+from ..dp_optimization import DpOptimization
+from ..item import Item
+from ..memoized_capacity_index import MemoizedCapacityIndex
+from ..optimization_facade import OptimizationFacade
+from ..total_capacity import TotalCapacity
+from ..total_weight import TotalWeight
+from ..weight_dimension import WeightDimension
+from .capability_capacity_dimension import CapabilityCapacityDimension, CapabilityWeightDimension
+
+
+class LinearCapacityIndex:
+    def __init__(self, capacities: Sequence[CapabilityCapacityDimension]) -> None:
+        self._capacities: tuple[CapabilityCapacityDimension, ...] = tuple(capacities)
+
+    def first_satisfying(
+        self, weight_component: WeightDimension[CapabilityCapacityDimension]
+    ) -> CapabilityCapacityDimension | None:
+        return next((capacity for capacity in self._capacities if weight_component.is_satisfied_by(capacity)), None)
+
+    def remove(self, *capacities: CapabilityCapacityDimension) -> None:
+        self._capacities = tuple(capacity for capacity in self._capacities if capacity not in capacities)
+
+
+class TestMemoizedCapacityIndex:
+    def test_returns_first_satisfying_capacity_in_original_order(self) -> None:
+        python = CapabilityWeightDimension("PYTHON", "Skill")
+        java1 = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+        python1 = CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill")
+        python2 = CapabilityCapacityDimension("kasia", "PYTHON", "Skill")
+
+        index = MemoizedCapacityIndex([java1, python1, python2])
+
+        assert index.first_satisfying(python) == python1
+
+    def test_skips_removed_capacities(self) -> None:
+        python = CapabilityWeightDimension("PYTHON", "Skill")
+        python1 = CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill")
+        python2 = CapabilityCapacityDimension("kasia", "PYTHON", "Skill")
+        index = MemoizedCapacityIndex([python1, python2])
+        assert index.first_satisfying(python) == python1
+
+        index.remove(python1)
+
+        assert index.first_satisfying(python) == python2
+
+    def test_returns_none_when_all_satisfying_capacities_are_removed(self) -> None:
+        python = CapabilityWeightDimension("PYTHON", "Skill")
+        python1 = CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill")
+        index = MemoizedCapacityIndex([python1])
+
+        index.remove(python1)
+
+        assert index.first_satisfying(python) is None
+
+    def test_capacities_removed_before_first_query_are_not_returned(self) -> None:
+        python = CapabilityWeightDimension("PYTHON", "Skill")
+        python1 = CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill")
+        python2 = CapabilityCapacityDimension("kasia", "PYTHON", "Skill")
+        index = MemoizedCapacityIndex([python1, python2])
+
+        index.remove(python1)
+
+        assert index.first_satisfying(python) == python2
+
+    def test_gives_same_results_as_linear_scan(self) -> None:
+        rng = random.Random(42)
+        skills = ["JAVA", "PYTHON", "GO", "RUST"]
+        capacities = [CapabilityCapacityDimension(f"res{i}", rng.choice(skills), "Skill") for i in range(60)]
+        items = [
+            Item(
+                f"Item{i}",
+                rng.randint(1, 1000),
+                TotalWeight.of(
+                    *[CapabilityWeightDimension(rng.choice(skills), "Skill") for _ in range(rng.randint(1, 4))]
+                ),
+            )
+            for i in range(40)
+        ]
+
+        memoized = DpOptimization[CapabilityCapacityDimension]().calculate(
+            items, TotalCapacity(capacities), OptimizationFacade.default_loss_function
+        )
+        linear = DpOptimization[CapabilityCapacityDimension](LinearCapacityIndex).calculate(
+            items, TotalCapacity(capacities), OptimizationFacade.default_loss_function
+        )
+
+        assert memoized.profit == linear.profit
+        assert memoized.chosen_items == linear.chosen_items
+        assert memoized.item_to_capacities == linear.item_to_capacities
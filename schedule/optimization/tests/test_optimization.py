@@ -79,3 +79,19 @@ class TestOptimization:
         assert result.item_to_capacities[item3] == {c1} or {c2}
         assert result.item_to_capacities[item2] == {c1} or {c2}
         assert item1 not in result.item_to_capacities
+
+    def test_chosen_items_follow_sort_order_with_zero_weight_items_last(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        item1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item2 = Item("Item2", 500, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        item3 = Item("Item3", 50, TotalWeight.zero())
+        item4 = Item("Item4", 300, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+        c1 = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+        c2 = CapabilityCapacityDimension("zbyniu", "JAVA", "Skill")
+        c3 = CapabilityCapacityDimension("kasia", "JAVA", "Skill")
+
+        result = optimization_facade.calculate([item1, item2, item3, item4], TotalCapacity.of(c1, c2, c3))
+
+        assert result.profit == 950
+        assert result.chosen_items == [item2, item4, item1, item3]
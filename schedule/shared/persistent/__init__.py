@@ -0,0 +1,3 @@
+from .persistent_sorted_map import PersistentSortedMap
+
+__all__ = ["PersistentSortedMap"]
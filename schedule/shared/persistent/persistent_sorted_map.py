@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast, overload
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from schedule.shared.typing_extensions import Comparable
+
+
+class _Node:
+    __slots__ = ("key", "left", "priority", "right", "size", "value")
+
+    def __init__(self, key: Any, value: Any, priority: int, left: _Node | None, right: _Node | None) -> None:  # noqa: ANN401
+        self.key: Any = key
+        self.value: Any = value
+        self.priority: int = priority
+        self.left: _Node | None = left
+        self.right: _Node | None = right
+        self.size: int = 1 + _size(left) + _size(right)
+
+    def with_children(self, left: _Node | None, right: _Node | None) -> _Node:
+        if left is self.left and right is self.right:
+            return self
+        return _Node(self.key, self.value, self.priority, left, right)
+
+    def outranks(self, other: _Node) -> bool:
+        return (self.priority, self.key) > (other.priority, other.key)
+
+
+def _size(node: _Node | None) -> int:
+    return 0 if node is None else node.size
+
+
+def _priority(key: object) -> int:
+    # hashing a tuple mixes the bits, plain hashes of ints would rank keys in their order
+    return hash((key,))
+
+
+class PersistentSortedMap[K: Comparable, V]:
+    """Immutable map ordered by key, with expected O(log n) lookups and updates.
+
+    Updates return a new map sharing all untouched nodes with the old one. Nodes form a treap
+    prioritized by key hashes, so maps with the same keys have the same shape and are compared node by node,
+    skipping subtrees they share.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, items: Iterable[tuple[K, V]] = ()) -> None:
+        self._root: _Node | None = None
+        for key, value in items:
+            self._root = self._insert(self._root, _Node(key, value, _priority(key), None, None))
+
+    @classmethod
+    def _of(cls, root: _Node | None) -> PersistentSortedMap[K, V]:
+        instance = cls.__new__(cls)
+        instance._root = root  # noqa: SLF001
+        return instance
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __contains__(self, key: K) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[K]:
+        return (key for key, _ in self.items())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PersistentSortedMap):
+            return NotImplemented
+        other_map = cast("PersistentSortedMap[K, V]", other)
+        return len(self) == len(other_map) and self._same(self._root, other_map._root)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.items())!r})"
+
+    @overload
+    def get(self, key: K) -> V | None: ...
+
+    @overload
+    def get(self, key: K, default: V) -> V: ...
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        node = self._find(key)
+        return default if node is None else cast("V", node.value)
+
+    def set(self, key: K, value: V) -> PersistentSortedMap[K, V]:
+        node = self._find(key)
+        if node is not None and node.value is value:
+            return self
+        return self._of(self._insert(self._root, _Node(key, value, _priority(key), None, None)))
+
+    def remove(self, key: K) -> PersistentSortedMap[K, V]:
+        root = self._remove(self._root, key)
+        return self if root is self._root else self._of(root)
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        stack: list[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.value
+            node = node.right
+
+    def values(self) -> Iterator[V]:
+        return (value for _, value in self.items())
+
+    def _find(self, key: K) -> _Node | None:
+        node = self._root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
+
+    @classmethod
+    def _insert(cls, node: _Node | None, new: _Node) -> _Node:
+        if node is None:
+            return new
+        if new.key == node.key:
+            return _Node(node.key, new.value, node.priority, node.left, node.right)
+        if new.outranks(node):
+            # keys are unique, so the new key is not below a node it outranks
+            left, right = cls._split(node, new.key)
+            return new.with_children(left, right)
+        if new.key < node.key:
+            return node.with_children(cls._insert(node.left, new), node.right)
+        return node.with_children(node.left, cls._insert(node.right, new))
+
+    @classmethod
+    def _split(cls, node: _Node | None, key: K) -> tuple[_Node | None, _Node | None]:
+        if node is None:
+            return None, None
+        if node.key < key:
+            left, right = cls._split(node.right, key)
+            return node.with_children(node.left, left), right
+        left, right = cls._split(node.left, key)
+        return left, node.with_children(right, node.right)
+
+    @classmethod
+    def _remove(cls, node: _Node | None, key: K) -> _Node | None:
+        if node is None:
+            return None
+        if key == node.key:
+            return cls._merge(node.left, node.right)
+        if key < node.key:
+            return node.with_children(cls._remove(node.left, key), node.right)
+        return node.with_children(node.left, cls._remove(node.right, key))
+
+    @classmethod
+    def _merge(cls, left: _Node | None, right: _Node | None) -> _Node | None:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.outranks(right):
+            return left.with_children(left.left, cls._merge(left.right, right))
+        return right.with_children(cls._merge(left, right.left), right.right)
+
+    @classmethod
+    def _same(cls, node: _Node | None, other: _Node | None) -> bool:
+        if node is other:
+            return True
+        if node is None or other is None:
+            return False
+        return (
+            node.key == other.key
+            and node.value == other.value
+            and cls._same(node.left, other.left)
+            and cls._same(node.right, other.right)
+        )
@@ -0,0 +1,57 @@
+import random
+
+from ..persistent_sorted_map import PersistentSortedMap
+
+
+class TestPersistentSortedMap:
+    def test_keeps_items_ordered_by_key(self) -> None:
+        sorted_map = PersistentSortedMap([(3, "c"), (1, "a"), (2, "b")])
+
+        assert list(sorted_map.items()) == [(1, "a"), (2, "b"), (3, "c")]
+        assert list(sorted_map) == [1, 2, 3]
+        assert len(sorted_map) == 3
+
+    def test_updates_leave_previous_version_untouched(self) -> None:
+        original = PersistentSortedMap([(1, "a"), (2, "b")])
+
+        updated = original.set(3, "c").set(1, "z").remove(2)
+
+        assert list(original.items()) == [(1, "a"), (2, "b")]
+        assert list(updated.items()) == [(1, "z"), (3, "c")]
+
+    def test_finds_values_by_key(self) -> None:
+        sorted_map = PersistentSortedMap([(1, "a"), (2, "b")])
+
+        assert sorted_map.get(2) == "b"
+        assert sorted_map.get(5) is None
+        assert sorted_map.get(5, "default") == "default"
+        assert 1 in sorted_map
+        assert 5 not in sorted_map
+
+    def test_returns_same_map_when_nothing_changes(self) -> None:
+        value = object()
+        sorted_map = PersistentSortedMap([(1, value)])
+
+        assert sorted_map.remove(2) is sorted_map
+        assert sorted_map.set(1, value) is sorted_map
+
+    def test_maps_with_same_items_are_equal_regardless_of_history(self) -> None:
+        keys = list(range(200))
+        random.Random(7).shuffle(keys)
+        built_at_once = PersistentSortedMap((key, str(key)) for key in range(100))
+        built_step_by_step = PersistentSortedMap[int, str]()
+        for key in keys:
+            built_step_by_step = built_step_by_step.set(key, str(key))
+        for key in keys[::-1]:
+            if key >= 100:
+                built_step_by_step = built_step_by_step.remove(key)
+
+        assert built_step_by_step == built_at_once
+        assert built_step_by_step != built_at_once.set(0, "changed")
+        assert built_step_by_step != built_at_once.remove(0)
+
+    def test_stays_shallow_for_keys_added_in_order(self) -> None:
+        sorted_map = PersistentSortedMap((key, key) for key in range(10_000))
+
+        assert list(sorted_map) == list(range(10_000))
+        assert sorted_map.get(9_999) == 9_999
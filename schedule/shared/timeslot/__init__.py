@@ -1,3 +1,6 @@
+from .default_time_slot_array import default_time_slot_array
+from .interval_index import IntervalIndex
 from .time_slot import TimeSlot
+from .time_slot_array import TimeSlotArray
 
-__all__ = ["TimeSlot"]
+__all__ = ["IntervalIndex", "TimeSlot", "TimeSlotArray", "default_time_slot_array"]
@@ -0,0 +1,16 @@
+from collections.abc import Iterable
+from importlib.util import find_spec
+
+from .python_time_slot_array import PythonTimeSlotArray
+from .time_slot import TimeSlot
+from .time_slot_array import TimeSlotArray
+
+NUMPY_AVAILABLE = find_spec("numpy") is not None
+
+
+def default_time_slot_array(slots: Iterable[TimeSlot]) -> TimeSlotArray:
+    if NUMPY_AVAILABLE:
+        from .numpy_time_slot_array import NumpyTimeSlotArray  # noqa: PLC0415
+
+        return NumpyTimeSlotArray.of(slots)
+    return PythonTimeSlotArray.of(slots)
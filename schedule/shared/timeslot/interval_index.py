@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+    from .time_slot import TimeSlot
+
+
+class IntervalIndex[V]:
+    """Time slots sorted by start with a max-end segment tree on top, answering queries in insertion order."""
+
+    def __init__(self, entries: Iterable[tuple[TimeSlot, V]]) -> None:
+        entries = list(entries)
+        order = sorted(range(len(entries)), key=lambda position: entries[position][0].from_)
+        self._positions: list[int] = order
+        self._values: list[V] = [entries[position][1] for position in order]
+        self._starts: list[datetime] = [entries[position][0].from_ for position in order]
+        self._size: int = 1
+        while self._size < len(order):
+            self._size *= 2
+        self._max_ends: list[datetime | None] = [None] * (2 * self._size)
+        for leaf, position in enumerate(order):
+            self._max_ends[self._size + leaf] = entries[position][0].to
+        for node in range(self._size - 1, 0, -1):
+            left, right = self._max_ends[2 * node], self._max_ends[2 * node + 1]
+            self._max_ends[node] = left if right is None or (left is not None and left >= right) else right
+
+    def containing(self, slot: TimeSlot) -> list[V]:
+        return self._matching(bisect_right(self._starts, slot.from_), slot.to)
+
+    def overlapping(self, slot: TimeSlot) -> list[V]:
+        return self._matching(bisect_right(self._starts, slot.to), slot.from_)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _matching(self, starting_before: int, ending_not_before: datetime) -> list[V]:
+        leaves: list[int] = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, low, high = stack.pop()
+            max_end = self._max_ends[node]
+            if low >= starting_before or max_end is None or max_end < ending_not_before:
+                continue
+            if high - low == 1:
+                leaves.append(low)
+            else:
+                middle = (low + high) // 2
+                stack.extend(((2 * node, low, middle), (2 * node + 1, middle, high)))
+        leaves.sort(key=lambda leaf: self._positions[leaf])
+        return [self._values[leaf] for leaf in leaves]
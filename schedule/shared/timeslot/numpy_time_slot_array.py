@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import override
+
+import numpy as np
+import numpy.typing as npt
+
+from .time_slot import TimeSlot
+from .time_slot_array import Mask, from_microseconds, to_microseconds
+
+
+class NumpyTimeSlotArray:
+    """Stores slots in two int64 ndarrays, comparing them with a given slot as whole-array operations."""
+
+    def __init__(self, starts: npt.NDArray[np.int64], ends: npt.NDArray[np.int64]) -> None:
+        self._starts: npt.NDArray[np.int64] = starts
+        self._ends: npt.NDArray[np.int64] = ends
+
+    @classmethod
+    def of(cls, slots: Iterable[TimeSlot]) -> NumpyTimeSlotArray:
+        bounds = [(to_microseconds(slot.from_), to_microseconds(slot.to)) for slot in slots]
+        columns = np.array(bounds, dtype=np.int64).reshape(-1, 2)
+        return cls(columns[:, 0].copy(), columns[:, 1].copy())
+
+    def __getitem__(self, index: int) -> TimeSlot:
+        return TimeSlot(from_microseconds(int(self._starts[index])), from_microseconds(int(self._ends[index])))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[TimeSlot]:
+        for start, end in zip(self._starts.tolist(), self._ends.tolist(), strict=True):
+            yield TimeSlot(from_microseconds(start), from_microseconds(end))
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NumpyTimeSlotArray):
+            return NotImplemented
+        return np.array_equal(self._starts, other._starts) and np.array_equal(self._ends, other._ends)
+
+    @override
+    def __hash__(self) -> int:
+        return hash((self._starts.tobytes(), self._ends.tobytes()))
+
+    def within(self, other: TimeSlot) -> npt.NDArray[np.bool_]:
+        return (self._starts >= to_microseconds(other.from_)) & (self._ends <= to_microseconds(other.to))
+
+    def containing(self, other: TimeSlot) -> npt.NDArray[np.bool_]:
+        return (self._starts <= to_microseconds(other.from_)) & (self._ends >= to_microseconds(other.to))
+
+    def overlaps(self, other: TimeSlot) -> npt.NDArray[np.bool_]:
+        return (self._starts <= to_microseconds(other.to)) & (self._ends >= to_microseconds(other.from_))
+
+    def positions(self, mask: Mask) -> list[int]:
+        return np.flatnonzero(mask).tolist()
+
+    def common_part_with(self, other: TimeSlot) -> NumpyTimeSlotArray:
+        overlapping = self.overlaps(other)
+        starts = np.where(overlapping, np.maximum(self._starts, to_microseconds(other.from_)), self._starts)
+        ends = np.where(overlapping, np.minimum(self._ends, to_microseconds(other.to)), self._starts)
+        return NumpyTimeSlotArray(starts, ends)
+
+    def merged(self) -> NumpyTimeSlotArray:
+        """Return slots sorted by start with overlapping or touching ones joined."""
+        order = np.lexsort((self._ends, self._starts))
+        starts, ends = self._starts[order], self._ends[order]
+        reach = np.maximum.accumulate(ends)
+        # a slot starts a new merged one unless it begins before a slot ahead of it ends
+        first = np.ones(len(starts), dtype=np.bool_)
+        first[1:] = starts[1:] > reach[:-1]
+        return NumpyTimeSlotArray(starts[first], reach[np.roll(first, -1)])
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import override
+
+from .time_slot import TimeSlot
+from .time_slot_array import Mask, from_microseconds, to_microseconds
+
+
+class PythonTimeSlotArray:
+    """Stores slots in two array("q") columns, creating TimeSlot objects only on access."""
+
+    def __init__(self, starts: array[int], ends: array[int]) -> None:
+        self._starts: array[int] = starts
+        self._ends: array[int] = ends
+
+    @classmethod
+    def of(cls, slots: Iterable[TimeSlot]) -> PythonTimeSlotArray:
+        starts: array[int] = array("q")
+        ends: array[int] = array("q")
+        for slot in slots:
+            starts.append(to_microseconds(slot.from_))
+            ends.append(to_microseconds(slot.to))
+        return cls(starts, ends)
+
+    def __getitem__(self, index: int) -> TimeSlot:
+        return TimeSlot(from_microseconds(self._starts[index]), from_microseconds(self._ends[index]))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[TimeSlot]:
+        for start, end in zip(self._starts, self._ends, strict=True):
+            yield TimeSlot(from_microseconds(start), from_microseconds(end))
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PythonTimeSlotArray):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    @override
+    def __hash__(self) -> int:
+        return hash((self._starts.tobytes(), self._ends.tobytes()))
+
+    def within(self, other: TimeSlot) -> list[bool]:
+        other_start, other_end = to_microseconds(other.from_), to_microseconds(other.to)
+        return [start >= other_start and end <= other_end for start, end in zip(self._starts, self._ends, strict=True)]
+
+    def containing(self, other: TimeSlot) -> list[bool]:
+        other_start, other_end = to_microseconds(other.from_), to_microseconds(other.to)
+        return [start <= other_start and end >= other_end for start, end in zip(self._starts, self._ends, strict=True)]
+
+    def overlaps(self, other: TimeSlot) -> list[bool]:
+        other_start, other_end = to_microseconds(other.from_), to_microseconds(other.to)
+        return [start <= other_end and end >= other_start for start, end in zip(self._starts, self._ends, strict=True)]
+
+    def positions(self, mask: Mask) -> list[int]:
+        return [position for position, selected in enumerate(mask) if selected]
+
+    def common_part_with(self, other: TimeSlot) -> PythonTimeSlotArray:
+        other_start, other_end = to_microseconds(other.from_), to_microseconds(other.to)
+        starts: array[int] = array("q")
+        ends: array[int] = array("q")
+        for start, end in zip(self._starts, self._ends, strict=True):
+            if start <= other_end and end >= other_start:
+                starts.append(max(start, other_start))
+                ends.append(min(end, other_end))
+            else:
+                starts.append(start)
+                ends.append(start)
+        return PythonTimeSlotArray(starts, ends)
+
+    def merged(self) -> PythonTimeSlotArray:
+        """Return slots sorted by start with overlapping or touching ones joined."""
+        starts: array[int] = array("q")
+        ends: array[int] = array("q")
+        for start, end in sorted(zip(self._starts, self._ends, strict=True)):
+            if starts and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return PythonTimeSlotArray(starts, ends)
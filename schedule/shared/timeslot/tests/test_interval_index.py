@@ -0,0 +1,48 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from ..interval_index import IntervalIndex
+from ..time_slot import TimeSlot
+
+
+def slot(from_hour: int, to_hour: int) -> TimeSlot:
+    start = datetime(2023, 1, 1, tzinfo=UTC)
+    return TimeSlot(start + timedelta(hours=from_hour), start + timedelta(hours=to_hour))
+
+
+class TestIntervalIndex:
+    def test_finds_slots_containing_given_slot(self) -> None:
+        index = IntervalIndex([(slot(0, 10), "a"), (slot(2, 4), "b"), (slot(3, 12), "c"), (slot(5, 6), "d")])
+
+        assert index.containing(slot(3, 4)) == ["a", "b", "c"]
+        assert index.containing(slot(4, 11)) == ["c"]
+        assert index.containing(slot(11, 13)) == []
+
+    def test_finds_slots_overlapping_given_slot(self) -> None:
+        index = IntervalIndex([(slot(0, 2), "a"), (slot(4, 6), "b"), (slot(8, 10), "c")])
+
+        assert index.overlapping(slot(2, 4)) == ["a", "b"]
+        assert index.overlapping(slot(6, 7)) == ["b"]
+        assert index.overlapping(slot(11, 12)) == []
+
+    def test_empty_index_finds_nothing(self) -> None:
+        index = IntervalIndex[str]([])
+
+        assert len(index) == 0
+        assert index.containing(slot(0, 1)) == []
+        assert index.overlapping(slot(0, 1)) == []
+
+    def test_gives_same_results_as_checking_every_slot(self) -> None:
+        rng = random.Random(5)
+        slots = [slot(start, start + rng.randint(0, 20)) for start in (rng.randint(0, 100) for _ in range(200))]
+        index = IntervalIndex((time_slot, position) for position, time_slot in enumerate(slots))
+
+        for _ in range(100):
+            start = rng.randint(-5, 120)
+            query = slot(start, start + rng.randint(0, 10))
+            assert index.containing(query) == [
+                position for position, time_slot in enumerate(slots) if query.within(time_slot)
+            ]
+            assert index.overlapping(query) == [
+                position for position, time_slot in enumerate(slots) if query.overlaps(time_slot)
+            ]
@@ -0,0 +1,89 @@
+import random
+import sys
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from ..default_time_slot_array import NUMPY_AVAILABLE, default_time_slot_array
+from ..python_time_slot_array import PythonTimeSlotArray
+from ..time_slot import TimeSlot
+from ..time_slot_array import TimeSlotArray
+
+
+def slot(from_hour: int, to_hour: int) -> TimeSlot:
+    start = datetime(2023, 1, 1, tzinfo=UTC)
+    return TimeSlot(start + timedelta(hours=from_hour), start + timedelta(hours=to_hour))
+
+
+def numpy_time_slot_array(slots: Iterable[TimeSlot]) -> TimeSlotArray:
+    _ = pytest.importorskip("numpy")
+    from ..numpy_time_slot_array import NumpyTimeSlotArray  # noqa: PLC0415
+
+    return NumpyTimeSlotArray.of(slots)
+
+
+@pytest.fixture(params=[PythonTimeSlotArray.of, numpy_time_slot_array], ids=["python", "numpy"])
+def time_slot_array(request: pytest.FixtureRequest) -> Callable[[Iterable[TimeSlot]], TimeSlotArray]:
+    return request.param  # type: ignore[no-any-return]
+
+
+class TestTimeSlotArrays:
+    def test_materializes_same_slots_as_stored(
+        self, time_slot_array: Callable[[Iterable[TimeSlot]], TimeSlotArray]
+    ) -> None:
+        slots = [slot(0, 1), slot(5, 8), TimeSlot.empty()]
+
+        time_slots = time_slot_array(slots)
+
+        assert len(time_slots) == 3
+        assert list(time_slots) == slots
+        assert time_slots[1] == slot(5, 8)
+
+    def test_checks_every_slot_against_given_one(
+        self, time_slot_array: Callable[[Iterable[TimeSlot]], TimeSlotArray]
+    ) -> None:
+        slots = [slot(0, 2), slot(3, 4), slot(4, 9), slot(10, 12), slot(1, 10)]
+        time_slots = time_slot_array(slots)
+        other = slot(2, 9)
+
+        assert list(time_slots.within(other)) == [time_slot.within(other) for time_slot in slots]
+        assert list(time_slots.containing(slot(3, 4))) == [slot(3, 4).within(time_slot) for time_slot in slots]
+        assert list(time_slots.overlaps(other)) == [time_slot.overlaps(other) for time_slot in slots]
+        assert list(time_slots.common_part_with(other)) == [time_slot.common_part_with(other) for time_slot in slots]
+        assert time_slots.positions(time_slots.within(other)) == [1, 2]
+
+    def test_merges_overlapping_and_touching_slots(
+        self, time_slot_array: Callable[[Iterable[TimeSlot]], TimeSlotArray]
+    ) -> None:
+        time_slots = time_slot_array([slot(5, 7), slot(0, 2), slot(2, 3), slot(6, 9), slot(11, 12), slot(5, 6)])
+
+        assert list(time_slots.merged()) == [slot(0, 3), slot(5, 9), slot(11, 12)]
+        assert list(time_slot_array([]).merged()) == []
+
+    def test_backends_give_identical_results(self) -> None:
+        rng = random.Random(5)
+        slots = [slot(start, start + rng.randint(0, 5)) for start in (rng.randint(0, 100) for _ in range(200))]
+        other = slot(30, 60)
+        python, numpy = PythonTimeSlotArray.of(slots), numpy_time_slot_array(slots)
+
+        assert list(numpy.containing(other)) == python.containing(other)
+        assert list(numpy.overlaps(other)) == python.overlaps(other)
+        assert list(numpy.common_part_with(other)) == list(python.common_part_with(other))
+        assert list(numpy.merged()) == list(python.merged())
+
+    def test_default_array_is_vectorized_when_numpy_is_installed(self) -> None:
+        time_slots = default_time_slot_array([slot(0, 1)])
+
+        assert isinstance(time_slots, PythonTimeSlotArray) is not NUMPY_AVAILABLE
+
+    def test_takes_far_less_memory_than_time_slot_objects(self) -> None:
+        slots = [slot(hour, hour + 1) for hour in range(10_000)]
+
+        objects_size = sum(
+            sys.getsizeof(time_slot) + sys.getsizeof(time_slot.__dict__) + 2 * sys.getsizeof(time_slot.from_)
+            for time_slot in slots
+        )
+        columnar_size = sys.getsizeof(PythonTimeSlotArray.of(slots)._starts) * 2  # noqa: SLF001
+
+        assert columnar_size * 10 < objects_size
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Protocol
+
+from .time_slot import TimeSlot
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+type Mask = Sequence[bool] | npt.NDArray[np.bool_]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_microseconds(moment: datetime) -> int:
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_microseconds(microseconds: int) -> datetime:
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+class TimeSlotArray(Protocol):
+    """Slots stored as two int64 columns of UTC epoch microseconds, compared with a given slot all at once."""
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[TimeSlot]: ...
+
+    def __getitem__(self, index: int) -> TimeSlot: ...
+
+    def within(self, other: TimeSlot) -> Mask: ...
+
+    def containing(self, other: TimeSlot) -> Mask: ...
+
+    def overlaps(self, other: TimeSlot) -> Mask: ...
+
+    def positions(self, mask: Mask) -> list[int]: ...
+
+    def common_part_with(self, other: TimeSlot) -> TimeSlotArray: ...
+
+    def merged(self) -> TimeSlotArray: ...
@@ -2,6 +2,7 @@ from .available_resource_capability import AvailableResourceCapability
 from .demand import Demand
 from .demands import Demands
 from .project_id import ProjectId
+from .project_value_cache import ProjectValueCache
 from .simulated_capabilities import SimulatedCapabilities
 from .simulated_project import SimulatedProject
 from .simulation_facade import SimulationFacade
@@ -11,6 +12,7 @@ __all__ = [
     "Demand",
     "Demands",
     "ProjectId",
+    "ProjectValueCache",
     "SimulatedCapabilities",
     "SimulatedProject",
     "SimulationFacade",
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import attrs as a
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+    from .additional_priced_capability import AdditionalPricedCapability
+
+
+@a.define(frozen=True)
+class CapabilityProfitDelta:
+    capability: AdditionalPricedCapability
+    profit_delta: Decimal
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, ClassVar
+
+from schedule.shared.utcnow import utcnow
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+    from .simulated_project import SimulatedProject
+
+
+class ProjectValueCache:
+    """Evaluates each project's value function once, keeping the result for good or, when built with_ttl, for ttl.
+
+    Values are keyed by the project id together with its value function, so the same project simulated with
+    other earnings is evaluated anew. Values are kept in the order they were evaluated, so expired ones are
+    dropped from the front, and the oldest ones make room once there are more than max_projects.
+    """
+
+    DEFAULT_TTL: ClassVar[timedelta] = timedelta(minutes=5)
+    DEFAULT_MAX_PROJECTS: ClassVar[int] = 10_000
+
+    def __init__(self) -> None:
+        self._ttl: timedelta | None = None
+        self._max_projects: int = self.DEFAULT_MAX_PROJECTS
+        self._values: OrderedDict[SimulatedProject, tuple[Decimal, datetime]] = OrderedDict()
+
+    @classmethod
+    def with_ttl(cls, ttl: timedelta, max_projects: int = DEFAULT_MAX_PROJECTS) -> ProjectValueCache:
+        """Build a cache shared across simulations, evaluating values again after ttl; a ttl <= 0 caches nothing."""
+        cache = cls()
+        cache._ttl = ttl
+        cache._max_projects = max_projects
+        return cache
+
+    def value_of(self, project: SimulatedProject) -> Decimal:
+        if self._ttl is not None and self._ttl <= timedelta(0):
+            return project.value
+        now = utcnow()
+        self._evict_expired(now)
+        cached = self._values.get(project)
+        if cached is not None:
+            return cached[0]
+        value = project.value
+        self._values[project] = (value, now)
+        while len(self._values) > self._max_projects:
+            _ = self._values.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _evict_expired(self, now: datetime) -> None:
+        if self._ttl is None:
+            return
+        while self._values:
+            _, evaluated_at = next(iter(self._values.values()))
+            if now - evaluated_at < self._ttl:
+                return
+            _ = self._values.popitem(last=False)
@@ -1,18 +1,33 @@
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
+from itertools import repeat
+from typing import Self
 
 from schedule.optimization import Item, OptimizationFacade, TotalCapacity, TotalWeight
 
 from .additional_priced_capability import AdditionalPricedCapability
 from .available_resource_capability import AvailableResourceCapability
+from .capability_profit_delta import CapabilityProfitDelta
+from .project_value_cache import ProjectValueCache
 from .result import SimulationResult
 from .simulated_capabilities import SimulatedCapabilities
 from .simulated_project import SimulatedProject
+from .timed_calculation import calculate_timed
+from .timed_simulation_result import TimedSimulationResult
 
 
 class SimulationFacade:
     def __init__(self, optimization_facade: OptimizationFacade) -> None:
         self._optimization_facade: OptimizationFacade = optimization_facade
+        self._project_value_cache: ProjectValueCache | None = None
+
+    @classmethod
+    def with_value_cache(cls, optimization_facade: OptimizationFacade, project_value_cache: ProjectValueCache) -> Self:
+        """Build a facade reading project values through project_value_cache across calls, not a fresh one per call."""
+        facade = cls(optimization_facade)
+        facade._project_value_cache = project_value_cache
+        return facade
 
     def what_is_the_optimal_setup(
         self,
@@ -20,40 +35,117 @@ class SimulationFacade:
         total_capability: SimulatedCapabilities,
     ) -> SimulationResult:
         result = self._optimization_facade.calculate(
-            items=self._to_items(projects_simulations),
+            items=self._to_items(projects_simulations, self._value_cache()),
             total_capacity=self._to_capacity(total_capability),
             sort_key_getter=lambda x: -x.value,
         )
         return SimulationResult.from_optimization(optimization_result=result, simulated_projects=projects_simulations)
 
+    def what_are_the_best_setups(
+        self,
+        projects_simulations: Iterable[SimulatedProject],
+        total_capability: SimulatedCapabilities,
+        k: int,
+    ) -> list[SimulationResult]:
+        """Return up to k best distinct setups from a single calculation, the optimal one first."""
+        projects_simulations = list(projects_simulations)
+        results = self._optimization_facade.calculate_k_best(
+            items=self._to_items(projects_simulations, self._value_cache()),
+            total_capacity=self._to_capacity(total_capability),
+            k=k,
+            sort_key_getter=lambda x: -x.value,
+        )
+        return [
+            SimulationResult.from_optimization(optimization_result=result, simulated_projects=projects_simulations)
+            for result in results
+        ]
+
+    def what_is_the_optimal_setup_for_each(
+        self,
+        scenarios: Iterable[tuple[Iterable[SimulatedProject], SimulatedCapabilities]],
+        max_workers: int | None = None,
+    ) -> list[TimedSimulationResult]:
+        """Calculate independent scenarios in parallel processes, returning results in input order.
+
+        Project values are evaluated here, so only plain items and capacities are sent to the workers.
+        """
+        scenarios = [(list(projects), capabilities) for projects, capabilities in scenarios]
+        value_cache = self._value_cache()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            timed_results = list(
+                executor.map(
+                    calculate_timed,
+                    repeat(self._optimization_facade),
+                    [self._to_items(projects, value_cache) for projects, _ in scenarios],
+                    [self._to_capacity(capabilities) for _, capabilities in scenarios],
+                )
+            )
+        return [
+            TimedSimulationResult(
+                SimulationResult.from_optimization(optimization_result=result, simulated_projects=projects), duration
+            )
+            for (projects, _), (result, duration) in zip(scenarios, timed_results, strict=True)
+        ]
+
     def profit_after_buying_new_capability(
         self,
         projects_simulations: Iterable[SimulatedProject],
         capabilities_without_new_one: SimulatedCapabilities,
         new_priced_capability: AdditionalPricedCapability,
     ) -> Decimal:
+        items = self._to_items(projects_simulations, self._value_cache())
         result_without_capability = self._optimization_facade.calculate(
-            self._to_items(projects_simulations), self._to_capacity(capabilities_without_new_one)
+            items, self._to_capacity(capabilities_without_new_one)
         )
 
         capabilities_with_new_resource = capabilities_without_new_one.add(
             new_priced_capability.available_resource_capability
         )
         result_with_capability = self._optimization_facade.calculate(
-            self._to_items(projects_simulations), self._to_capacity(capabilities_with_new_resource)
+            items, self._to_capacity(capabilities_with_new_resource)
         )
 
         return (result_with_capability.profit - new_priced_capability.value) - result_without_capability.profit
 
+    def rank_capabilities_to_buy(
+        self,
+        projects_simulations: Iterable[SimulatedProject],
+        capabilities_without_new_ones: SimulatedCapabilities,
+        new_priced_capabilities: Iterable[AdditionalPricedCapability],
+    ) -> list[CapabilityProfitDelta]:
+        new_priced_capabilities = list(new_priced_capabilities)
+        result_without_capabilities, results_with_each_capability = (
+            self._optimization_facade.calculate_with_each_additional_capacity(
+                self._to_items(projects_simulations, self._value_cache()),
+                self._to_capacity(capabilities_without_new_ones),
+                [capability.available_resource_capability for capability in new_priced_capabilities],
+            )
+        )
+        profit_deltas = [
+            CapabilityProfitDelta(
+                new_priced_capability,
+                (result_with_capability.profit - new_priced_capability.value) - result_without_capabilities.profit,
+            )
+            for new_priced_capability, result_with_capability in zip(
+                new_priced_capabilities, results_with_each_capability, strict=True
+            )
+        ]
+        return sorted(profit_deltas, key=lambda x: x.profit_delta, reverse=True)
+
     def _to_capacity(self, total_capability: SimulatedCapabilities) -> TotalCapacity[AvailableResourceCapability]:
         return TotalCapacity(total_capability.capabilities)
 
-    def _to_item(self, project: SimulatedProject) -> Item[AvailableResourceCapability]:
+    def _value_cache(self) -> ProjectValueCache:
+        return self._project_value_cache if self._project_value_cache is not None else ProjectValueCache()
+
+    def _to_item(self, project: SimulatedProject, value_cache: ProjectValueCache) -> Item[AvailableResourceCapability]:
         return Item(
             project.project_id,
-            float(project.value),
+            float(value_cache.value_of(project)),
             TotalWeight[AvailableResourceCapability].of(*project.missing_demands.all),
         )
 
-    def _to_items(self, projects_simulations: Iterable[SimulatedProject]) -> list[Item[AvailableResourceCapability]]:
-        return [self._to_item(project) for project in projects_simulations]
+    def _to_items(
+        self, projects_simulations: Iterable[SimulatedProject], value_cache: ProjectValueCache
+    ) -> list[Item[AvailableResourceCapability]]:
+        return [self._to_item(project, value_cache) for project in projects_simulations]
@@ -0,0 +1,134 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import time_machine
+
+from schedule import container as container_module
+from schedule.shared.capability import Capability
+from schedule.shared.timeslot import TimeSlot
+
+from ..available_resource_capability import AvailableResourceCapability
+from ..demand import Demand
+from ..demands import Demands
+from ..project_id import ProjectId
+from ..project_value_cache import ProjectValueCache
+from ..simulated_capabilities import SimulatedCapabilities
+from ..simulated_project import SimulatedProject
+from ..simulation_facade import SimulationFacade
+from .available_capabilities_factory import FakeCapabilityPerformer
+
+
+class CountingValueFunction:
+    def __init__(self, value: Decimal) -> None:
+        self.value = value
+        self.calls = 0
+
+    def __call__(self) -> Decimal:
+        self.calls += 1
+        return self.value
+
+
+class TestProjectValueCache:
+    def test_evaluates_value_function_once(self) -> None:
+        value_function = CountingValueFunction(Decimal(10))
+        project = SimulatedProject(ProjectId.new(), value_function, Demands.of([]))
+        cache = ProjectValueCache()
+
+        assert cache.value_of(project) == Decimal(10)
+        assert cache.value_of(project) == Decimal(10)
+        assert value_function.calls == 1
+
+    def test_evaluates_value_function_again_after_ttl(self) -> None:
+        value_function = CountingValueFunction(Decimal(10))
+        project = SimulatedProject(ProjectId.new(), value_function, Demands.of([]))
+        cache = ProjectValueCache.with_ttl(timedelta(minutes=5))
+        now = datetime(2021, 1, 1, tzinfo=UTC)
+
+        with time_machine.travel(now, tick=False):
+            cache.value_of(project)
+        value_function.value = Decimal(20)
+        with time_machine.travel(now + timedelta(minutes=4), tick=False):
+            assert cache.value_of(project) == Decimal(10)
+        with time_machine.travel(now + timedelta(minutes=5), tick=False):
+            assert cache.value_of(project) == Decimal(20)
+
+        assert value_function.calls == 2
+
+    def test_does_not_cache_with_ttl_not_above_zero(self) -> None:
+        value_function = CountingValueFunction(Decimal(10))
+        project = SimulatedProject(ProjectId.new(), value_function, Demands.of([]))
+        cache = ProjectValueCache.with_ttl(timedelta(0))
+
+        cache.value_of(project)
+        cache.value_of(project)
+
+        assert value_function.calls == 2
+        assert len(cache) == 0
+
+    def test_evicts_expired_values(self) -> None:
+        cache = ProjectValueCache.with_ttl(timedelta(minutes=5))
+        now = datetime(2021, 1, 1, tzinfo=UTC)
+
+        with time_machine.travel(now, tick=False):
+            cache.value_of(SimulatedProject(ProjectId.new(), CountingValueFunction(Decimal(10)), Demands.of([])))
+        with time_machine.travel(now + timedelta(minutes=5), tick=False):
+            cache.value_of(SimulatedProject(ProjectId.new(), CountingValueFunction(Decimal(20)), Demands.of([])))
+
+        assert len(cache) == 1
+
+    def test_evicts_oldest_values_above_max_projects(self) -> None:
+        cache = ProjectValueCache.with_ttl(timedelta(minutes=5), max_projects=2)
+        first_value_function = CountingValueFunction(Decimal(10))
+        first = SimulatedProject(ProjectId.new(), first_value_function, Demands.of([]))
+
+        cache.value_of(first)
+        for _ in range(2):
+            cache.value_of(SimulatedProject(ProjectId.new(), CountingValueFunction(Decimal(20)), Demands.of([])))
+        cache.value_of(first)
+
+        assert len(cache) == 2
+        assert first_value_function.calls == 2
+
+    def test_evaluates_same_project_again_with_other_value_function(self) -> None:
+        project_id = ProjectId.new()
+        cache = ProjectValueCache.with_ttl(timedelta(minutes=5))
+
+        first = cache.value_of(SimulatedProject(project_id, CountingValueFunction(Decimal(100)), Demands.of([])))
+        second = cache.value_of(SimulatedProject(project_id, CountingValueFunction(Decimal(500)), Demands.of([])))
+
+        assert (first, second) == (Decimal(100), Decimal(500))
+
+    def test_facades_built_by_container_do_not_share_cached_values(self) -> None:
+        container = container_module.build()
+        project_id = ProjectId.new()
+        capability = AvailableResourceCapability(
+            uuid4(), FakeCapabilityPerformer(Capability.skill("JAVA")), TimeSlot.empty()
+        )
+        demands = Demands.of([Demand.demand_for(Capability.skill("JAVA"), TimeSlot.empty())])
+
+        profits = [
+            container.resolve(SimulationFacade)
+            .what_is_the_optimal_setup(
+                [SimulatedProject(project_id, lambda value=value: value, demands)], SimulatedCapabilities([capability])
+            )
+            .profit
+            for value in (Decimal(100), Decimal(500))
+        ]
+
+        assert profits == [Decimal(100), Decimal(500)]
+
+    def test_facade_evaluates_value_function_again_in_each_simulation(self) -> None:
+        facade = container_module.build().resolve(SimulationFacade)
+        value_function = CountingValueFunction(Decimal(10))
+        capability = AvailableResourceCapability(
+            uuid4(), FakeCapabilityPerformer(Capability.skill("JAVA")), TimeSlot.empty()
+        )
+        project = SimulatedProject(
+            ProjectId.new(), value_function, Demands.of([Demand.demand_for(Capability.skill("JAVA"), TimeSlot.empty())])
+        )
+
+        for _ in range(3):
+            _ = facade.what_is_the_optimal_setup([project], SimulatedCapabilities([capability]))
+
+        assert value_function.calls == 3
@@ -12,6 +12,8 @@ from ..available_resource_capability import AvailableResourceCapability
 from ..demand import Demand
 from ..demands import Demands
 from ..project_id import ProjectId
+from ..simulated_capabilities import SimulatedCapabilities
+from ..simulated_project import SimulatedProject
 from ..simulation_facade import SimulationFacade
 from .available_capabilities_factory import (
     AvailableResourceCapabilityFactory,
@@ -227,3 +229,195 @@ class TestSimulationScenarios:
         assert buying_slawek_profit == -9959
         # We get 40 from project 2 and lose 3 for buying Staszek
         assert buying_staszek_profit == 37
+
+    def test_ranks_capabilities_to_buy_by_profit(
+        self,
+        *,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+        project_3_id: ProjectId,
+        jan_1_time_slot: TimeSlot,
+        staszek_id: UUID,
+        simulation_facade: SimulationFacade,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(100),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(40),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_3_id,
+                value=Decimal(60),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("PYTHON-MID"), jan_1_time_slot)]),
+            ),
+        ]
+
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=1,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__capability=FakeCapabilityPerformer(Capability.skill("JAVA-MID")),
+            capabilities__0__time_slot=jan_1_time_slot,
+        )
+
+        slawek = AdditionalPricedCapability(
+            Decimal(9999),
+            AvailableResourceCapability(
+                uuid4(), FakeCapabilityPerformer(Capability.skill("JAVA-MID")), jan_1_time_slot
+            ),
+        )
+        staszek = AdditionalPricedCapability(
+            Decimal(3),
+            AvailableResourceCapability(
+                uuid4(), FakeCapabilityPerformer(Capability.skill("JAVA-MID")), jan_1_time_slot
+            ),
+        )
+        pawel = AdditionalPricedCapability(
+            Decimal(10),
+            AvailableResourceCapability(
+                uuid4(), FakeCapabilityPerformer(Capability.skill("PYTHON-MID")), jan_1_time_slot
+            ),
+        )
+
+        ranking = simulation_facade.rank_capabilities_to_buy(
+            simulated_projects, simulated_availability, [slawek, staszek, pawel]
+        )
+
+        assert [(delta.capability, delta.profit_delta) for delta in ranking] == [
+            (pawel, 50),
+            (staszek, 37),
+            (slawek, -9959),
+        ]
+
+    def test_calculates_many_scenarios_in_input_order(
+        self,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+        jan_1_time_slot: TimeSlot,
+        staszek_id: UUID,
+        simulation_facade: SimulationFacade,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(9),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("YT DRAMA COMMENTS"), jan_1_time_slot)]),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(99),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("YT DRAMA COMMENTS"), jan_1_time_slot)]),
+            ),
+        ]
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=1,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__capability=FakeCapabilityPerformer(Capability.skill("YT DRAMA COMMENTS")),
+            capabilities__0__time_slot=jan_1_time_slot,
+        )
+        extra_capability = AvailableResourceCapabilityFactory.build(
+            resource_id=uuid4(),
+            capability=FakeCapabilityPerformer(Capability.skill("YT DRAMA COMMENTS")),
+            time_slot=jan_1_time_slot,
+        )
+
+        results = simulation_facade.what_is_the_optimal_setup_for_each(
+            [
+                (simulated_projects, simulated_availability.add(extra_capability)),
+                (simulated_projects, simulated_availability),
+                (simulated_projects, SimulatedCapabilities.none()),
+            ],
+            max_workers=2,
+        )
+
+        assert [timed.result.profit for timed in results] == [108, 99, 0]
+        assert results[1].result.chosen_projects == {simulated_projects[1]}
+        assert all(timed.duration.total_seconds() >= 0 for timed in results)
+
+    def test_project_value_is_evaluated_once_per_simulation(
+        self,
+        project_1_id: ProjectId,
+        jan_1_time_slot: TimeSlot,
+        staszek_id: UUID,
+        simulation_facade: SimulationFacade,
+    ) -> None:
+        calls: list[Decimal] = []
+
+        def value_function() -> Decimal:
+            calls.append(Decimal(100))
+            return Decimal(100)
+
+        simulated_projects = [
+            SimulatedProject(
+                project_1_id,
+                value_function,
+                Demands([Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]),
+            )
+        ]
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=1,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__capability=FakeCapabilityPerformer(Capability.skill("JAVA-MID")),
+            capabilities__0__time_slot=jan_1_time_slot,
+        )
+        staszek = AdditionalPricedCapability(
+            Decimal(3),
+            AvailableResourceCapability(
+                uuid4(), FakeCapabilityPerformer(Capability.skill("JAVA-MID")), jan_1_time_slot
+            ),
+        )
+
+        simulation_facade.profit_after_buying_new_capability(simulated_projects, simulated_availability, staszek)
+
+        assert len(calls) == 1
+
+    def test_returns_k_best_setups(
+        self,
+        *,
+        staszek_id: UUID,
+        jan_1_time_slot: TimeSlot,
+        leon_id: UUID,
+        simulation_facade: SimulationFacade,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+        project_3_id: ProjectId,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(9),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(99),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_3_id,
+                value=Decimal(2),
+                missing_demands=Demands([Demand.demand_for(Capability.skill("PYTHON-MID"), jan_1_time_slot)]),
+            ),
+        ]
+
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=2,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__capability=FakeCapabilityPerformer(Capability.skill("JAVA-MID")),
+            capabilities__0__time_slot=jan_1_time_slot,
+            capabilities__1__resource_id=leon_id,
+            capabilities__1__capability=FakeCapabilityPerformer(Capability.skill("PYTHON-MID")),
+            capabilities__1__time_slot=jan_1_time_slot,
+        )
+
+        results = simulation_facade.what_are_the_best_setups(simulated_projects, simulated_availability, 3)
+
+        assert [result.profit for result in results] == [101, 99, 2]
+        assert results[0] == simulation_facade.what_is_the_optimal_setup(simulated_projects, simulated_availability)
+        assert results[1].chosen_projects == {simulated_projects[1]}
+        assert set(results[1].resources_allocated_to_projects) == {simulated_projects[1]}
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from schedule.optimization import Item, OptimizationFacade, TotalCapacity
+    from schedule.optimization.result import OptimizationResult
+
+    from .available_resource_capability import AvailableResourceCapability
+
+
+def calculate_timed(
+    optimization_facade: OptimizationFacade,
+    items: list[Item[AvailableResourceCapability]],
+    total_capacity: TotalCapacity[AvailableResourceCapability],
+) -> tuple[OptimizationResult[AvailableResourceCapability], timedelta]:
+    start = perf_counter()
+    result = optimization_facade.calculate(items, total_capacity)
+    return result, timedelta(seconds=perf_counter() - start)
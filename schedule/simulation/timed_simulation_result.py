@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import attrs as a
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+    from .result import SimulationResult
+
+
+@a.define(frozen=True)
+class TimedSimulationResult:
+    result: SimulationResult
+    duration: timedelta